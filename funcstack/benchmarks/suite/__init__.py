@@ -0,0 +1,9 @@
+"""
+Benchmark suite of the overhead of modules and effects and the throughput of the converters and builders.
+
+Run it from the root of the package with `python -m benchmarks.suite`. Results are saved as JSON,
+named after the commit they were measured on, so two commits can be compared with
+`python -m benchmarks.suite --compare .benchmarks/<baseline>.json`.
+
+The benchmarks of an integration only run when its package is installed.
+"""
@@ -0,0 +1,84 @@
+import argparse
+from pathlib import Path
+import sys
+
+import benchmarks.suite
+from benchmarks.suite import ( # noqa: F401
+    bench_chunks,
+    bench_coroutines,
+    bench_effects,
+    bench_integrations,
+    bench_modules,
+    bench_rankers,
+    bench_throughput
+)
+from benchmarks.suite.harness import (
+    DEFAULT_MIN_TIME,
+    DEFAULT_REPEAT,
+    DEFAULT_THRESHOLD,
+    BenchmarkInfo,
+    compare,
+    format_time,
+    get_benchmarks,
+    get_metadata,
+    load_results,
+    measure,
+    save_results
+)
+
+RESULTS_DIR = Path('.benchmarks')
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite', description=benchmarks.suite.__doc__)
+    parser.add_argument('-k', '--filter', action='append', help='run the benchmarks matching this regular expression')
+    parser.add_argument('-o', '--output', type=Path, help='the JSON file to save the results to')
+    parser.add_argument('--compare', type=Path, help='the JSON results to compare against')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help='the relative slowdown reported as a regression'
+    )
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME, help='the minimum duration of a repetition')
+    parser.add_argument('--list', action='store_true', help='list the benchmarks without running them')
+    args = parser.parse_args(argv)
+
+    selected = get_benchmarks(args.filter)
+    if args.list:
+        for bench in selected:
+            print(bench.name)
+        return 0
+
+    results: dict[str, BenchmarkInfo] = {}
+    width = max((len(bench.name) for bench in selected), default=0)
+    for bench in selected:
+        info = measure(bench, repeat=args.repeat, min_time=args.min_time)
+        results[bench.name] = info
+        print(f'{bench.name:<{width}} {format_time(info.min):>10}/{info.unit} (median {format_time(info.median)})')
+
+    output = args.output or RESULTS_DIR / f'{(get_metadata()['commit'] or 'results')[:12]}.json'
+    save_results(output, results)
+    print(f'Saved the results to {output}.')
+
+    if args.compare is None:
+        return 0
+    regressions = 0
+    print(f'\nCompared to {args.compare}:')
+    for comparison in compare(load_results(args.compare), results):
+        change = comparison.ratio - 1
+        if change > args.threshold:
+            regressions += 1
+            status = 'REGRESSION'
+        elif change < -args.threshold:
+            status = 'improvement'
+        else:
+            status = ''
+        print(
+            f'{comparison.name:<{width}} {format_time(comparison.baseline):>10} -> '
+            f'{format_time(comparison.current):>10} {change:>+8.1%} {status}'
+        )
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
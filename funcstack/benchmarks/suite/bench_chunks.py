@@ -0,0 +1,49 @@
+"""
+Accumulating streamed outputs in a `Chunk` against a list.
+
+Compares concatenating lists, which copies everything accumulated so far on each step,
+with appending and concatenating chunks, which share what they've accumulated.
+"""
+
+from functools import partial
+from typing import Any, Callable
+
+from funcstack.containers import Chunk, Chunks
+
+from benchmarks.suite.harness import register
+
+SIZES = [1_000, 10_000, 50_000]
+BATCH = 8
+INDEX_STEP = 97
+
+def _list_concat(size: int) -> list[int]:
+    outputs: list[int] = []
+    for i in range(0, size, BATCH):
+        outputs = outputs + list(range(i, i + BATCH))
+    return outputs
+
+def _chunk_concat(size: int) -> Chunk[int]:
+    outputs: Chunk[int] = Chunks.empty()
+    for i in range(0, size, BATCH):
+        outputs = outputs + Chunks.from_iterable(range(i, i + BATCH))
+    return outputs
+
+def _chunk_append(size: int) -> Chunk[int]:
+    outputs: Chunk[int] = Chunks.empty()
+    for i in range(size):
+        outputs = outputs.append(i)
+    return outputs
+
+def _setup_build(build: Callable[[int], Any], size: int) -> Callable[[], Any]:
+    assert list(build(size)) == list(range(size))
+    return partial(build, size)
+
+def _setup_index(size: int) -> Callable[[], Any]:
+    chunk = _chunk_concat(size)
+    return lambda: [chunk[i] for i in range(0, size, INDEX_STEP)]
+
+for _size in SIZES:
+    register(f'chunks.{_size}.list_concat', partial(_setup_build, _list_concat, _size), items=_size, unit='item')
+    register(f'chunks.{_size}.concat', partial(_setup_build, _chunk_concat, _size), items=_size, unit='item')
+    register(f'chunks.{_size}.append', partial(_setup_build, _chunk_append, _size), items=_size, unit='item')
+    register(f'chunks.{_size}.index', partial(_setup_index, _size), items=len(range(0, _size, INDEX_STEP)), unit='item')
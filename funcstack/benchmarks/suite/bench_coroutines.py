@@ -0,0 +1,43 @@
+"""
+Per-call overhead of running a coroutine from synchronous code.
+
+Compares a fresh `asyncio.run` per call (and a fresh thread per call when a loop is
+already running), which is what `run_sync` used to do, against the process-wide
+`LoopRunner` that `run_sync` submits to now.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator
+
+from funcstack.utils.coroutines import run_sync
+
+from benchmarks.suite.harness import in_loop, register
+
+CALLS = 100
+
+async def _noop() -> int:
+    return 0
+
+def _asyncio_run() -> int:
+    return asyncio.run(_noop())
+
+def _thread_asyncio_run() -> int:
+    with ThreadPoolExecutor() as executor:
+        return executor.submit(asyncio.run, _noop()).result()
+
+def _run_sync() -> int:
+    return run_sync(_noop())
+
+def _from_running_loop(func: Callable[[], int]) -> Callable[[], Iterator[Callable[[], Any]]]:
+    def _setup() -> Iterator[Callable[[], Any]]:
+        async def _run() -> None:
+            for _ in range(CALLS):
+                func()
+        yield from in_loop(_run)
+    return _setup
+
+register('coroutines.asyncio_run', lambda: _asyncio_run)
+register('coroutines.run_sync', lambda: _run_sync)
+register('coroutines.running_loop.thread_asyncio_run', _from_running_loop(_thread_asyncio_run), items=CALLS)
+register('coroutines.running_loop.run_sync', _from_running_loop(_run_sync), items=CALLS)
@@ -0,0 +1,147 @@
+"""
+Overhead of evaluating every kind of effect, with a trivial computation, in each of the four modes,
+and of chains of `map`/`flat_map` with and without fusion.
+
+Async evaluations are awaited `CALLS` times inside a single coroutine, so the cost of
+entering the event loop is amortized and only the cost of the effect itself is timed.
+"""
+
+from functools import partial
+from typing import Any, Callable, Iterator
+
+from funcstack.containers import Effect, Effects
+
+from benchmarks.suite.harness import in_loop, register
+
+CALLS = 100
+
+def _inc(x: int) -> int:
+    return x + 1
+
+def _effect(x: int) -> Effect[int]:
+    return Effects.Value(x + 1)
+
+async def _acompute() -> int:
+    return 1
+
+def _stream() -> Iterator[int]:
+    yield 1
+
+async def _astream():
+    yield 1
+
+EFFECTS: dict[str, Callable[[], Effect[int]]] = {
+    'value': lambda: Effects.Value(1),
+    'sync': lambda: Effects.Sync(lambda: 1),
+    'async': lambda: Effects.Async(_acompute),
+    'iterator': lambda: Effects.Iterator(_stream),
+    'async_iterator': lambda: Effects.AsyncIterator(_astream),
+    'streaming': lambda: Effects.Streaming(lambda: 1, _stream),
+    'async_streaming': lambda: Effects.AsyncStreaming(_acompute, _astream),
+    'suspend': lambda: Effects.Suspend(lambda: Effects.Value(1)),
+    'map': lambda: Effects.Map(Effects.Value(0), _inc),
+    'flat_map': lambda: Effects.FlatMap(Effects.Value(0), _effect),
+    'chain': lambda: Effects.Chain(Effects.Value(0), [_effect] * 3)
+}
+
+def _invoke(effect: Effect[Any]) -> Callable[[], Any]:
+    return effect.invoke
+
+def _iter(effect: Effect[Any]) -> Callable[[], Any]:
+    def _consume() -> None:
+        for _ in effect.iter():
+            pass
+    return _consume
+
+def _ainvoke(effect: Effect[Any]) -> Iterator[Callable[[], Any]]:
+    async def _run() -> None:
+        for _ in range(CALLS):
+            await effect.ainvoke()
+    yield from in_loop(_run)
+
+def _aiter(effect: Effect[Any]) -> Iterator[Callable[[], Any]]:
+    async def _run() -> None:
+        for _ in range(CALLS):
+            async for _ in effect.aiter():
+                pass
+    yield from in_loop(_run)
+
+def _setup(make: Callable[[], Effect[Any]], mode: Callable[[Effect[Any]], Any]) -> Any:
+    return mode(make())
+
+def _setup_async(make: Callable[[], Effect[Any]], mode: Callable[[Effect[Any]], Any]) -> Any:
+    yield from mode(make())
+
+for _name, _make in EFFECTS.items():
+    register(f'effects.{_name}.invoke', partial(_setup, _make, _invoke))
+    register(f'effects.{_name}.iter', partial(_setup, _make, _iter))
+    register(f'effects.{_name}.ainvoke', partial(_setup_async, _make, _ainvoke), items=CALLS)
+    register(f'effects.{_name}.aiter', partial(_setup_async, _make, _aiter), items=CALLS)
+
+# Fusion: graphs built from the effect classes directly, with one wrapper layer per `map`,
+# which is what `Effect.map` and `Effect.flat_map` used to build, against the fused graphs
+# they build now.
+
+FUSION_ITEMS = 10_000
+FUSION_DEPTHS = [1, 3, 10]
+
+def _source() -> Effect[int]:
+    return Effects.Iterator(lambda: iter(range(FUSION_ITEMS)))
+
+def _unfused_maps(depth: int) -> Effect[int]:
+    effect = _source()
+    for _ in range(depth):
+        effect = Effects.Map(effect, _inc)
+    return effect
+
+def _fused_maps(depth: int) -> Effect[int]:
+    effect = _source()
+    for _ in range(depth):
+        effect = effect.map(_inc)
+    return effect
+
+def _unfused_value(depth: int) -> Effect[int]:
+    effect: Effect[int] = Effects.Value(0)
+    for _ in range(depth):
+        effect = Effects.FlatMap(Effects.Map(effect, _inc), Effects.Value)
+    return effect
+
+def _fused_value(depth: int) -> Effect[int]:
+    effect: Effect[int] = Effects.Value(0)
+    for _ in range(depth):
+        effect = effect.map(_inc).flat_map(Effects.Value)
+    return effect
+
+def _setup_fusion_iter(build: Callable[[int], Effect[int]], depth: int) -> Callable[[], Any]:
+    effect = build(depth)
+    assert list(effect.iter()) == list(range(depth, FUSION_ITEMS + depth))
+    return _iter(effect)
+
+def _setup_fusion_aiter(build: Callable[[int], Effect[int]], depth: int) -> Iterator[Callable[[], Any]]:
+    effect = build(depth)
+    async def _run() -> None:
+        async for _ in effect.aiter():
+            pass
+    yield from in_loop(_run)
+
+def _setup_fusion_invoke(build: Callable[[int], Effect[int]], depth: int) -> Callable[[], Any]:
+    effect = build(depth)
+    assert effect.invoke() == depth
+    return effect.invoke
+
+for _depth in FUSION_DEPTHS:
+    for _suffix, _build in (('layers', _unfused_maps), ('fused', _fused_maps)):
+        register(
+            f'effects.fusion.map.{_depth}.{_suffix}.iter',
+            partial(_setup_fusion_iter, _build, _depth),
+            items=FUSION_ITEMS,
+            unit='item'
+        )
+        register(
+            f'effects.fusion.map.{_depth}.{_suffix}.aiter',
+            partial(_setup_fusion_aiter, _build, _depth),
+            items=FUSION_ITEMS,
+            unit='item'
+        )
+    for _suffix, _build in (('layers', _unfused_value), ('fused', _fused_value)):
+        register(f'effects.fusion.flat_map.{_depth}.{_suffix}.invoke', partial(_setup_fusion_invoke, _build, _depth))
@@ -0,0 +1,44 @@
+"""
+Throughput of the integrations that are installed, against fake servers, so they can be measured
+without their services.
+
+`TikaTextConverter` sending one document at a time, as it used to, is compared against
+its pooled thread mode and its `httpx` async mode with several documents in flight.
+"""
+
+from functools import partial
+from typing import Any, Callable, Iterator
+
+from funcstack.typing import ByteStream
+
+from benchmarks.suite.harness import register
+
+try:
+    from funcstack_tika import TikaTextConverter
+    from funcstack_tika.testing import FakeTikaServer
+except ImportError:
+    TikaTextConverter = None # type: ignore[assignment, misc]
+
+TIKA_DOCUMENTS = 200
+TIKA_LATENCY = 0.01
+
+def _setup_tika(**kwargs) -> Iterator[Callable[[], Any]]:
+    sources = [
+        ByteStream(f'<html><body><p>Document {i}</p></body></html>'.encode(), 'text/html')
+        for i in range(TIKA_DOCUMENTS)
+    ]
+    with FakeTikaServer(latency=TIKA_LATENCY) as server:
+        converter = TikaTextConverter(server.url, **kwargs)
+        try:
+            assert len(converter.invoke(sources)) == TIKA_DOCUMENTS
+            yield partial(converter.invoke, sources)
+        finally:
+            converter.close()
+
+if TikaTextConverter is not None:
+    for _name, _kwargs in (
+        ('one_in_flight', {'max_in_flight': 1}),
+        ('threads', {'max_in_flight': 8}),
+        ('httpx', {'max_in_flight': 8, 'async_client': True})
+    ):
+        register(f'integrations.tika.{_name}', partial(_setup_tika, **_kwargs), items=TIKA_DOCUMENTS, unit='document')
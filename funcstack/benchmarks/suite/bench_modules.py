@@ -0,0 +1,106 @@
+"""
+Overhead of composing modules: `Sequential` of N trivial steps, `Parallel` fan-out width,
+the happy path of `Retry` and `Fallbacks`, and coercing functions to modules.
+"""
+
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Iterator
+
+from funcstack.containers import Effect, Effects
+from funcstack.modules import Module, Modules, Parallel, Sequential, coerce_to_module
+
+from benchmarks.suite.harness import in_loop, register
+
+SEQUENTIAL_LENGTHS = [2, 5, 20]
+PARALLEL_WIDTHS = [1, 8, 32]
+CALLS = 100
+
+def _inc(x: int, **kwargs) -> int:
+    return x + 1
+
+async def _ainc(x: int, **kwargs) -> int:
+    return x + 1
+
+def _iter_inc(x: int, **kwargs) -> Iterator[int]:
+    yield x + 1
+
+async def _aiter_inc(x: int, **kwargs) -> AsyncIterator[int]:
+    yield x + 1
+
+def _effect_inc(x: int, **kwargs) -> Effect[int]:
+    return Effects.Value(x + 1)
+
+def _ainvoke(module: Module[int, Any]) -> Iterator[Callable[[], Any]]:
+    async def _run() -> None:
+        for _ in range(CALLS):
+            await module.ainvoke(0)
+    yield from in_loop(_run)
+
+def _sequential(n: int) -> Module[int, int]:
+    return Sequential(*[Modules.Sync(_inc) for _ in range(n)])
+
+def _parallel(width: int, offload_sync: bool) -> Module[int, dict[str, int]]:
+    steps = {f'step_{i}': Modules.Sync(_inc) for i in range(width)}
+    return Parallel(**steps).with_options(offload_sync=offload_sync)
+
+def _setup_sequential_invoke(n: int) -> Callable[[], Any]:
+    return partial(_sequential(n).invoke, 0)
+
+def _setup_sequential_iter(n: int) -> Callable[[], Any]:
+    module = _sequential(n)
+    return lambda: list(module.iter(0))
+
+def _setup_sequential_ainvoke(n: int) -> Iterator[Callable[[], Any]]:
+    yield from _ainvoke(_sequential(n))
+
+def _setup_parallel_invoke(width: int, offload_sync: bool) -> Callable[[], Any]:
+    return partial(_parallel(width, offload_sync).invoke, 0)
+
+def _setup_parallel_ainvoke(width: int, offload_sync: bool) -> Iterator[Callable[[], Any]]:
+    yield from _ainvoke(_parallel(width, offload_sync))
+
+FAULT_HANDLING: dict[str, Callable[[], Module[int, int]]] = {
+    'baseline': lambda: Modules.Sync(_inc),
+    'retry': lambda: Modules.Sync(_inc).with_retry(),
+    'fallbacks': lambda: Modules.Sync(_inc).with_fallbacks([Modules.Sync(_inc)])
+}
+
+def _setup_fault_handling_invoke(make: Callable[[], Module[int, int]]) -> Callable[[], Any]:
+    return partial(make().invoke, 0)
+
+def _setup_fault_handling_ainvoke(make: Callable[[], Module[int, int]]) -> Iterator[Callable[[], Any]]:
+    yield from _ainvoke(make())
+
+COERCIBLES: dict[str, Any] = {
+    'module': Modules.Sync(_inc),
+    'function': _inc,
+    'coroutine_function': _ainc,
+    'generator_function': _iter_inc,
+    'async_generator_function': _aiter_inc,
+    'effect_function': _effect_inc,
+    'mapping': {'a': _inc, 'b': _ainc}
+}
+
+def _setup_coerce(thing: Any) -> Callable[[], Any]:
+    return partial(coerce_to_module, thing)
+
+for _n in SEQUENTIAL_LENGTHS:
+    register(f'modules.sequential.{_n}.invoke', partial(_setup_sequential_invoke, _n))
+    register(f'modules.sequential.{_n}.iter', partial(_setup_sequential_iter, _n))
+    register(f'modules.sequential.{_n}.ainvoke', partial(_setup_sequential_ainvoke, _n), items=CALLS)
+
+for _width in PARALLEL_WIDTHS:
+    for _offload_sync, _suffix in ((True, 'offload'), (False, 'inline')):
+        register(f'modules.parallel.{_width}.{_suffix}.invoke', partial(_setup_parallel_invoke, _width, _offload_sync))
+        register(
+            f'modules.parallel.{_width}.{_suffix}.ainvoke',
+            partial(_setup_parallel_ainvoke, _width, _offload_sync),
+            items=CALLS
+        )
+
+for _name, _make in FAULT_HANDLING.items():
+    register(f'modules.fault_handling.{_name}.invoke', partial(_setup_fault_handling_invoke, _make))
+    register(f'modules.fault_handling.{_name}.ainvoke', partial(_setup_fault_handling_ainvoke, _make), items=CALLS)
+
+for _name, _thing in COERCIBLES.items():
+    register(f'modules.coerce_to_module.{_name}', partial(_setup_coerce, _thing))
@@ -0,0 +1,76 @@
+"""
+Rankers on large retrieval sets.
+
+Compares selecting the top k artifacts with a full `sorted` on their scores, which is what
+reranking used to cost, against the `numpy.argpartition` selection of `LostInTheMiddleRanker`.
+Compares scoring each artifact in a Python loop and sorting, against `SimilarityRanker`
+stacking the embeddings itself, and against passing it embeddings stacked once
+with `stack_embeddings`.
+"""
+
+from functools import partial
+import random
+from typing import Any, Callable
+
+import numpy as np
+
+from funcstack.modules.rankers import LostInTheMiddleRanker, SimilarityRanker, stack_embeddings
+from funcstack.typing import TextArtifact
+
+from benchmarks.suite.harness import register
+
+LOST_IN_THE_MIDDLE_SIZES = [1_000, 10_000, 100_000]
+SIMILARITY_SIZE = 50_000
+DIMENSIONS = 384
+TOP_K = 10
+
+def _sorted_top_k(artifacts: list[TextArtifact], top_k: int) -> list[TextArtifact]:
+    ranked = sorted(artifacts, key=lambda artifact: artifact.score, reverse=True)[:top_k]
+    return ranked[0::2] + ranked[1::2][::-1]
+
+def _scored_artifacts(size: int) -> list[TextArtifact]:
+    rng = random.Random(0)
+    return [TextArtifact(f'artifact {i}', score=rng.random()) for i in range(size)]
+
+def _setup_lost_in_the_middle_sorted(size: int) -> Callable[[], Any]:
+    return partial(_sorted_top_k, _scored_artifacts(size), TOP_K)
+
+def _setup_lost_in_the_middle(size: int) -> Callable[[], Any]:
+    ranker, artifacts = LostInTheMiddleRanker(), _scored_artifacts(size)
+    assert ranker.invoke(artifacts, top_k=TOP_K) == _sorted_top_k(artifacts, TOP_K)
+    return lambda: ranker.invoke(artifacts, top_k=TOP_K)
+
+def _loop_top_k(artifacts: list[TextArtifact], query: np.ndarray, top_k: int) -> list[float]:
+    query_norm = np.linalg.norm(query)
+    scores = [
+        float(artifact.embedding @ query / (np.linalg.norm(artifact.embedding) * query_norm))
+        for artifact in artifacts
+    ]
+    return sorted(scores, reverse=True)[:top_k]
+
+def _embedded_artifacts() -> tuple[list[TextArtifact], np.ndarray]:
+    rng = np.random.default_rng(0)
+    matrix = rng.standard_normal((SIMILARITY_SIZE, DIMENSIONS), dtype=np.float32)
+    artifacts = [TextArtifact(f'artifact {i}', embedding=matrix[i]) for i in range(SIMILARITY_SIZE)]
+    return artifacts, rng.standard_normal(DIMENSIONS, dtype=np.float32)
+
+def _setup_similarity_loop() -> Callable[[], Any]:
+    artifacts, query = _embedded_artifacts()
+    return partial(_loop_top_k, artifacts, query, TOP_K)
+
+def _setup_similarity(stacked: bool) -> Callable[[], Any]:
+    ranker = SimilarityRanker()
+    artifacts, query = _embedded_artifacts()
+    expected = _loop_top_k(artifacts[:1000], query, TOP_K)
+    scores = [artifact.score for artifact in ranker.invoke(artifacts[:1000], query=query, top_k=TOP_K)]
+    assert np.allclose(scores, expected, atol=1e-5)
+    embeddings = stack_embeddings(artifacts) if stacked else None
+    return lambda: ranker.invoke(artifacts, query=query, top_k=TOP_K, embeddings=embeddings)
+
+for _size in LOST_IN_THE_MIDDLE_SIZES:
+    register(f'rankers.lost_in_the_middle.{_size}.sorted', partial(_setup_lost_in_the_middle_sorted, _size))
+    register(f'rankers.lost_in_the_middle.{_size}.ranker', partial(_setup_lost_in_the_middle, _size))
+
+register('rankers.similarity.loop', _setup_similarity_loop)
+register('rankers.similarity.ranker', partial(_setup_similarity, False))
+register('rankers.similarity.ranker.stacked', partial(_setup_similarity, True))
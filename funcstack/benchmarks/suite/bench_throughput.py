@@ -0,0 +1,89 @@
+"""
+Throughput of `HtmlToText` and `PromptBuilder` on the fixture corpora, per document and per prompt.
+"""
+
+from functools import partial
+from typing import Any, Callable
+
+from funcstack.modules import Modules, Sequential
+from funcstack.modules.builders import PromptBuilder
+from funcstack.modules.converters import HtmlToText
+from funcstack.typing import TextArtifact
+
+from benchmarks.suite import fixtures
+from benchmarks.suite.harness import register
+
+HTML_PAGES = 50
+PROMPTS = 200
+
+def _html_sources() -> list[TextArtifact]:
+    return [TextArtifact(page, mime_type='text/html') for page in fixtures.html_pages(HTML_PAGES)]
+
+def _setup_html_to_text_invoke(try_others: bool) -> Callable[[], Any]:
+    return partial(HtmlToText(try_others=try_others).invoke, _html_sources())
+
+def _setup_html_to_text_iter(try_others: bool) -> Callable[[], Any]:
+    converter, sources = HtmlToText(try_others=try_others), _html_sources()
+    return lambda: list(converter.iter(sources))
+
+def _setup_prompt_builder_invoke() -> Callable[[], Any]:
+    builder, contexts = PromptBuilder(fixtures.PROMPT_TEMPLATE), fixtures.prompt_contexts(PROMPTS)
+    def _render() -> None:
+        for context in contexts:
+            builder.invoke(context)
+    return _render
+
+def _setup_prompt_builder_iter(streaming: bool) -> Callable[[], Any]:
+    builder = PromptBuilder(fixtures.PROMPT_TEMPLATE, streaming=streaming)
+    contexts = fixtures.prompt_contexts(PROMPTS)
+    def _render() -> None:
+        for context in contexts:
+            for _ in builder.iter(context):
+                pass
+    return _render
+
+def _setup_prompt_builder_pipeline() -> Callable[[], Any]:
+    prompts: list[str] = []
+    def _step(prompt: str, **kwargs) -> int:
+        prompts.append(prompt)
+        return len(prompt)
+
+    builder, contexts = PromptBuilder(fixtures.PROMPT_TEMPLATE), fixtures.prompt_contexts(PROMPTS)
+    pipeline = Sequential(builder, Modules.Sync(_step))
+    # Unless the builder is streaming, the steps after it run once, on the whole prompt.
+    assert list(pipeline.iter(contexts[0])) == [len(builder.invoke(contexts[0]))] and len(prompts) == 1
+
+    def _run() -> None:
+        for context in contexts:
+            for _ in pipeline.iter(context):
+                pass
+    return _run
+
+def _setup_prompt_builder_batch() -> Callable[[], Any]:
+    builder, contexts = PromptBuilder(fixtures.PROMPT_TEMPLATE), fixtures.prompt_contexts(PROMPTS)
+    return partial(builder.batch, contexts)
+
+for _try_others, _suffix in ((False, 'default'), (True, 'try_others')):
+    register(
+        f'throughput.html_to_text.{_suffix}.invoke',
+        partial(_setup_html_to_text_invoke, _try_others),
+        items=HTML_PAGES,
+        unit='document'
+    )
+    register(
+        f'throughput.html_to_text.{_suffix}.iter',
+        partial(_setup_html_to_text_iter, _try_others),
+        items=HTML_PAGES,
+        unit='document'
+    )
+
+register('throughput.prompt_builder.invoke', _setup_prompt_builder_invoke, items=PROMPTS, unit='prompt')
+register('throughput.prompt_builder.iter', partial(_setup_prompt_builder_iter, False), items=PROMPTS, unit='prompt')
+register(
+    'throughput.prompt_builder.streaming.iter',
+    partial(_setup_prompt_builder_iter, True),
+    items=PROMPTS,
+    unit='prompt'
+)
+register('throughput.prompt_builder.pipeline.iter', _setup_prompt_builder_pipeline, items=PROMPTS, unit='prompt')
+register('throughput.prompt_builder.batch', _setup_prompt_builder_batch, items=PROMPTS, unit='prompt')
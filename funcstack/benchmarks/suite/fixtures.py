@@ -0,0 +1,69 @@
+"""
+Deterministic corpora for the throughput benchmarks, generated from a fixed seed
+so the same inputs are benchmarked on every commit.
+"""
+
+import random
+from typing import Any
+
+SEED = 0
+
+WORDS = (
+    'the of and to in is that for it as was with be by on not he this are or his from at which but have an they '
+    'you were her she there been one all we their has would when if so no will more its who what about up out '
+    'function module effect stream chunk artifact retrieval document prompt template model answer question '
+    'context latency throughput benchmark parallel sequential retry fallback pipeline embedding vector index'
+).split()
+
+PROMPT_TEMPLATE = """\
+Answer the question using only the documents below.
+{% for document in documents %}
+Document {{ loop.index }}: {{ document.title }}
+{{ document.content }}
+{% endfor %}
+Question: {{ question }}
+Answer:"""
+
+def _sentence(rng: random.Random, min_words: int = 6, max_words: int = 24) -> str:
+    words = rng.choices(WORDS, k=rng.randint(min_words, max_words))
+    return ' '.join(words).capitalize() + '.'
+
+def _paragraph(rng: random.Random, sentences: int) -> str:
+    return ' '.join(_sentence(rng) for _ in range(sentences))
+
+def html_pages(count: int, paragraphs: int = 20, seed: int = SEED) -> list[str]:
+    """
+    Generate article pages wrapped in the navigation, sidebar and footer boilerplate that extractors strip.
+    """
+    rng = random.Random(seed)
+    pages = []
+    for i in range(count):
+        title = _sentence(rng, 3, 8)
+        nav = ''.join(f'<li><a href="/section/{j}">{rng.choice(WORDS).title()}</a></li>' for j in range(12))
+        body = ''.join(f'<p>{_paragraph(rng, rng.randint(3, 8))}</p>\n' for _ in range(paragraphs))
+        sidebar = ''.join(f'<li><a href="/related/{i}/{j}">{_sentence(rng, 3, 6)}</a></li>' for j in range(8))
+        pages.append(
+            f'<!DOCTYPE html>\n<html><head><title>{title}</title>'
+            f'<script>var page = {i};</script><style>body {{ margin: 0; }}</style></head>\n'
+            f'<body><header><nav><ul>{nav}</ul></nav></header>\n'
+            f'<main><article><h1>{title}</h1>\n{body}</article></main>\n'
+            f'<aside><h3>Related</h3><ul>{sidebar}</ul></aside>\n'
+            f'<footer><p>Copyright {2000 + i % 25}. All rights reserved.</p></footer></body></html>\n'
+        )
+    return pages
+
+def prompt_contexts(count: int, documents: int = 5, seed: int = SEED) -> list[dict[str, Any]]:
+    """
+    Generate the contexts of `PROMPT_TEMPLATE`, each with a question and retrieved documents.
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            'question': _sentence(rng)[:-1] + '?',
+            'documents': [
+                {'title': _sentence(rng, 3, 8), 'content': _paragraph(rng, rng.randint(2, 6))}
+                for _ in range(documents)
+            ]
+        }
+        for _ in range(count)
+    ]
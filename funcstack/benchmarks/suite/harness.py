@@ -0,0 +1,192 @@
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import gc
+import inspect
+import json
+import os
+from pathlib import Path
+import platform
+import re
+import statistics
+import subprocess
+import timeit
+from typing import Any, Callable, ContextManager, Coroutine, Iterator, NamedTuple
+
+DEFAULT_REPEAT = 5
+DEFAULT_MIN_TIME = 0.2
+DEFAULT_THRESHOLD = 0.1
+
+Setup = Callable[[], Callable[[], Any] | Iterator[Callable[[], Any]]]
+
+class Benchmark(NamedTuple):
+    name: str
+    setup: Setup
+    items: int
+    unit: str
+
+class BenchmarkInfo(NamedTuple):
+    """
+    The timings of a benchmark, in seconds per item.
+    """
+
+    items: int
+    unit: str
+    number: int
+    repeat: int
+    min: float
+    median: float
+    mean: float
+    stdev: float
+
+class ComparisonInfo(NamedTuple):
+    name: str
+    baseline: float
+    current: float
+    ratio: float
+
+_registry: dict[str, Benchmark] = {}
+
+def benchmark(
+    name: str | None = None,
+    items: int = 1,
+    unit: str = 'call'
+) -> Callable[[Setup], Setup]:
+    """
+    Register a benchmark.
+
+    The decorated function is its setup: it returns the function to time, or yields it
+    when there's something to clean up afterwards. Setup isn't timed.
+
+    :param items: the number of items processed by one call of the timed function, \
+    which the timings are divided by
+    :param unit: what an item is, for the report
+    """
+    def decorator(setup: Setup) -> Setup:
+        register(name or setup.__name__, setup, items=items, unit=unit)
+        return setup
+    return decorator
+
+def register(name: str, setup: Setup, items: int = 1, unit: str = 'call') -> None:
+    if name in _registry:
+        raise ValueError(f'A benchmark named {name} is already registered.')
+    _registry[name] = Benchmark(name, setup, items, unit)
+
+def get_benchmarks(patterns: list[str] | None = None) -> list[Benchmark]:
+    """
+    Get the registered benchmarks whose name matches any of the regular expressions in `patterns`, or all of them.
+    """
+    if not patterns:
+        return list(_registry.values())
+    return [b for b in _registry.values() if any(re.search(p, b.name) for p in patterns)]
+
+def measure(
+    bench: Benchmark,
+    repeat: int = DEFAULT_REPEAT,
+    min_time: float = DEFAULT_MIN_TIME
+) -> BenchmarkInfo:
+    """
+    Time a benchmark with the number of calls per repetition calibrated so a repetition takes at least `min_time`.
+    """
+    with _setup(bench.setup) as func:
+        func()
+        timer = timeit.Timer(func)
+        number = _calibrate(timer, min_time)
+        gc.collect()
+        times = [t / number / bench.items for t in timer.repeat(repeat=repeat, number=number)]
+    return BenchmarkInfo(
+        items=bench.items,
+        unit=bench.unit,
+        number=number,
+        repeat=repeat,
+        min=min(times),
+        median=statistics.median(times),
+        mean=statistics.fmean(times),
+        stdev=statistics.stdev(times) if len(times) > 1 else 0.0
+    )
+
+def in_loop(func: Callable[[], Coroutine[Any, Any, Any]]) -> Iterator[Callable[[], Any]]:
+    """
+    Setup timing the coroutines of `func` on a dedicated event loop, closed once the benchmark is done.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        yield lambda: loop.run_until_complete(func())
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+def get_metadata() -> dict[str, Any]:
+    return {
+        'commit': _git('rev-parse', 'HEAD'),
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds')
+    }
+
+def save_results(path: str | os.PathLike, results: dict[str, BenchmarkInfo]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    output = {
+        'metadata': get_metadata(),
+        'benchmarks': {name: info._asdict() for name, info in results.items()}
+    }
+    path.write_text(json.dumps(output, indent=2) + '\n', encoding='utf-8')
+
+def load_results(path: str | os.PathLike) -> dict[str, BenchmarkInfo]:
+    data = json.loads(Path(path).read_text(encoding='utf-8'))
+    return {name: BenchmarkInfo(**info) for name, info in data['benchmarks'].items()}
+
+def compare(
+    baseline: dict[str, BenchmarkInfo],
+    current: dict[str, BenchmarkInfo]
+) -> list[ComparisonInfo]:
+    """
+    Compare the benchmarks run in both sets of results, by their best time.
+
+    Benchmark timings vary between repetitions by outside noise only, never by being faster
+    than the code allows, so the minimum is the most stable estimate to compare.
+    """
+    return [
+        ComparisonInfo(name, baseline[name].min, info.min, info.min / baseline[name].min)
+        for name, info in current.items()
+        if name in baseline and baseline[name].min > 0
+    ]
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.2f} {unit}'
+    return f'{seconds / 1e-9:.1f} ns'
+
+def _calibrate(timer: timeit.Timer, min_time: float) -> int:
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time:
+            return number
+        number *= 10 if number < 1000 else 2
+
+@contextmanager
+def _setup(setup: Setup) -> Iterator[Callable[[], Any]]:
+    if inspect.isgeneratorfunction(setup):
+        context: ContextManager[Callable[[], Any]] = contextmanager(setup)()
+        with context as func:
+            yield func
+    else:
+        yield setup() # type: ignore[misc]
+
+def _git(*args: str) -> str | None:
+    try:
+        return subprocess.run(
+            ['git', *args],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
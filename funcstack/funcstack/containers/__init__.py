@@ -4,7 +4,19 @@ from .chunk import (
     IConcat,
     ISlice,
     Backing,
-    Chunk
+    Chunk,
+    Chunks
 )
 
-from .effect import Effect, Effects
\ No newline at end of file
+from .effect import Effect, Effects, fuse
+from .emit import Emit
+from .sink import Sink, Sinks
+from .stream import Stream, Streams
+from .writers import (
+    WriteInfo,
+    ArtifactWriter,
+    JsonlWriter,
+    ArrowWriter,
+    ProtobufWriter,
+    read_protobuf
+)
\ No newline at end of file
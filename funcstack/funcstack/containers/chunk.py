@@ -1,8 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Generic, Iterable
+from array import array
+import threading
+from typing import Any, Generic, Iterable, Iterator, Sequence, final, overload
 
 from funcstack.typing._vars import Out
 
+APPEND_BUFFER_SIZE = 64
+
 class ISingleton(Generic[Out], ABC):
     @property
     @abstractmethod
@@ -45,6 +49,15 @@ class ISlice(Generic[Out], ABC):
 Backing = ISingleton[Out] | IList[Out] | IConcat[Out] | ISlice[Out]
 
 class Chunk(Iterable[Out], ABC):
+    """
+    An immutable sequence that is cheap to grow and to slice, to accumulate outputs without copying them.
+
+    Chunks are ropes: concatenating two chunks links them under a `Chunks.Concat` node, rebalanced
+    on the way so the depth of the tree stays logarithmic, which bounds the cost of indexing.
+    Appending goes through a buffer shared between the chunks appended to, so growing a chunk one
+    item at a time is amortized constant. Slicing returns a view on the sliced chunk.
+    """
+
     @property
     @abstractmethod
     def length(self) -> int:
@@ -68,4 +81,450 @@ class Chunk(Iterable[Out], ABC):
     @property
     @abstractmethod
     def backing(self) -> Backing[Out]:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def _get(self, index: int) -> Out:
+        pass
+
+    @abstractmethod
+    def _segments(self, start: int, stop: int) -> Iterator[tuple[Sequence[Out], int, int]]:
+        """
+        Yield the ranges of the underlying sequences that hold the items from `start` to `stop`, in order.
+        """
+
+    def concat(self, other: 'Chunk[Out]') -> 'Chunk[Out]':
+        return _concat(self, other)
+
+    def append(self, item: Out) -> 'Chunk[Out]':
+        return _Appended(self, [item], 1, threading.Lock())
+
+    def prepend(self, item: Out) -> 'Chunk[Out]':
+        return _concat(Chunks.Singleton(item), self)
+
+    def materialize(self) -> 'Chunk[Out]':
+        """
+        Copy the items into a single flat chunk, to release the chunks this one is a view on
+        and make indexing constant.
+        """
+        typecodes = {
+            items.typecode if isinstance(items, array) else None
+            for items, _, _ in self._segments(0, self.length)
+        }
+        if len(typecodes) == 1 and None not in typecodes:
+            return Chunks.Array(array(typecodes.pop(), self))
+        return Chunks.List(self.to_list())
+
+    def to_list(self) -> list[Out]:
+        return list(self)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __bool__(self) -> bool:
+        return self.length > 0
+
+    def __iter__(self) -> Iterator[Out]:
+        for items, start, stop in self._segments(0, self.length):
+            if start == 0 and stop == len(items):
+                yield from items
+            else:
+                yield from map(items.__getitem__, range(start, stop))
+
+    @overload
+    def __getitem__(self, index: int) -> Out:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'Chunk[Out]':
+        ...
+
+    def __getitem__(self, index: int | slice) -> Out | 'Chunk[Out]':
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.length)
+            if step == 1:
+                return self.slice(start, stop)
+            return Chunks.List([self._get(i) for i in range(start, stop, step)])
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError('Chunk index out of range')
+        return self._get(index)
+
+    def __add__(self, other: Iterable[Out]) -> 'Chunk[Out]':
+        if not isinstance(other, Iterable):
+            return NotImplemented
+        return _concat(self, other if isinstance(other, Chunk) else Chunks.from_iterable(other))
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Chunk):
+            return NotImplemented
+        return self.length == other.length and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f'Chunk({self.to_list()!r})'
+
+    # Defined last, so the annotations above refer to the builtin.
+    def slice(self, start: int, stop: int) -> 'Chunk[Out]':
+        start, stop, _ = slice(start, stop).indices(self.length)
+        if start >= stop:
+            return Chunks.empty()
+        if start == 0 and stop == self.length:
+            return self
+        return Chunks.Slice(self, start, stop - start)
+
+class Chunks:
+    @staticmethod
+    def empty() -> Chunk[Any]:
+        return _EMPTY
+
+    @staticmethod
+    def of(*items: Out) -> Chunk[Out]:
+        return Chunks.from_iterable(list(items))
+
+    @staticmethod
+    def from_iterable(items: Iterable[Out]) -> Chunk[Out]:
+        """
+        Get a chunk of the items. Ints and floats are stored unboxed in an `array.array`,
+        and immutable sequences are wrapped without being copied.
+        """
+        if isinstance(items, Chunk):
+            return items
+        if isinstance(items, array):
+            return Chunks.Array(array(items.typecode, items)) if items else _EMPTY
+        if isinstance(items, (tuple, str, bytes, range)):
+            return Chunks.List(items) if items else _EMPTY
+        items = list(items)
+        if not items:
+            return _EMPTY
+        if len(items) == 1:
+            return Chunks.Singleton(items[0])
+        typecode = _get_typecode(items)
+        if typecode is not None:
+            try:
+                return Chunks.Array(array(typecode, items))
+            except OverflowError:
+                pass
+        return Chunks.List(items)
+
+    @final
+    class Empty(Chunk[Any], IList[Any]):
+        @property
+        def length(self) -> int:
+            return 0
+
+        @property
+        def depth(self) -> int:
+            return 0
+
+        @property
+        def left(self) -> Chunk[Any]:
+            return self
+
+        @property
+        def right(self) -> Chunk[Any]:
+            return self
+
+        @property
+        def backing(self) -> Backing[Any]:
+            return self
+
+        def _get(self, index: int) -> Any:
+            raise IndexError('Chunk index out of range')
+
+        def _segments(self, start: int, stop: int) -> Iterator[tuple[Sequence[Any], int, int]]:
+            yield from ()
+
+        @property
+        def list(self) -> list[Any]:
+            return []
+
+    @final
+    class Singleton(Chunk[Out], ISingleton[Out]):
+        def __init__(self, value: Out):
+            self._value = value
+
+        @property
+        def value(self) -> Out:
+            return self._value
+
+        @property
+        def length(self) -> int:
+            return 1
+
+        @property
+        def depth(self) -> int:
+            return 0
+
+        @property
+        def left(self) -> Chunk[Out]:
+            return _EMPTY
+
+        @property
+        def right(self) -> Chunk[Out]:
+            return _EMPTY
+
+        @property
+        def backing(self) -> Backing[Out]:
+            return self
+
+        def _get(self, index: int) -> Out:
+            return self._value
+
+        def _segments(self, start: int, stop: int) -> Iterator[tuple[Sequence[Out], int, int]]:
+            if start < stop:
+                yield (self._value,), start, stop
+
+    class List(Chunk[Out], IList[Out]):
+        """
+        A chunk of the items of a sequence. The sequence isn't copied, so it must not be mutated afterwards.
+        """
+
+        def __init__(self, items: Sequence[Out]):
+            self._items = items
+            self._length = len(items)
+
+        @property
+        def items(self) -> Sequence[Out]:
+            return self._items
+
+        @property
+        def length(self) -> int:
+            return self._length
+
+        @property
+        def depth(self) -> int:
+            return 0
+
+        @property
+        def left(self) -> Chunk[Out]:
+            return _EMPTY
+
+        @property
+        def right(self) -> Chunk[Out]:
+            return _EMPTY
+
+        @property
+        def backing(self) -> Backing[Out]:
+            return self
+
+        def _get(self, index: int) -> Out:
+            return self._items[index]
+
+        def _segments(self, start: int, stop: int) -> Iterator[tuple[Sequence[Out], int, int]]:
+            if start < stop:
+                yield self._items, start, stop
+
+        # Defined last, so the annotations above refer to the builtin.
+        @property
+        def list(self) -> list[Out]:
+            items = self._items
+            return items if type(items) is list else list(items)
+
+    @final
+    class Array(List[Out]):
+        """
+        A chunk of unboxed primitive values, stored in an `array.array`. The array isn't copied,
+        so it must not be mutated afterwards.
+        """
+
+        def __init__(self, items: array):
+            super().__init__(items)
+
+        @property
+        def typecode(self) -> str:
+            return self._items.typecode
+
+    @final
+    class Concat(Chunk[Out], IConcat[Out]):
+        def __init__(self, left: Chunk[Out], right: Chunk[Out]):
+            self._left = left
+            self._right = right
+            self._length = left.length + right.length
+            self._depth = max(left.depth, right.depth) + 1
+
+        @property
+        def left(self) -> Chunk[Out]:
+            return self._left
+
+        @property
+        def right(self) -> Chunk[Out]:
+            return self._right
+
+        @property
+        def length(self) -> int:
+            return self._length
+
+        @property
+        def depth(self) -> int:
+            return self._depth
+
+        @property
+        def backing(self) -> Backing[Out]:
+            return self
+
+        def _get(self, index: int) -> Out:
+            chunk: Chunk[Out] = self
+            while isinstance(chunk, Chunks.Concat):
+                left = chunk._left
+                if index < left.length:
+                    chunk = left
+                else:
+                    index -= left.length
+                    chunk = chunk._right
+            return chunk._get(index)
+
+        def _segments(self, start: int, stop: int) -> Iterator[tuple[Sequence[Out], int, int]]:
+            # Walk the tree with an explicit stack rather than nested generators.
+            stack: list[tuple[Chunk[Out], int, int]] = [(self, start, stop)]
+            while stack:
+                chunk, start, stop = stack.pop()
+                if not isinstance(chunk, Chunks.Concat):
+                    yield from chunk._segments(start, stop)
+                    continue
+                split = chunk._left.length
+                if stop > split:
+                    stack.append((chunk._right, max(start - split, 0), stop - split))
+                if start < split:
+                    stack.append((chunk._left, start, min(stop, split)))
+
+    @final
+    class Slice(Chunk[Out], ISlice[Out]):
+        def __init__(self, chunk: Chunk[Out], offset: int, length: int):
+            if offset < 0 or length < 0 or offset + length > chunk.length:
+                raise ValueError(f'Cannot slice {length} items at offset {offset} of a chunk of {chunk.length}.')
+            if isinstance(chunk, Chunks.Slice):
+                chunk, offset = chunk._chunk, chunk._offset + offset
+            self._chunk = chunk
+            self._offset = offset
+            self._length = length
+
+        @property
+        def chunk(self) -> Chunk[Out]:
+            return self._chunk
+
+        @property
+        def offset(self) -> int:
+            return self._offset
+
+        @property
+        def length(self) -> int:
+            return self._length
+
+        @property
+        def depth(self) -> int:
+            return 0
+
+        @property
+        def left(self) -> Chunk[Out]:
+            return _EMPTY
+
+        @property
+        def right(self) -> Chunk[Out]:
+            return _EMPTY
+
+        @property
+        def backing(self) -> Backing[Out]:
+            return self
+
+        def _get(self, index: int) -> Out:
+            return self._chunk._get(self._offset + index)
+
+        def _segments(self, start: int, stop: int) -> Iterator[tuple[Sequence[Out], int, int]]:
+            return self._chunk._segments(self._offset + start, self._offset + stop)
+
+class _Appended(Chunk[Out], IConcat[Out]):
+    """
+    A chunk followed by the first `used` items of a buffer.
+
+    The buffer is shared by the chunks appended to from this one: appending to the chunk that
+    filled it last adds to the buffer in place, while appending to any other one copies its part.
+    Full buffers are never written to again, so they're linked to the tree as they are.
+    """
+
+    def __init__(self, start: Chunk[Out], buffer: list[Out], used: int, lock: threading.Lock):
+        self._start = start
+        self._buffer = buffer
+        self._used = used
+        self._lock = lock
+
+    @property
+    def left(self) -> Chunk[Out]:
+        return self._start
+
+    @property
+    def right(self) -> Chunk[Out]:
+        return Chunks.List(self._buffer[:self._used])
+
+    @property
+    def length(self) -> int:
+        return self._start.length + self._used
+
+    @property
+    def depth(self) -> int:
+        return self._start.depth + 1
+
+    @property
+    def backing(self) -> Backing[Out]:
+        return self
+
+    def append(self, item: Out) -> Chunk[Out]:
+        used = self._used
+        if used == APPEND_BUFFER_SIZE:
+            return _Appended(_concat(self._start, Chunks.List(self._buffer)), [item], 1, threading.Lock())
+        with self._lock:
+            if used == len(self._buffer):
+                self._buffer.append(item)
+                return _Appended(self._start, self._buffer, used + 1, self._lock)
+        buffer = self._buffer[:used]
+        buffer.append(item)
+        return _Appended(self._start, buffer, used + 1, threading.Lock())
+
+    def _get(self, index: int) -> Out:
+        split = self._start.length
+        return self._start._get(index) if index < split else self._buffer[index - split]
+
+    def _segments(self, start: int, stop: int) -> Iterator[tuple[Sequence[Out], int, int]]:
+        split = self._start.length
+        if start < split:
+            yield from self._start._segments(start, min(stop, split))
+        if stop > split:
+            yield self._buffer, max(start - split, 0), stop - split
+
+_EMPTY = Chunks.Empty()
+
+def _concat(left: Chunk[Out], right: Chunk[Out]) -> Chunk[Out]:
+    """
+    Concatenate two chunks, keeping the depths of the subtrees of each node within one of each other.
+
+    Only the spine of the deeper chunk down to the depth of the other one is rebuilt, so chunks of
+    similar depths are concatenated in constant time.
+    """
+    if right.length == 0:
+        return left
+    if left.length == 0:
+        return right
+    diff = right.depth - left.depth
+    if abs(diff) <= 1:
+        return Chunks.Concat(left, right)
+    if diff < -1:
+        if left.left.depth >= left.right.depth:
+            return Chunks.Concat(left.left, _concat(left.right, right))
+        right_right = _concat(left.right.right, right)
+        if right_right.depth == left.depth - 3:
+            return Chunks.Concat(left.left, Chunks.Concat(left.right.left, right_right))
+        return Chunks.Concat(Chunks.Concat(left.left, left.right.left), right_right)
+    if right.right.depth >= right.left.depth:
+        return Chunks.Concat(_concat(left, right.left), right.right)
+    left_left = _concat(left, right.left.left)
+    if left_left.depth == right.depth - 3:
+        return Chunks.Concat(Chunks.Concat(left_left, right.left.right), right.right)
+    return Chunks.Concat(left_left, Chunks.Concat(right.left.right, right.right))
+
+def _get_typecode(items: list[Any]) -> str | None:
+    kind = type(items[0])
+    if kind is not int and kind is not float:
+        return None
+    if any(type(item) is not kind for item in items):
+        return None
+    return 'q' if kind is int else 'd'
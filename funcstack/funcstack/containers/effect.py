@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Any, AsyncIterator, Callable, Coroutine, Generic, Iterator, final
-
-from unsync import unsync
+from functools import partial
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Coroutine, Generic, Iterator, Sequence, final
 
 from funcstack.typing._vars import Args, Other, Out
-from funcstack.utils.coroutines import run_sync
+from funcstack.utils.coroutines import iter_sync, run_sync
+
+if TYPE_CHECKING:
+    from funcstack.containers.stream import Stream
 
 class Effect(Generic[Out], ABC):
     def map(
@@ -12,14 +14,21 @@ class Effect(Generic[Out], ABC):
         func: Callable[[Out, Args.kwargs], Other],
         **kwargs
     ) -> 'Effect[Other]':
-        return Effects.Map(self, func, **kwargs)
+        return _fuse_map(self, func, kwargs)
 
     def flat_map(
         self,
         func: Callable[[Out, Args.kwargs], 'Effect[Other]'],
         **kwargs
     ) -> 'Effect[Other]':
-        return Effects.FlatMap(self, func, **kwargs)
+        return _fuse_flat_map(self, func, kwargs)
+
+    def to_stream(self, chunk_size: int = 1) -> 'Stream[Out]':
+        """
+        Get a stream of the outputs of this effect when iterated, grouped in chunks of `chunk_size`.
+        """
+        from funcstack.containers.stream import Streams
+        return Streams.Effect(self, chunk_size)
 
     @abstractmethod
     def invoke(self) -> Out:
@@ -74,16 +83,11 @@ class Effects:
 
     @final
     class Async(Effect[Out]):
-        def __init__(
-            self,
-            func: Callable[[], Coroutine[Any, Any, Out]],
-            max_workers: int | None = None
-        ):
+        def __init__(self, func: Callable[[], Coroutine[Any, Any, Out]]):
             self.func = func
-            self.max_workers = max_workers
 
         def invoke(self) -> Out:
-            return run_sync(self.ainvoke(), max_workers=self.max_workers)
+            return run_sync(self.ainvoke())
 
         async def ainvoke(self) -> Out:
             return await self.func()
@@ -114,28 +118,98 @@ class Effects:
 
     @final
     class AsyncIterator(Effect[Out]):
+        def __init__(self, func: Callable[[], AsyncIterator[Out]]):
+            self.func = func
+
+        def invoke(self) -> Out:
+            return run_sync(self.ainvoke())
+
+        async def ainvoke(self) -> Out:
+            return await anext(self.aiter())
+
+        def iter(self) -> Iterator[Out]:
+            yield from iter_sync(self.aiter())
+
+        async def aiter(self) -> AsyncIterator[Out]:
+            async for item in self.func():
+                yield item
+
+    @final
+    class Streaming(Effect[Out]):
+        """
+        A sync effect that can also be consumed incrementally.
+
+        Invoking it calls `func`, iterating it yields the partial outputs of `stream`
+        as they are produced.
+        """
+
+        def __init__(self, func: Callable[[], Out], stream: Callable[[], Iterator[Out]]):
+            self.func = func
+            self.stream = stream
+
+        def invoke(self) -> Out:
+            return self.func()
+
+        async def ainvoke(self) -> Out:
+            return self.invoke()
+
+        def iter(self) -> Iterator[Out]:
+            yield from self.stream()
+
+        async def aiter(self) -> AsyncIterator[Out]:
+            for item in self.stream():
+                yield item
+
+    @final
+    class AsyncStreaming(Effect[Out]):
+        """
+        An async effect that can also be consumed incrementally.
+
+        Invoking it awaits `func`, iterating it yields the partial outputs of `stream`
+        as soon as they become available.
+        """
+
         def __init__(
             self,
-            func: Callable[[], AsyncIterator[Out]],
-            max_workers: int | None = None
+            func: Callable[[], Coroutine[Any, Any, Out]],
+            stream: Callable[[], AsyncIterator[Out]]
         ):
             self.func = func
-            self.max_workers = max_workers
+            self.stream = stream
 
         def invoke(self) -> Out:
-            return run_sync(self.ainvoke(), max_workers=self.max_workers)
+            return run_sync(self.ainvoke())
 
         async def ainvoke(self) -> Out:
-            return await anext(self.aiter())
+            return await self.func()
 
         def iter(self) -> Iterator[Out]:
-            @unsync
-            async def _aiter():
-                return [item async for item in self.aiter()]
-            yield from _aiter().result()
+            yield from iter_sync(self.aiter())
 
         async def aiter(self) -> AsyncIterator[Out]:
-            async for item in self.func():
+            async for item in self.stream():
+                yield item
+
+    @final
+    class Suspend(Effect[Out]):
+        """
+        An effect built on demand by `func`, every time it's evaluated.
+        """
+
+        def __init__(self, func: Callable[[], Effect[Out]]):
+            self.func = func
+
+        def invoke(self) -> Out:
+            return self.func().invoke()
+
+        async def ainvoke(self) -> Out:
+            return await self.func().ainvoke()
+
+        def iter(self) -> Iterator[Out]:
+            yield from self.func().iter()
+
+        async def aiter(self) -> AsyncIterator[Out]:
+            async for item in self.func().aiter(): #type: ignore
                 yield item
 
     @final
@@ -183,9 +257,171 @@ class Effects:
             return await self.func(await self.effect.ainvoke(), **self.kwargs).ainvoke()
 
         def iter(self) -> Iterator[Out]:
-            for item in self.effect.iter():
-                yield self.func(item, **self.kwargs).invoke()
+            yield from _iter_through(self.effect.iter(), self.func, self.kwargs)
 
         async def aiter(self) -> AsyncIterator[Out]:
-            async for item in self.effect.aiter(): #type: ignore
-                yield await self.func(item, **self.kwargs).ainvoke()
\ No newline at end of file
+            async for item in _aiter_through(self.effect.aiter(), self.func, self.kwargs):
+                yield item
+
+    @final
+    class Chain(Generic[Out, Args], Effect[Out]):
+        """
+        A flat chain of effectful functions applied to the output of an initial effect.
+
+        Equivalent to folding `flat_map` over `funcs`, but evaluated in a single loop
+        instead of through one nested `FlatMap` per function. When iterated, every item
+        yielded by a stage is streamed through the next stage as soon as it arrives.
+        """
+
+        def __init__(
+            self,
+            effect: Effect[Any],
+            funcs: Sequence[Callable[[Any, Args.kwargs], Effect[Any]]],
+            **kwargs
+        ):
+            self.effect = effect
+            self.funcs = funcs
+            self.kwargs = kwargs
+
+        def invoke(self) -> Out:
+            output = self.effect.invoke()
+            for func in self.funcs:
+                output = func(output, **self.kwargs).invoke()
+            return output
+
+        async def ainvoke(self) -> Out:
+            output = await self.effect.ainvoke()
+            for func in self.funcs:
+                output = await func(output, **self.kwargs).ainvoke()
+            return output
+
+        def iter(self) -> Iterator[Out]:
+            stream = self.effect.iter()
+            for func in self.funcs:
+                stream = _iter_through(stream, func, self.kwargs)
+            yield from stream
+
+        async def aiter(self) -> AsyncIterator[Out]:
+            stream = self.effect.aiter()
+            for func in self.funcs:
+                stream = _aiter_through(stream, func, self.kwargs)
+            async for item in stream: #type: ignore
+                yield item
+
+def _iter_through(
+    items: Iterator[Any],
+    func: Callable[..., Effect[Out]],
+    kwargs: dict[str, Any]
+) -> Iterator[Out]:
+    # Generators are pull-based, so a stage only produces the next item
+    # once every downstream stage has consumed the previous one.
+    for item in items:
+        effect = func(item, **kwargs)
+        # Most stages output a single value, skip their generator.
+        if type(effect) is Effects.Value:
+            yield effect.value
+        elif type(effect) is Effects.Sync:
+            yield effect.func()
+        else:
+            yield from effect.iter()
+
+async def _aiter_through(
+    items: AsyncIterator[Any],
+    func: Callable[..., Effect[Out]],
+    kwargs: dict[str, Any]
+) -> AsyncIterator[Out]:
+    async for item in items:
+        effect = func(item, **kwargs)
+        if type(effect) is Effects.Value:
+            yield effect.value
+        elif type(effect) is Effects.Sync:
+            yield effect.func()
+        else:
+            async for output in effect.aiter(): #type: ignore
+                yield output
+
+def fuse(effect: Effect[Out]) -> Effect[Out]:
+    """
+    Rewrite a graph of effects into an equivalent one with fewer layers to evaluate.
+
+    - Adjacent `Map`s are fused into a single one applying the composed functions.
+    - `Map`s of `Value`s and `Sync`s become a single `Sync`.
+    - `FlatMap`s of `Value`s and `Sync`s call their function directly when evaluated,
+      rather than through the iteration of the inner effect.
+
+    `Effect.map` and `Effect.flat_map` apply these rewrites as they build the graph, so this
+    is only needed for graphs built from the effect classes directly.
+    """
+    if isinstance(effect, Effects.Map):
+        return _fuse_map(fuse(effect.effect), effect.func, effect.kwargs)
+    if isinstance(effect, Effects.FlatMap):
+        return _fuse_flat_map(fuse(effect.effect), effect.func, effect.kwargs)
+    if isinstance(effect, Effects.Chain):
+        return Effects.Chain(fuse(effect.effect), effect.funcs, **effect.kwargs)
+    return effect
+
+# The fused functions are closures rather than callable objects, which are slower to call.
+# They keep what they were built from in an attribute, so they can be fused further.
+
+def _bind(func: Callable[..., Any], kwargs: dict[str, Any]) -> Callable[[Any], Any]:
+    return partial(func, **kwargs) if kwargs else func
+
+def _compose(first: Callable[[Any], Any], second: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    funcs = getattr(first, '__composed__', (first,)) + getattr(second, '__composed__', (second,))
+    if len(funcs) == 2:
+        def composed(value: Any) -> Any:
+            return second(first(value))
+    else:
+        def composed(value: Any) -> Any:
+            for func in funcs:
+                value = func(value)
+            return value
+    composed.__composed__ = funcs # type: ignore[attr-defined]
+    return composed
+
+def _then(source: Callable[[], Any], func: Callable[[Any], Any]) -> Callable[[], Any]:
+    """
+    Get a thunk applying `func` to the output of `source`.
+    """
+    thunk = getattr(source, '__then__', None)
+    if thunk is not None:
+        return _then(thunk[0], _compose(thunk[1], func))
+    applied = getattr(source, '__apply__', None)
+    if applied is not None:
+        return _apply(applied[0], _compose(applied[1], func))
+
+    def then() -> Any:
+        return func(source())
+    then.__then__ = (source, func) # type: ignore[attr-defined]
+    return then
+
+def _apply(value: Any, func: Callable[[Any], Any]) -> Callable[[], Any]:
+    """
+    Get a thunk applying `func` to `value`.
+    """
+    def apply() -> Any:
+        return func(value)
+    apply.__apply__ = (value, func) # type: ignore[attr-defined]
+    return apply
+
+def _fuse_map(effect: Effect[Any], func: Callable[..., Out], kwargs: dict[str, Any]) -> Effect[Out]:
+    if type(effect) is Effects.Map:
+        return Effects.Map(effect.effect, _compose(_bind(effect.func, effect.kwargs), _bind(func, kwargs)))
+    if type(effect) is Effects.Sync:
+        return Effects.Sync(_then(effect.func, _bind(func, kwargs)))
+    if type(effect) is Effects.Value:
+        return Effects.Sync(_apply(effect.value, _bind(func, kwargs)))
+    return Effects.Map(effect, func, **kwargs)
+
+def _fuse_flat_map(
+    effect: Effect[Any],
+    func: Callable[..., Effect[Out]],
+    kwargs: dict[str, Any]
+) -> Effect[Out]:
+    if type(effect) is Effects.Map:
+        return _fuse_flat_map(effect.effect, _compose(_bind(effect.func, effect.kwargs), _bind(func, kwargs)), {})
+    if type(effect) is Effects.Sync:
+        return Effects.Suspend(_then(effect.func, _bind(func, kwargs)))
+    if type(effect) is Effects.Value:
+        return Effects.Suspend(_apply(effect.value, _bind(func, kwargs)))
+    return Effects.FlatMap(effect, func, **kwargs)
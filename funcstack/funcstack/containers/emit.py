@@ -0,0 +1,127 @@
+import asyncio
+from concurrent.futures import Future
+import threading
+from typing import Any, AsyncIterator, Callable, Coroutine, Generic, Iterable, Sequence
+
+from funcstack.containers.chunk import Chunk, Chunks
+from funcstack.typing._vars import Out
+
+DEFAULT_CAPACITY = 16
+
+class Emit(Generic[Out]):
+    """
+    The producing end of a bounded buffer of chunks, handed to the producers of a `Streams.Async`.
+
+    Producers block once `capacity` chunks are waiting to be consumed, so a slow consumer slows
+    them down instead of letting the buffer grow. Coroutines emit with `achunk`/`asingle`,
+    threads with `chunk`/`single`. The consumer takes everything buffered at once, so a burst
+    of small chunks reaches it as a single one.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError(f'The capacity of an Emit must be at least 1. Got {capacity}.')
+        self.capacity = capacity
+        self._queue: asyncio.Queue[tuple[Chunk[Out] | None, BaseException | None, bool]] = asyncio.Queue(capacity)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._closed = False
+        self._pending: set[Future] = set()
+        self._lock = threading.Lock()
+
+    async def achunk(self, items: Iterable[Out]) -> None:
+        chunk = Chunks.from_iterable(items)
+        if chunk:
+            await self._put(chunk)
+
+    async def asingle(self, item: Out) -> None:
+        await self._put(Chunks.Singleton(item))
+
+    def chunk(self, items: Iterable[Out]) -> None:
+        """
+        Emit a chunk from a thread other than the consumer's, blocking while the buffer is full.
+        """
+        self._run_threadsafe(self.achunk(items))
+
+    def single(self, item: Out) -> None:
+        """
+        Emit an item from a thread other than the consumer's, blocking while the buffer is full.
+        """
+        self._run_threadsafe(self.asingle(item))
+
+    async def aconsume(self, producers: Sequence[Callable[[], Coroutine[Any, Any, None]]]) -> AsyncIterator[Chunk[Out]]:
+        """
+        Run the producers concurrently and yield what they emit until they have all returned.
+
+        The first error raised by a producer is raised here, and the other producers are cancelled.
+        When the consumer stops early, the producers are cancelled and later emits fail.
+        """
+        self._loop = asyncio.get_running_loop()
+        tasks = [asyncio.ensure_future(self._produce(producer)) for producer in producers]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                items = [await self._queue.get()]
+                while not self._queue.empty():
+                    items.append(self._queue.get_nowait())
+                output: Chunk[Out] = Chunks.empty()
+                for chunk, error, done in items:
+                    if error is not None:
+                        raise error
+                    if done:
+                        remaining -= 1
+                    else:
+                        output = output.concat(chunk)
+                if output:
+                    yield output
+        finally:
+            with self._lock:
+                self._closed = True
+                pending = list(self._pending)
+            for future in pending:
+                future.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _produce(self, producer: Callable[[], Coroutine[Any, Any, None]]) -> None:
+        try:
+            await producer()
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            await self._queue.put((None, e, True))
+        else:
+            await self._queue.put((None, None, True))
+
+    async def _put(self, chunk: Chunk[Out]) -> None:
+        if self._closed:
+            raise asyncio.CancelledError('The stream was closed.')
+        await self._queue.put((chunk, None, False))
+
+    def _run_threadsafe(self, coroutine: Coroutine[Any, Any, None]) -> None:
+        loop = self._loop
+        if loop is None:
+            coroutine.close()
+            raise RuntimeError('The stream of this Emit is not being consumed.')
+        if _get_running_loop() is loop:
+            coroutine.close()
+            raise RuntimeError('Blocking emits would deadlock the loop consuming them. Use achunk or asingle.')
+        # Registering the future under the lock guarantees that closing cancels it,
+        # so the producer can't stay blocked on a buffer nobody consumes anymore.
+        with self._lock:
+            if self._closed:
+                coroutine.close()
+                raise asyncio.CancelledError('The stream was closed.')
+            future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+            self._pending.add(future)
+        try:
+            future.result()
+        finally:
+            with self._lock:
+                self._pending.discard(future)
+
+def _get_running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
@@ -0,0 +1,118 @@
+from abc import ABC, abstractmethod
+import asyncio
+import os
+from pathlib import Path
+from typing import IO, AsyncIterator, Callable, Generic, Iterator, final
+
+from funcstack.containers.chunk import Chunk, Chunks
+from funcstack.typing._vars import In, Out
+
+class Sink(Generic[In, Out], ABC):
+    """
+    The consuming end of a `Stream`, reducing its chunks to a result.
+    """
+
+    @abstractmethod
+    def run(self, chunks: Iterator[Chunk[In]]) -> Out:
+        pass
+
+    @abstractmethod
+    async def arun(self, chunks: AsyncIterator[Chunk[In]]) -> Out:
+        pass
+
+class Sinks:
+    @final
+    class Collect(Sink[Out, Chunk[Out]]):
+        """
+        Collect all the items in a single chunk. The chunks are concatenated, not copied.
+        """
+
+        def run(self, chunks: Iterator[Chunk[Out]]) -> Chunk[Out]:
+            output: Chunk[Out] = Chunks.empty()
+            for chunk in chunks:
+                output = output.concat(chunk)
+            return output
+
+        async def arun(self, chunks: AsyncIterator[Chunk[Out]]) -> Chunk[Out]:
+            output: Chunk[Out] = Chunks.empty()
+            async for chunk in chunks:
+                output = output.concat(chunk)
+            return output
+
+    @final
+    class Fold(Sink[In, Out]):
+        def __init__(self, initial: Out, func: Callable[[Out, In], Out]):
+            self.initial = initial
+            self.func = func
+
+        def run(self, chunks: Iterator[Chunk[In]]) -> Out:
+            output, func = self.initial, self.func
+            for chunk in chunks:
+                for item in chunk:
+                    output = func(output, item)
+            return output
+
+        async def arun(self, chunks: AsyncIterator[Chunk[In]]) -> Out:
+            output, func = self.initial, self.func
+            async for chunk in chunks:
+                for item in chunk:
+                    output = func(output, item)
+            return output
+
+    @final
+    class WriteFile(Sink[str | bytes, int]):
+        """
+        Write the items to a file, one write per chunk, and return the number of items written.
+
+        In async mode the writes are offloaded to a thread, so they don't block the loop.
+        """
+
+        def __init__(
+            self,
+            path: str | os.PathLike,
+            separator: str | bytes = '',
+            binary: bool = False,
+            append: bool = False,
+            encoding: str = 'utf-8'
+        ):
+            """
+            :param separator: written after every item, e.g. '\\n' to write one item per line
+            :param binary: whether the items are bytes rather than strings
+            """
+            self.path = Path(path)
+            self.separator = separator
+            self.binary = binary
+            self.append = append
+            self.encoding = encoding
+
+        def run(self, chunks: Iterator[Chunk[str | bytes]]) -> int:
+            written = 0
+            with self._open() as file:
+                for chunk in chunks:
+                    file.write(self._join(chunk))
+                    written += chunk.length
+            return written
+
+        async def arun(self, chunks: AsyncIterator[Chunk[str | bytes]]) -> int:
+            written = 0
+            file = await asyncio.to_thread(self._open)
+            try:
+                async for chunk in chunks:
+                    await asyncio.to_thread(file.write, self._join(chunk))
+                    written += chunk.length
+            finally:
+                await asyncio.to_thread(file.close)
+            return written
+
+        def _open(self) -> IO:
+            mode = ('a' if self.append else 'w') + ('b' if self.binary else '')
+            if self.binary:
+                return open(self.path, mode)
+            return open(self.path, mode, encoding=self.encoding)
+
+        def _join(self, chunk: Chunk[str | bytes]) -> str | bytes:
+            separator = self.separator
+            if self.binary and isinstance(separator, str):
+                separator = separator.encode(self.encoding)
+            joined = separator.join(chunk) # type: ignore[arg-type]
+            return joined + separator if separator else joined
@@ -0,0 +1,505 @@
+from abc import ABC, abstractmethod
+import asyncio
+from contextvars import copy_context
+from itertools import islice
+import math
+from queue import Empty, Full, Queue
+import threading
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Coroutine, Generic, Iterable, Iterator, Sequence, final
+
+from funcstack.containers.chunk import Chunk, Chunks
+from funcstack.containers.effect import Effect
+from funcstack.containers.emit import DEFAULT_CAPACITY, Emit
+from funcstack.containers.sink import Sink, Sinks
+from funcstack.typing._vars import Other, Out
+from funcstack.utils.coroutines import iter_sync
+
+DEFAULT_CHUNK_SIZE = 64
+
+class Stream(Generic[Out], ABC):
+    """
+    A lazy sequence of items, produced and consumed in chunks.
+
+    Operators run once per chunk rather than once per item, so the overhead of every stage of
+    a pipeline is amortized over the items of a chunk. Like effects, streams can be consumed
+    synchronously with `chunks` or asynchronously with `achunks`, and are re-run every time.
+    """
+
+    @abstractmethod
+    def chunks(self) -> Iterator[Chunk[Out]]:
+        pass
+
+    @abstractmethod
+    def achunks(self) -> AsyncIterator[Chunk[Out]]:
+        pass
+
+    def map(self, func: Callable[[Out], Other]) -> 'Stream[Other]':
+        return Streams.Map(self, func)
+
+    def map_chunks(self, func: Callable[[Chunk[Out]], Iterable[Other]]) -> 'Stream[Other]':
+        """
+        Map the items a chunk at a time, e.g. with the `batch` of a module.
+        """
+        return Streams.MapChunks(self, func)
+
+    def filter(self, predicate: Callable[[Out], bool]) -> 'Stream[Out]':
+        return Streams.Filter(self, predicate)
+
+    def flat_map(self, func: Callable[[Out], 'Stream[Other] | Iterable[Other]']) -> 'Stream[Other]':
+        return Streams.FlatMap(self, func)
+
+    def take(self, n: int) -> 'Stream[Out]':
+        return Streams.Take(self, n)
+
+    def buffer(self, capacity: int = DEFAULT_CAPACITY) -> 'Stream[Out]':
+        return Streams.Buffer(self, capacity)
+
+    def merge(self, *others: 'Stream[Out]', capacity: int = DEFAULT_CAPACITY) -> 'Stream[Out]':
+        return Streams.Merge([self, *others], capacity)
+
+    def throttle(self, items_per_second: float, burst: int | None = None) -> 'Stream[Out]':
+        return Streams.Throttle(self, items_per_second, burst)
+
+    def run(self, sink: Sink[Out, Other]) -> Other:
+        return sink.run(self.chunks())
+
+    async def arun(self, sink: Sink[Out, Other]) -> Other:
+        return await sink.arun(self.achunks())
+
+    def collect(self) -> Chunk[Out]:
+        return self.run(Sinks.Collect())
+
+    async def acollect(self) -> Chunk[Out]:
+        return await self.arun(Sinks.Collect())
+
+    def __iter__(self) -> Iterator[Out]:
+        for chunk in self.chunks():
+            yield from chunk
+
+    async def __aiter__(self) -> AsyncIterator[Out]:
+        async for chunk in self.achunks():
+            for item in chunk:
+                yield item
+
+class Streams:
+    @staticmethod
+    def of(*items: Out) -> Stream[Out]:
+        return Streams.Iterator(lambda: items)
+
+    @staticmethod
+    def from_iterable(items: Iterable[Out], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Stream[Out]:
+        return Streams.Iterator(lambda: items, chunk_size)
+
+    @final
+    class Iterator(Stream[Out]):
+        def __init__(self, func: Callable[[], Iterable[Out]], chunk_size: int = DEFAULT_CHUNK_SIZE):
+            self.func = func
+            self.chunk_size = chunk_size
+
+        def chunks(self) -> Iterator[Chunk[Out]]:
+            yield from _group(self.func(), self.chunk_size)
+
+        async def achunks(self) -> AsyncIterator[Chunk[Out]]:
+            for chunk in self.chunks():
+                yield chunk
+
+    @final
+    class AsyncIterator(Stream[Out]):
+        """
+        A stream of the items of an async iterable.
+
+        The items are emitted one at a time by default, since waiting for more would delay them.
+        Use `buffer` to group the ones that arrive faster than they're consumed instead.
+        """
+
+        def __init__(self, func: Callable[[], AsyncIterable[Out]], chunk_size: int = 1):
+            self.func = func
+            self.chunk_size = chunk_size
+
+        def chunks(self) -> Iterator[Chunk[Out]]:
+            yield from iter_sync(self.achunks())
+
+        async def achunks(self) -> AsyncIterator[Chunk[Out]]:
+            async for chunk in _agroup(self.func(), self.chunk_size):
+                yield chunk
+
+    @final
+    class Effect(Stream[Out]):
+        """
+        A stream of the outputs of an effect when iterated.
+        """
+
+        def __init__(self, effect: Effect[Out], chunk_size: int = 1):
+            self.effect = effect
+            self.chunk_size = chunk_size
+
+        def chunks(self) -> Iterator[Chunk[Out]]:
+            yield from _group(self.effect.iter(), self.chunk_size)
+
+        async def achunks(self) -> AsyncIterator[Chunk[Out]]:
+            async for chunk in _agroup(self.effect.aiter(), self.chunk_size):
+                yield chunk
+
+    @final
+    class Async(Stream[Out]):
+        """
+        A stream of what a producer pushes to an `Emit`, until it returns.
+
+        Coroutine functions run on the consuming loop and emit with `await emit.achunk(...)`,
+        other functions run in a thread and emit with `emit.chunk(...)`. Either way, the producer
+        waits while `capacity` chunks are buffered.
+        """
+
+        def __init__(
+            self,
+            producer: Callable[[Emit[Out]], Coroutine[Any, Any, None] | None],
+            capacity: int = DEFAULT_CAPACITY
+        ):
+            self.producer = producer
+            self.capacity = capacity
+
+        def chunks(self) -> Iterator[Chunk[Out]]:
+            yield from iter_sync(self.achunks())
+
+        async def achunks(self) -> AsyncIterator[Chunk[Out]]:
+            emit: Emit[Out] = Emit(self.capacity)
+            producer = self.producer
+
+            async def _produce() -> None:
+                if asyncio.iscoroutinefunction(producer):
+                    await producer(emit)
+                else:
+                    await asyncio.to_thread(producer, emit)
+
+            async for chunk in emit.aconsume([_produce]):
+                yield chunk
+
+    @final
+    class Map(Generic[Out, Other], Stream[Out]):
+        def __init__(self, stream: Stream[Other], func: Callable[[Other], Out]):
+            self.stream = stream
+            self.func = func
+
+        def chunks(self) -> Iterator[Chunk[Out]]:
+            func = self.func
+            for chunk in self.stream.chunks():
+                yield Chunks.List(list(map(func, chunk)))
+
+        async def achunks(self) -> AsyncIterator[Chunk[Out]]:
+            func = self.func
+            async for chunk in self.stream.achunks():
+                yield Chunks.List(list(map(func, chunk)))
+
+    @final
+    class MapChunks(Generic[Out, Other], Stream[Out]):
+        def __init__(self, stream: Stream[Other], func: Callable[[Chunk[Other]], Iterable[Out]]):
+            self.stream = stream
+            self.func = func
+
+        def chunks(self) -> Iterator[Chunk[Out]]:
+            for chunk in self.stream.chunks():
+                output = Chunks.from_iterable(self.func(chunk))
+                if output:
+                    yield output
+
+        async def achunks(self) -> AsyncIterator[Chunk[Out]]:
+            async for chunk in self.stream.achunks():
+                output = Chunks.from_iterable(self.func(chunk))
+                if output:
+                    yield output
+
+    @final
+    class Filter(Stream[Out]):
+        def __init__(self, stream: Stream[Out], predicate: Callable[[Out], bool]):
+            self.stream = stream
+            self.predicate = predicate
+
+        def chunks(self) -> Iterator[Chunk[Out]]:
+            predicate = self.predicate
+            for chunk in self.stream.chunks():
+                output = [item for item in chunk if predicate(item)]
+                if output:
+                    yield Chunks.List(output)
+
+        async def achunks(self) -> AsyncIterator[Chunk[Out]]:
+            predicate = self.predicate
+            async for chunk in self.stream.achunks():
+                output = [item for item in chunk if predicate(item)]
+                if output:
+                    yield Chunks.List(output)
+
+    @final
+    class FlatMap(Generic[Out, Other], Stream[Out]):
+        """
+        A stream of the items of the streams or iterables the items of a stream are mapped to.
+
+        The iterables of the items of a chunk are joined into a single chunk, while streams are
+        consumed chunk by chunk.
+        """
+
+        def __init__(self, stream: Stream[Other], func: Callable[[Other], Stream[Out] | Iterable[Out]]):
+            self.stream = stream
+            self.func = func
+
+        def chunks(self) -> Iterator[Chunk[Out]]:
+            func = self.func
+            for chunk in self.stream.chunks():
+                output: Chunk[Out] = Chunks.empty()
+                for item in chunk:
+                    inner = func(item)
+                    if not isinstance(inner, Stream):
+                        output = output.concat(Chunks.from_iterable(inner))
+                        continue
+                    if output:
+                        yield output
+                        output = Chunks.empty()
+                    yield from inner.chunks()
+                if output:
+                    yield output
+
+        async def achunks(self) -> AsyncIterator[Chunk[Out]]:
+            func = self.func
+            async for chunk in self.stream.achunks():
+                output: Chunk[Out] = Chunks.empty()
+                for item in chunk:
+                    inner = func(item)
+                    if not isinstance(inner, Stream):
+                        output = output.concat(Chunks.from_iterable(inner))
+                        continue
+                    if output:
+                        yield output
+                        output = Chunks.empty()
+                    async for inner_chunk in inner.achunks():
+                        yield inner_chunk
+                if output:
+                    yield output
+
+    @final
+    class Take(Stream[Out]):
+        def __init__(self, stream: Stream[Out], n: int):
+            self.stream = stream
+            self.n = n
+
+        def chunks(self) -> Iterator[Chunk[Out]]:
+            remaining = self.n
+            if remaining <= 0:
+                return
+            for chunk in self.stream.chunks():
+                if chunk.length >= remaining:
+                    yield chunk[:remaining]
+                    return
+                remaining -= chunk.length
+                yield chunk
+
+        async def achunks(self) -> AsyncIterator[Chunk[Out]]:
+            remaining = self.n
+            if remaining <= 0:
+                return
+            chunks = self.stream.achunks()
+            try:
+                async for chunk in chunks:
+                    if chunk.length >= remaining:
+                        yield chunk[:remaining]
+                        return
+                    remaining -= chunk.length
+                    yield chunk
+            finally:
+                # Stop the upstream stages now rather than whenever the loop finalizes them.
+                aclose = getattr(chunks, 'aclose', None)
+                if aclose is not None:
+                    await aclose()
+
+    @final
+    class Buffer(Stream[Out]):
+        """
+        Decouple a stream from its consumer: the stream is pulled ahead in the background,
+        up to `capacity` chunks, and the consumer gets all the chunks buffered since it last
+        pulled as one.
+        """
+
+        def __init__(self, stream: Stream[Out], capacity: int = DEFAULT_CAPACITY):
+            self.stream = stream
+            self.capacity = capacity
+
+        def chunks(self) -> Iterator[Chunk[Out]]:
+            yield from _iter_threaded([self.stream.chunks], self.capacity)
+
+        async def achunks(self) -> AsyncIterator[Chunk[Out]]:
+            async for chunk in _aiter_emitted([self.stream], self.capacity):
+                yield chunk
+
+    @final
+    class Merge(Stream[Out]):
+        """
+        Interleave the chunks of streams in the order they're produced, pulling them concurrently.
+        """
+
+        def __init__(self, streams: Sequence[Stream[Out]], capacity: int = DEFAULT_CAPACITY):
+            self.streams = streams
+            self.capacity = capacity
+
+        def chunks(self) -> Iterator[Chunk[Out]]:
+            yield from _iter_threaded([stream.chunks for stream in self.streams], self.capacity)
+
+        async def achunks(self) -> AsyncIterator[Chunk[Out]]:
+            async for chunk in _aiter_emitted(self.streams, self.capacity):
+                yield chunk
+
+    @final
+    class Throttle(Stream[Out]):
+        """
+        Limit a stream to `items_per_second` on average, letting through bursts of up to `burst` items.
+        Larger chunks are split.
+        """
+
+        def __init__(self, stream: Stream[Out], items_per_second: float, burst: int | None = None):
+            if items_per_second <= 0:
+                raise ValueError(f'items_per_second must be positive. Got {items_per_second}.')
+            self.stream = stream
+            self.items_per_second = items_per_second
+            self.burst = burst if burst is not None else max(1, math.ceil(items_per_second))
+
+        def chunks(self) -> Iterator[Chunk[Out]]:
+            bucket = _TokenBucket(self.items_per_second, self.burst)
+            for chunk in self.stream.chunks():
+                for part in _split(chunk, self.burst):
+                    delay = bucket.reserve(part.length)
+                    if delay > 0:
+                        time.sleep(delay)
+                    yield part
+
+        async def achunks(self) -> AsyncIterator[Chunk[Out]]:
+            bucket = _TokenBucket(self.items_per_second, self.burst)
+            async for chunk in self.stream.achunks():
+                for part in _split(chunk, self.burst):
+                    delay = bucket.reserve(part.length)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    yield part
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def reserve(self, cost: int) -> float:
+        """
+        Take `cost` tokens and get how long to wait before they are available.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + max(0.0, now - self.updated) * self.rate)
+        delay = max(0.0, (cost - self.tokens) / self.rate)
+        # The tokens refilled while waiting are spent on this reservation.
+        self.tokens += delay * self.rate - cost
+        self.updated = now + delay
+        return delay
+
+def _group(items: Iterable[Out], size: int) -> Iterator[Chunk[Out]]:
+    if size <= 1:
+        for item in items:
+            yield Chunks.Singleton(item)
+        return
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield Chunks.List(batch)
+
+async def _agroup(items: AsyncIterable[Out], size: int) -> AsyncIterator[Chunk[Out]]:
+    batch: list[Out] = []
+    async for item in items:
+        if size <= 1:
+            yield Chunks.Singleton(item)
+            continue
+        batch.append(item)
+        if len(batch) >= size:
+            yield Chunks.List(batch)
+            batch = []
+    if batch:
+        yield Chunks.List(batch)
+
+def _split(chunk: Chunk[Out], size: int) -> Iterator[Chunk[Out]]:
+    if chunk.length <= size:
+        yield chunk
+        return
+    for start in range(0, chunk.length, size):
+        yield chunk[start:start + size]
+
+async def _aiter_emitted(streams: Sequence[Stream[Out]], capacity: int) -> AsyncIterator[Chunk[Out]]:
+    emit: Emit[Out] = Emit(capacity)
+
+    def _pump(stream: Stream[Out]) -> Callable[[], Coroutine[Any, Any, None]]:
+        async def _produce() -> None:
+            async for chunk in stream.achunks():
+                await emit.achunk(chunk)
+        return _produce
+
+    async for chunk in emit.aconsume([_pump(stream) for stream in streams]):
+        yield chunk
+
+def _iter_threaded(sources: Sequence[Callable[[], Iterator[Chunk[Out]]]], capacity: int) -> Iterator[Chunk[Out]]:
+    """
+    The synchronous counterpart of `Emit.aconsume`: every source is pulled in a thread of its own
+    into a queue holding at most `capacity` chunks.
+    """
+    queue: Queue[tuple[Chunk[Out] | None, BaseException | None, bool]] = Queue(capacity)
+    stopped = threading.Event()
+
+    def _put(item: tuple[Chunk[Out] | None, BaseException | None, bool]) -> bool:
+        # Wake up regularly to notice when the consumer is gone.
+        while not stopped.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def _pump(source: Callable[[], Iterator[Chunk[Out]]]) -> None:
+        iterator: Iterator[Chunk[Out]] | None = None
+        try:
+            iterator = source()
+            for chunk in iterator:
+                if not _put((chunk, None, False)):
+                    return
+        except BaseException as e:
+            _put((None, e, True))
+        else:
+            _put((None, None, True))
+        finally:
+            # A generator can only be closed by the thread running it.
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+
+    threads = [
+        threading.Thread(target=copy_context().run, args=(_pump, source), daemon=True)
+        for source in sources
+    ]
+    for thread in threads:
+        thread.start()
+    remaining = len(sources)
+    try:
+        while remaining:
+            items = [queue.get()]
+            while True:
+                try:
+                    items.append(queue.get_nowait())
+                except Empty:
+                    break
+            output: Chunk[Out] = Chunks.empty()
+            for chunk, error, done in items:
+                if error is not None:
+                    raise error
+                if done:
+                    remaining -= 1
+                else:
+                    output = output.concat(chunk)
+            if output:
+                yield output
+    finally:
+        # Have the sources closed before returning, rather than whenever they are collected.
+        stopped.set()
+        for thread in threads:
+            thread.join()
@@ -0,0 +1,336 @@
+from abc import abstractmethod
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import IO, Any, AsyncIterator, Generic, Iterator, Literal, NamedTuple, TypeVar
+
+from docarray.proto import DocProto
+from docarray.utils._internal.compress import _compress_bytes, _decompress_bytes
+
+from funcstack.containers.chunk import Chunk
+from funcstack.containers.sink import Sink
+from funcstack.lazy_imports import LazyImport
+from funcstack.typing import Artifact, Utf8Artifact
+
+with LazyImport("Run 'pip install pyarrow'") as pyarrow_import:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+Row = TypeVar('Row')
+ArtifactT = TypeVar('ArtifactT', bound=Artifact)
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_MAX_BATCH_BYTES = 64 * 1024 * 1024
+
+FsyncPolicy = Literal['never', 'batch', 'close']
+
+class WriteInfo(NamedTuple):
+    artifacts: int
+    batches: int
+    bytes: int
+
+class ArtifactWriter(Generic[Row], Sink[Artifact, WriteInfo]):
+    """
+    A sink writing artifacts to a file in batches, so streams of any length are written in bounded memory.
+
+    Artifacts are serialized as they arrive and written once `batch_size` of them or `max_batch_bytes`
+    of serialized data are buffered. Each batch is flushed to the operating system, and `fsync`
+    decides when it is forced to disk: after every batch, only when the file is closed, or never.
+    In async mode the writes are offloaded to a thread, so serializing the next batch overlaps
+    with writing the previous one.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        fsync: FsyncPolicy = 'close'
+    ):
+        """
+        :param batch_size: the maximum number of artifacts buffered before they're written
+        :param max_batch_bytes: the maximum size of the serialized artifacts buffered before they're written
+        :param fsync: when to force the written data to disk
+        """
+        if batch_size < 1:
+            raise ValueError(f'batch_size must be at least 1. Got {batch_size}.')
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.fsync = fsync
+
+    def run(self, chunks: Iterator[Chunk[Artifact]]) -> WriteInfo:
+        session = _WriteSession(self, self._open())
+        try:
+            for chunk in chunks:
+                for batch in session.add(chunk):
+                    session.write(batch)
+            session.write(session.drain())
+        finally:
+            session.close()
+        return session.info()
+
+    async def arun(self, chunks: AsyncIterator[Chunk[Artifact]]) -> WriteInfo:
+        session = _WriteSession(self, await asyncio.to_thread(self._open))
+        pending: asyncio.Future | None = None
+        try:
+            async for chunk in chunks:
+                for batch in session.add(chunk):
+                    # Keep at most one batch in flight, which bounds the memory used.
+                    if pending is not None:
+                        await pending
+                    pending = asyncio.ensure_future(asyncio.to_thread(session.write, batch))
+            if pending is not None:
+                await pending
+                pending = None
+            await asyncio.to_thread(session.write, session.drain())
+        finally:
+            if pending is not None:
+                await asyncio.gather(pending, return_exceptions=True)
+            await asyncio.to_thread(session.close)
+        return session.info()
+
+    def _open(self) -> IO[bytes]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return open(self.path, 'wb')
+
+    def _start(self, file: IO[bytes]) -> Any:
+        """
+        Write the header of the file and get the state the batches are written with.
+        """
+        return None
+
+    @abstractmethod
+    def _serialize(self, artifact: Artifact) -> tuple[Row, int]:
+        """
+        Serialize an artifact and get its approximate size in bytes.
+        """
+
+    @abstractmethod
+    def _write(self, file: IO[bytes], state: Any, rows: list[Row]) -> None:
+        pass
+
+    def _finish(self, file: IO[bytes], state: Any, artifacts: int) -> None:
+        """
+        Write the footer of the file.
+        """
+
+class JsonlWriter(ArtifactWriter[bytes]):
+    """
+    Writes artifacts to a JSON Lines file, one artifact as JSON per line.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        fsync: FsyncPolicy = 'close',
+        exclude: set[str] | None = None,
+        append: bool = False
+    ):
+        """
+        :param exclude: fields of the artifacts not to write
+        :param append: whether to append to the file instead of overwriting it
+        """
+        super().__init__(path, batch_size=batch_size, max_batch_bytes=max_batch_bytes, fsync=fsync)
+        self.exclude = exclude
+        self.append = append
+
+    def _open(self) -> IO[bytes]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return open(self.path, 'ab' if self.append else 'wb')
+
+    def _serialize(self, artifact: Artifact) -> tuple[bytes, int]:
+        line = artifact.model_dump_json(exclude=self.exclude).encode('utf-8') + b'\n'
+        return line, len(line)
+
+    def _write(self, file: IO[bytes], state: Any, rows: list[bytes]) -> None:
+        file.write(b''.join(rows))
+
+class ArrowWriter(ArtifactWriter[dict[str, Any]]):
+    """
+    Writes artifacts to a Parquet or an Arrow IPC file, one row group or record batch per batch.
+
+    Every artifact is a row with its `id`, `type` (the name of its class), `name`, `mime_type`,
+    `score` and `metadata` as JSON. The content of text artifacts goes in the `text` column,
+    the bytes of the others in the `data` column.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        fsync: FsyncPolicy = 'close',
+        format: Literal['parquet', 'arrow'] = 'parquet',
+        compression: str | None = 'zstd'
+    ):
+        """
+        :param format: whether to write a Parquet file or an Arrow IPC file
+        :param compression: the compression codec of the columns
+        """
+        pyarrow_import.check()
+        super().__init__(path, batch_size=batch_size, max_batch_bytes=max_batch_bytes, fsync=fsync)
+        self.format = format
+        self.compression = compression
+
+    @property
+    def schema(self) -> 'pa.Schema':
+        return pa.schema([
+            ('id', pa.string()),
+            ('type', pa.string()),
+            ('name', pa.string()),
+            ('mime_type', pa.string()),
+            ('score', pa.float64()),
+            ('metadata', pa.string()),
+            ('text', pa.large_string()),
+            ('data', pa.large_binary())
+        ])
+
+    def _start(self, file: IO[bytes]) -> Any:
+        if self.format == 'parquet':
+            return pyarrow.parquet.ParquetWriter(file, self.schema, compression=self.compression)
+        options = pyarrow.ipc.IpcWriteOptions(compression=self.compression)
+        return pyarrow.ipc.new_file(file, self.schema, options=options)
+
+    def _serialize(self, artifact: Artifact) -> tuple[dict[str, Any], int]:
+        text = str(artifact) if isinstance(artifact, Utf8Artifact) else None
+        data = None if text is not None else bytes(artifact)
+        metadata = json.dumps(artifact.metadata, default=str)
+        row = {
+            'id': artifact.id,
+            'type': type(artifact).__name__,
+            'name': artifact.name,
+            'mime_type': artifact.mime_type,
+            'score': artifact.score,
+            'metadata': metadata,
+            'text': text,
+            'data': data
+        }
+        return row, len(metadata) + (len(text) if text is not None else len(data or b''))
+
+    def _write(self, file: IO[bytes], state: Any, rows: list[dict[str, Any]]) -> None:
+        state.write_table(pa.Table.from_pylist(rows, schema=self.schema))
+
+    def _finish(self, file: IO[bytes], state: Any, artifacts: int) -> None:
+        state.close()
+
+class ProtobufWriter(ArtifactWriter[bytes]):
+    """
+    Writes artifacts with their docarray protobuf serialization, in the streaming format of
+    `DocList.save_binary`. Read them back lazily with `read_protobuf`, since artifacts
+    override `from_bytes`, which `DocList.load_binary` relies on.
+    """
+
+    VERSION = 2
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        fsync: FsyncPolicy = 'close',
+        compress: str | None = None
+    ):
+        """
+        :param compress: the algorithm every artifact is compressed with, \
+        among the ones supported by docarray
+        """
+        super().__init__(path, batch_size=batch_size, max_batch_bytes=max_batch_bytes, fsync=fsync)
+        self.compress = compress
+
+    def _start(self, file: IO[bytes]) -> Any:
+        # The number of artifacts is only known at the end, so it's written when the file is closed.
+        file.write(self.VERSION.to_bytes(1, 'big') + (0).to_bytes(8, 'big'))
+
+    def _serialize(self, artifact: Artifact) -> tuple[bytes, int]:
+        # Not `to_bytes`, which artifacts override to get their content.
+        data = _compress_bytes(artifact.to_protobuf().SerializePartialToString(), algorithm=self.compress)
+        return len(data).to_bytes(4, 'big') + data, len(data) + 4
+
+    def _write(self, file: IO[bytes], state: Any, rows: list[bytes]) -> None:
+        file.write(b''.join(rows))
+
+    def _finish(self, file: IO[bytes], state: Any, artifacts: int) -> None:
+        file.seek(1)
+        file.write(artifacts.to_bytes(8, 'big'))
+        file.seek(0, os.SEEK_END)
+
+def read_protobuf(
+    path: str | os.PathLike,
+    artifact_type: type[ArtifactT],
+    compress: str | None = None
+) -> Iterator[ArtifactT]:
+    """
+    Lazily read the artifacts written by a `ProtobufWriter`.
+    """
+    with open(path, 'rb') as file:
+        header = file.read(9)
+        if len(header) < 9 or header[0] != ProtobufWriter.VERSION:
+            raise ValueError(f'{path} is not a protobuf stream of artifacts.')
+        for _ in range(int.from_bytes(header[1:], 'big')):
+            size = int.from_bytes(file.read(4), 'big')
+            proto = DocProto()
+            proto.ParseFromString(_decompress_bytes(file.read(size), algorithm=compress))
+            yield artifact_type.from_protobuf(proto)
+
+class _WriteSession(Generic[Row]):
+    def __init__(self, writer: ArtifactWriter[Row], file: IO[bytes]):
+        self.writer = writer
+        self.file = file
+        self.rows: list[Row] = []
+        self.size = 0
+        self.artifacts = 0
+        self.batches = 0
+        self.bytes = 0
+        self.closed = False
+        self.start = file.tell()
+        try:
+            self.state = writer._start(file)
+        except BaseException:
+            file.close()
+            raise
+
+    def add(self, chunk: Chunk[Artifact]) -> Iterator[list[Row]]:
+        writer = self.writer
+        for artifact in chunk:
+            row, size = writer._serialize(artifact)
+            self.rows.append(row)
+            self.size += size
+            if len(self.rows) >= writer.batch_size or self.size >= writer.max_batch_bytes:
+                yield self.drain()
+
+    def drain(self) -> list[Row]:
+        rows = self.rows
+        self.rows = []
+        self.size = 0
+        return rows
+
+    def write(self, rows: list[Row]) -> None:
+        if not rows:
+            return
+        self.writer._write(self.file, self.state, rows)
+        self.file.flush()
+        if self.writer.fsync == 'batch':
+            os.fsync(self.file.fileno())
+        self.artifacts += len(rows)
+        self.batches += 1
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.writer._finish(self.file, self.state, self.artifacts)
+            self.file.flush()
+            if self.writer.fsync != 'never':
+                os.fsync(self.file.fileno())
+            self.bytes = self.file.tell() - self.start
+        finally:
+            self.file.close()
+
+    def info(self) -> WriteInfo:
+        return WriteInfo(artifacts=self.artifacts, batches=self.batches, bytes=self.bytes)
@@ -3,4 +3,5 @@ from .sequential import Sequential
 from .parallel import Parallel
 from .decorator import DecoratorBase, Decorator
 from .fault_handling import *
-from .passthrough import Passthrough
\ No newline at end of file
+from .passthrough import Passthrough
+from .caching import *
\ No newline at end of file
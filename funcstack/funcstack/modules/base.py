@@ -1,15 +1,20 @@
 from abc import ABC, abstractmethod
 import asyncio
 import inspect
-from typing import Any, AsyncIterator, Callable, Coroutine, Generic, Iterator, Mapping, Sequence, Type, Union, cast, final, get_args
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Coroutine, Generic, Iterator, Mapping, Sequence, Type, Union, cast, final, get_args
 
 from pydantic import BaseModel
 
 from funcstack.containers import Effect, Effects
 from funcstack.typing import AfterRetryFailure, RetryStrategy, StopStrategy, WaitStrategy
 from funcstack.typing._vars import Args, In, Other, Out
+from funcstack.utils.coroutines import iter_sync
 from funcstack.utils.typing import create_pydantic_model, is_return_type
 
+if TYPE_CHECKING:
+    from funcstack.containers import Stream
+    from funcstack.modules.caching.backends import CacheBackend
+
 class Module(Generic[In, Out], ABC):
     name: str | None = None
 
@@ -97,6 +102,22 @@ class Module(Generic[In, Out], ABC):
             exceptions_to_handle=exceptions_to_handle
         )
 
+    def with_cache(
+        self,
+        backend: 'CacheBackend | None' = None,
+        namespace: str | None = None
+    ) -> 'Module[In, Out]':
+        from funcstack.modules.caching.cache import Cache
+        return Cache(
+            bound=self,
+            backend=backend,
+            namespace=namespace
+        )
+
+    def with_single_flight(self, namespace: str | None = None) -> 'Module[In, Out]':
+        from funcstack.modules.caching.single_flight import SingleFlight
+        return SingleFlight(bound=self, namespace=namespace)
+
     def map(self, cb: Callable[[Out], Other]) -> 'Module[In, Other]':
         return self | coerce_to_module(cb)
 
@@ -104,6 +125,44 @@ class Module(Generic[In, Out], ABC):
     def forward(self, data: In, **kwargs) -> Effect[Out]:
         pass
 
+    def is_non_blocking(self) -> bool:
+        """
+        Whether awaiting the effects of this module never runs blocking code on the event loop.
+
+        Batches and `Parallel` run the effects of blocking modules in a thread pool. An effect
+        can't tell, since an `Effects.Async` may await synchronous work, so modules that
+        only await non-blocking code should override this to return True, and modules
+        composing others should check them.
+        """
+        return False
+
+    def forward_batch(
+        self,
+        inputs: Sequence[In],
+        max_concurrency: int | None = None,
+        **kwargs
+    ) -> Effect[list[Out]]:
+        """
+        Get an effect computing the outputs for a batch of inputs, in the same order.
+
+        By default, every input is run through `forward` concurrently, offloading synchronous
+        effects to a thread pool. Modules that can process many inputs at once more efficiently
+        than one at a time should override this method.
+
+        Args:
+            inputs: The inputs to process.
+            max_concurrency: The maximum number of inputs processed at the same time, or None for no limit.
+
+        Returns:
+            An effect producing the list of outputs.
+        """
+        async def _ainvoke() -> list[Out]:
+            outputs: list[Any] = [None] * len(inputs)
+            async for index, output in self._abatch_as_completed(inputs, max_concurrency, **kwargs):
+                outputs[index] = output
+            return cast(list[Out], outputs)
+        return Effects.Async(_ainvoke)
+
     @final
     def invoke(self, data: In, **kwargs) -> Out:
         return self.forward(data, **kwargs).invoke()
@@ -121,6 +180,87 @@ class Module(Generic[In, Out], ABC):
         async for item in self.forward(data, **kwargs).aiter(): #type: ignore
             yield item
 
+    @final
+    def stream(self, data: In, *, chunk_size: int = 1, **kwargs) -> 'Stream[Out]':
+        """
+        Get a stream of the outputs of the module when iterated, to process them in chunks.
+
+        :param chunk_size: the number of outputs grouped in a chunk, so downstream stages are \
+        called once per chunk instead of once per output
+        """
+        return self.forward(data, **kwargs).to_stream(chunk_size)
+
+    @final
+    def batch(
+        self,
+        inputs: Sequence[In],
+        max_concurrency: int | None = None,
+        **kwargs
+    ) -> list[Out]:
+        _check_max_concurrency(max_concurrency)
+        return self.forward_batch(inputs, max_concurrency=max_concurrency, **kwargs).invoke()
+
+    @final
+    async def abatch(
+        self,
+        inputs: Sequence[In],
+        max_concurrency: int | None = None,
+        **kwargs
+    ) -> list[Out]:
+        _check_max_concurrency(max_concurrency)
+        return await self.forward_batch(inputs, max_concurrency=max_concurrency, **kwargs).ainvoke()
+
+    @final
+    def batch_as_completed(
+        self,
+        inputs: Sequence[In],
+        max_concurrency: int | None = None,
+        **kwargs
+    ) -> Iterator[tuple[int, Out]]:
+        """
+        Yield `(index, output)` pairs for a batch of inputs in the order they complete.
+        """
+        yield from iter_sync(self._abatch_as_completed(inputs, max_concurrency, **kwargs))
+
+    @final
+    async def abatch_as_completed(
+        self,
+        inputs: Sequence[In],
+        max_concurrency: int | None = None,
+        **kwargs
+    ) -> AsyncIterator[tuple[int, Out]]:
+        """
+        Yield `(index, output)` pairs for a batch of inputs in the order they complete.
+        """
+        async for item in self._abatch_as_completed(inputs, max_concurrency, **kwargs):
+            yield item
+
+    async def _abatch_as_completed(
+        self,
+        inputs: Sequence[In],
+        max_concurrency: int | None,
+        **kwargs
+    ) -> AsyncIterator[tuple[int, Out]]:
+        from funcstack.modules.parallel import ainvoke_offloaded
+
+        _check_max_concurrency(max_concurrency)
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency is not None else None
+
+        async def _run(index: int, data: In) -> tuple[int, Out]:
+            if semaphore is None:
+                return index, await ainvoke_offloaded(self, data, **kwargs)
+            async with semaphore:
+                return index, await ainvoke_offloaded(self, data, **kwargs)
+
+        tasks = [asyncio.ensure_future(_run(index, data)) for index, data in enumerate(inputs)]
+        try:
+            for next_completed in asyncio.as_completed(tasks):
+                yield await next_completed
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     def get_name(
         self,
         name: str | None = None,
@@ -188,6 +328,9 @@ class Modules:
 
     @final
     class Async(Module[In, Out]):
+        def is_non_blocking(self) -> bool:
+            return True
+
         def __init__(self, func: Callable[[In, Args.kwargs], Coroutine[Any, Any, Out]]):
             self.func = func
 
@@ -208,6 +351,9 @@ class Modules:
 
     @final
     class AsyncIterator(Module[In, Out]):
+        def is_non_blocking(self) -> bool:
+            return True
+
         def __init__(self, func: Callable[[In, Args.kwargs], AsyncIterator[Out]]):
             self.func = func
 
@@ -227,6 +373,11 @@ ModuleFunction = Union[
 ModuleLike = Union[Module[In, Out], ModuleFunction[In, Out]]
 ModuleMapping = Mapping[str, ModuleLike[In, Any]]
 
+def _check_max_concurrency(max_concurrency: int | None) -> None:
+    # A semaphore of 0 would never let any input through.
+    if max_concurrency is not None and max_concurrency < 1:
+        raise ValueError(f'max_concurrency must be at least 1. Got {max_concurrency}.')
+
 def coerce_to_module(thing: ModuleLike[In, Out] | ModuleMapping[In]) -> Module[In, Out]:
     if isinstance(thing, Module):
         return thing
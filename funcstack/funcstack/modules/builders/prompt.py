@@ -1,32 +1,77 @@
-from typing import Any, Type, override
+from typing import Any, Iterator, Sequence, Type, override
 
 from funcstack.utils.serialization import create_model
-from jinja2 import Template, meta
 from pydantic import BaseModel
 
 from funcstack.containers import Effect, Effects
 from funcstack.mixins import PydanticMixin
 from funcstack.modules import Module
+from funcstack.utils.templates import DEFAULT_CHUNK_SIZE, get_template, render_many, render_stream
 
 class PromptBuilder(PydanticMixin, Module[dict[str, Any], str]):
     template_str: str
     required_variables: list[str]
+    chunk_size: int
+    streaming: bool
 
-    def __init__(self, template: str, required_variables: list[str] | None = None):
-        super().__init__(template_str=template, required_variables = required_variables or [])
-        self.template = Template(template)
-        ast = self.template.environment.parse(template)
-        template_variables = meta.find_undeclared_variables(ast)
+    def __init__(
+        self,
+        template: str,
+        required_variables: list[str] | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        streaming: bool = False
+    ):
+        """
+        :param chunk_size: the minimum size of the chunks of the prompt yielded when iterating a streaming builder
+        :param streaming: whether iterating the builder yields the prompt in chunks as it's rendered, \
+        instead of the whole prompt once. Every step after a streaming builder runs once per chunk.
+        """
+        super().__init__(
+            template_str=template,
+            required_variables = required_variables or [],
+            chunk_size=chunk_size,
+            streaming=streaming
+        )
+        self.template, template_variables = get_template(template)
         self.context_variables = {v: (Any, None) for v in template_variables}
 
     def forward(self, data: dict[str, Any], **kwargs) -> Effect[str]:
         def _invoke() -> str:
-            missing_variables = [var for var in self.required_variables if var not in data]
-            if missing_variables:
-                raise ValueError(f'Missing required input variables in PromptBuilder: {', '.join(missing_variables)}.')
-            return self.template.render(data)
+            return self._render(data)
+
+        if not self.streaming:
+            return Effects.Sync(_invoke)
+
+        def _stream() -> Iterator[str]:
+            self._check_required_variables(data)
+            yield from render_stream(self.template, data, self.chunk_size)
+
+        return Effects.Streaming(_invoke, _stream)
+
+    def forward_batch(
+        self,
+        inputs: Sequence[dict[str, Any]],
+        max_concurrency: int | None = None,
+        **kwargs
+    ) -> Effect[list[str]]:
+        def _invoke() -> list[str]:
+            return self.render_many(inputs)
         return Effects.Sync(_invoke)
 
+    def render_many(self, inputs: Sequence[dict[str, Any]]) -> list[str]:
+        for data in inputs:
+            self._check_required_variables(data)
+        return render_many(self.template, inputs)
+
+    def _render(self, data: dict[str, Any]) -> str:
+        self._check_required_variables(data)
+        return self.template.render(data)
+
+    def _check_required_variables(self, data: dict[str, Any]) -> None:
+        missing_variables = [var for var in self.required_variables if var not in data]
+        if missing_variables:
+            raise ValueError(f'Missing required input variables in PromptBuilder: {', '.join(missing_variables)}.')
+
     @override
     def input_schema(self) -> Type[BaseModel]:
         return create_model(self.get_name(name='Input'), **self.context_variables)
\ No newline at end of file
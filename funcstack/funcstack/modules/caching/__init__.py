@@ -0,0 +1,3 @@
+from .backends import CacheBackend, CacheInfo, InMemoryCache, SqliteCache
+from .cache import Cache
+from .single_flight import SingleFlight, SingleFlightInfo
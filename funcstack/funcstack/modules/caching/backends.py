@@ -0,0 +1,189 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, NamedTuple
+
+MISSING = object()
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+
+class CacheBackend(ABC):
+    """
+    Storage for cached module outputs, keyed by string.
+
+    Subclasses implement `_get`, `_set`, `_clear` and `_size`;
+    the public methods keep track of hits and misses.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        """
+        Get the value stored under `key`, or `MISSING` if there is none.
+        """
+        value = self._get(key)
+        with self._stats_lock:
+            if value is MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._set(key, value)
+
+    def clear(self) -> None:
+        self._clear()
+        with self._stats_lock:
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(hits=self.hits, misses=self.misses, size=self._size())
+
+    @abstractmethod
+    def _get(self, key: str) -> Any:
+        pass
+
+    @abstractmethod
+    def _set(self, key: str, value: Any) -> None:
+        pass
+
+    @abstractmethod
+    def _clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def _size(self) -> int:
+        pass
+
+class InMemoryCache(CacheBackend):
+    """
+    An in-process LRU cache with optional time-to-live.
+
+    Values are stored by reference, so they should not be mutated after being returned.
+    """
+
+    def __init__(self, max_size: int | None = 1024, ttl: float | None = None):
+        """
+        :param max_size: the maximum number of entries, evicting the least recently used ones, or None for no limit
+        :param ttl: the number of seconds an entry stays valid, or None to keep entries until evicted
+        """
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key: str, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            if self.max_size is not None:
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _size(self) -> int:
+        return len(self._entries)
+
+class SqliteCache(CacheBackend):
+    """
+    An on-disk cache stored in a SQLite database, with LRU eviction and optional time-to-live.
+
+    Values are pickled, so they must be picklable, and the cache can be shared between processes.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_size: int | None = None,
+        ttl: float | None = None
+    ):
+        """
+        :param path: the path of the database file, created if it doesn't exist
+        :param max_size: the maximum number of entries, evicting the least recently used ones, or None for no limit
+        :param ttl: the number of seconds an entry stays valid, or None to keep entries until evicted
+        """
+        super().__init__()
+        self.path = Path(path)
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL, accessed_at REAL NOT NULL)'
+        )
+        self._connection.execute('CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)')
+
+    def _get(self, key: str) -> Any:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT value, expires_at FROM entries WHERE key = ?',
+                (key,)
+            ).fetchone()
+            if row is None:
+                return MISSING
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._connection.execute('DELETE FROM entries WHERE key = ?', (key,))
+                return MISSING
+            self._connection.execute('UPDATE entries SET accessed_at = ? WHERE key = ?', (now, key))
+        return pickle.loads(value)
+
+    def _set(self, key: str, value: Any) -> None:
+        now = time.time()
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        expires_at = now + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO entries (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, data, expires_at, now)
+            )
+            if self.max_size is not None:
+                self._connection.execute(
+                    'DELETE FROM entries WHERE key IN ('
+                    'SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+                    (self.max_size,)
+                )
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._connection.execute('DELETE FROM entries')
+
+    def _size(self) -> int:
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,216 @@
+import datetime
+from enum import Enum
+import hashlib
+import inspect
+import json
+import logging
+from pathlib import PurePath
+from typing import Any, AsyncIterator, Callable, Iterator, Sequence, override
+
+from pydantic import BaseModel
+
+from funcstack.containers import Effect
+from funcstack.modules import DecoratorBase, Module
+from funcstack.modules.caching.backends import MISSING, CacheBackend, CacheInfo, InMemoryCache
+from funcstack.typing._vars import In, Out
+
+logger = logging.getLogger(__name__)
+
+def make_cache_key(namespace: str, data: Any, kwargs: dict[str, Any]) -> str | None:
+    """
+    Get a key for calling a module with `data` and `kwargs` that's the same in every process,
+    or None if they have no canonical form.
+
+    The key is a digest of their canonical JSON, in which the items of dicts and sets are sorted,
+    so equal inputs get the same key however they were built.
+    """
+    try:
+        payload = _dumps([namespace, _canonicalize(data), _canonicalize(kwargs)])
+    except (TypeError, ValueError, RecursionError) as e:
+        logger.debug(f'Could not compute a cache key for {namespace}. Error: {e}.')
+        return None
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def make_namespace(module: Module) -> str:
+    """
+    Get the default cache namespace of a module: its name and a digest of its configuration,
+    so differently configured modules sharing a backend don't read each other's entries.
+    """
+    config = _dumps(_canonicalize(module, strict=False))
+    return f'{module.get_name()}:{hashlib.sha256(config.encode('utf-8')).hexdigest()[:16]}'
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(',', ':'))
+
+def _canonicalize(value: Any, strict: bool = True, _seen: frozenset[int] = frozenset()) -> Any:
+    """
+    Convert a value to JSON that only depends on what it's equal to.
+
+    Containers are tagged with their type, so e.g. a tuple and a list don't get the same form.
+    In strict mode, values that can't be converted faithfully raise a TypeError. Otherwise,
+    they're described by their type and public attributes, which is enough to tell
+    configurations apart.
+    """
+    if isinstance(value, Enum):
+        return {'__enum__': _get_qualname(type(value)), 'value': _canonicalize(value.value, strict, _seen)}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, bytes):
+        return {'__bytes__': value.hex()}
+    if isinstance(value, PurePath):
+        return {'__path__': str(value)}
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return {f'__{type(value).__name__}__': value.isoformat()}
+    if id(value) in _seen:
+        if strict:
+            raise ValueError(f'Cannot compute the canonical form of a recursive {type(value).__name__}.')
+        return {'__object__': _get_qualname(type(value))}
+    seen = _seen | {id(value)}
+    if isinstance(value, (list, tuple)):
+        items = [_canonicalize(item, strict, seen) for item in value]
+        return items if isinstance(value, list) else {'__tuple__': items}
+    if isinstance(value, dict):
+        pairs = [[_canonicalize(k, strict, seen), _canonicalize(v, strict, seen)] for k, v in value.items()]
+        return {'__dict__': sorted(pairs, key=_dumps)}
+    if isinstance(value, (set, frozenset)):
+        return {'__set__': sorted((_canonicalize(item, strict, seen) for item in value), key=_dumps)}
+    if isinstance(value, BaseModel):
+        # Only the declared fields, since the extra attributes of modules hold derived state.
+        fields = {name: getattr(value, name, None) for name in type(value).model_fields}
+        return {'__model__': _get_qualname(type(value)), 'fields': _canonicalize(fields, strict, seen)}
+    if inspect.isfunction(value) or inspect.isbuiltin(value) or inspect.isclass(value):
+        qualname = _get_qualname(value)
+        if '<' in qualname:
+            # Lambdas and local functions can't be told apart by name in every process.
+            if strict:
+                raise TypeError(f'Cannot compute the canonical form of {qualname}.')
+            qualname = f'{qualname}:{value.__code__.co_firstlineno}' if hasattr(value, '__code__') else qualname
+        return {'__callable__': qualname}
+    if strict:
+        raise TypeError(f'Cannot compute the canonical form of a {type(value).__name__}.')
+    state = {k: v for k, v in getattr(value, '__dict__', {}).items() if not k.startswith('_')}
+    return {'__object__': _get_qualname(type(value)), 'state': _canonicalize(state, strict, seen)}
+
+def _get_qualname(value: Any) -> str:
+    return f'{getattr(value, '__module__', None)}.{getattr(value, '__qualname__', repr(value))}'
+
+class Cache(DecoratorBase[In, Out]):
+    backend: CacheBackend
+    namespace: str
+
+    def __init__(
+        self,
+        bound: Module[In, Out],
+        backend: CacheBackend | None = None,
+        namespace: str | None = None
+    ):
+        """
+        :param namespace: the prefix of the keys of the cached outputs, by default the name of the bound module \
+        and a digest of its configuration
+        """
+        super().__init__(
+            bound=bound,
+            backend = backend or InMemoryCache(),
+            namespace = namespace or make_namespace(bound)
+        )
+
+    @override
+    def is_non_blocking(self) -> bool:
+        # Other backends read and write the cache synchronously, on the event loop when awaited.
+        return isinstance(self.backend, InMemoryCache) and super().is_non_blocking()
+
+    def cache_info(self) -> CacheInfo:
+        return self.backend.info()
+
+    def cache_clear(self) -> None:
+        self.backend.clear()
+
+    @override
+    def forward(self, data: In, **kwargs) -> Effect[Out]:
+        kwargs = {**self.kwargs, **kwargs}
+        key = make_cache_key(self.namespace, data, kwargs)
+        return _CachedEffect(
+            lambda: self.bound.forward(data, **kwargs),
+            self.backend,
+            key
+        )
+
+    @override
+    def forward_batch(
+        self,
+        inputs: Sequence[In],
+        max_concurrency: int | None = None,
+        **kwargs
+    ) -> Effect[list[Out]]:
+        # Cache every input separately, so don't hand the batch to the bound module.
+        return Module.forward_batch(self, inputs, max_concurrency=max_concurrency, **kwargs)
+
+class _CachedEffect(Effect[Out]):
+    """
+    Looks up the outputs of an effect in a cache before evaluating it.
+
+    invoke/ainvoke and iter/aiter are cached under different keys; iterated outputs
+    are stored once the iteration completes and replayed on later hits.
+    """
+
+    def __init__(
+        self,
+        effect_factory: Callable[[], Effect[Out]],
+        backend: CacheBackend,
+        key: str | None
+    ):
+        self.effect_factory = effect_factory
+        self.backend = backend
+        self.key = key
+
+    def invoke(self) -> Out:
+        if self.key is None:
+            return self.effect_factory().invoke()
+        key = f'{self.key}:invoke'
+        output = self.backend.get(key)
+        if output is MISSING:
+            output = self.effect_factory().invoke()
+            self.backend.set(key, output)
+        return output
+
+    async def ainvoke(self) -> Out:
+        if self.key is None:
+            return await self.effect_factory().ainvoke()
+        key = f'{self.key}:invoke'
+        output = self.backend.get(key)
+        if output is MISSING:
+            output = await self.effect_factory().ainvoke()
+            self.backend.set(key, output)
+        return output
+
+    def iter(self) -> Iterator[Out]:
+        if self.key is None:
+            yield from self.effect_factory().iter()
+            return
+        key = f'{self.key}:iter'
+        outputs = self.backend.get(key)
+        if outputs is not MISSING:
+            yield from outputs
+            return
+        outputs = []
+        for item in self.effect_factory().iter():
+            outputs.append(item)
+            yield item
+        self.backend.set(key, outputs)
+
+    async def aiter(self) -> AsyncIterator[Out]:
+        if self.key is None:
+            async for item in self.effect_factory().aiter(): #type: ignore
+                yield item
+            return
+        key = f'{self.key}:iter'
+        outputs = self.backend.get(key)
+        if outputs is not MISSING:
+            for item in outputs:
+                yield item
+            return
+        outputs = []
+        async for item in self.effect_factory().aiter(): #type: ignore
+            outputs.append(item)
+            yield item
+        self.backend.set(key, outputs)
@@ -0,0 +1,175 @@
+import asyncio
+from concurrent.futures import Future
+import threading
+from typing import AsyncIterator, Callable, Iterator, NamedTuple, Sequence, override
+
+from funcstack.containers import Effect
+from funcstack.modules import DecoratorBase, Module
+from funcstack.modules.caching.cache import make_cache_key
+from funcstack.typing._vars import In, Out
+
+class SingleFlightInfo(NamedTuple):
+    calls: int
+    executions: int
+    coalesced: int
+    in_flight: int
+
+class SingleFlight(DecoratorBase[In, Out]):
+    """
+    Deduplicates concurrent calls with the same input and kwargs:
+    only the first one runs the bound module, the others wait for its result.
+
+    invoke and ainvoke calls are coalesced separately. iter and aiter are passed through.
+    """
+
+    namespace: str
+
+    def __init__(
+        self,
+        bound: Module[In, Out],
+        namespace: str | None = None
+    ):
+        super().__init__(
+            bound=bound,
+            namespace = namespace or bound.get_name()
+        )
+        self._calls = 0
+        self._executions = 0
+        self._lock = threading.Lock()
+        self._sync_calls: dict[str, Future] = {}
+        self._async_calls: dict[tuple[int, str], asyncio.Future] = {}
+
+    def single_flight_info(self) -> SingleFlightInfo:
+        with self._lock:
+            return SingleFlightInfo(
+                calls=self._calls,
+                executions=self._executions,
+                coalesced=self._calls - self._executions,
+                in_flight=len(self._sync_calls) + len(self._async_calls)
+            )
+
+    @override
+    def forward(self, data: In, **kwargs) -> Effect[Out]:
+        kwargs = {**self.kwargs, **kwargs}
+        return _SingleFlightEffect(
+            self,
+            lambda: self.bound.forward(data, **kwargs),
+            make_cache_key(self.namespace, data, kwargs)
+        )
+
+    @override
+    def forward_batch(
+        self,
+        inputs: Sequence[In],
+        max_concurrency: int | None = None,
+        **kwargs
+    ) -> Effect[list[Out]]:
+        # Coalesce every input separately, so don't hand the batch to the bound module.
+        return Module.forward_batch(self, inputs, max_concurrency=max_concurrency, **kwargs)
+
+    def _join_sync(self, key: str) -> tuple[Future, bool]:
+        with self._lock:
+            self._calls += 1
+            future = self._sync_calls.get(key)
+            if future is not None:
+                return future, False
+            self._executions += 1
+            future = Future()
+            self._sync_calls[key] = future
+            return future, True
+
+    def _join_async(self, key: str, rejoin: bool = False) -> tuple[asyncio.Future, bool]:
+        """
+        :param rejoin: whether the call is joining again after the call it waited for was cancelled
+        """
+        loop = asyncio.get_running_loop()
+        # Futures are bound to their loop, so calls are only coalesced within the same loop.
+        loop_key = (id(loop), key)
+        with self._lock:
+            if not rejoin:
+                self._calls += 1
+            future = self._async_calls.get(loop_key)
+            if future is not None:
+                return future, False
+            self._executions += 1
+            future = loop.create_future()
+            # Don't warn about unretrieved exceptions when no other call was waiting.
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._async_calls[loop_key] = future
+            return future, True
+
+    def _leave_sync(self, key: str) -> None:
+        with self._lock:
+            self._sync_calls.pop(key, None)
+
+    def _leave_async(self, key: str, future: asyncio.Future) -> None:
+        loop_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            if self._async_calls.get(loop_key) is future:
+                del self._async_calls[loop_key]
+
+class _LeaderCancelled(Exception):
+    """
+    Set on the shared future when the call running the bound module is cancelled,
+    so the calls waiting for it run it again instead of failing.
+    """
+
+class _SingleFlightEffect(Effect[Out]):
+    def __init__(
+        self,
+        owner: SingleFlight,
+        effect_factory: Callable[[], Effect[Out]],
+        key: str | None
+    ):
+        self.owner = owner
+        self.effect_factory = effect_factory
+        self.key = key
+
+    def invoke(self) -> Out:
+        if self.key is None:
+            return self.effect_factory().invoke()
+        future, is_leader = self.owner._join_sync(self.key)
+        if not is_leader:
+            return future.result()
+        try:
+            output = self.effect_factory().invoke()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(output)
+            return output
+        finally:
+            self.owner._leave_sync(self.key)
+
+    async def ainvoke(self) -> Out:
+        if self.key is None:
+            return await self.effect_factory().ainvoke()
+        future, is_leader = self.owner._join_async(self.key)
+        while not is_leader:
+            try:
+                # Shield the shared future so a cancelled follower doesn't cancel the others.
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                # The first follower to rejoin becomes the leader, the others wait for it.
+                future, is_leader = self.owner._join_async(self.key, rejoin=True)
+        try:
+            output = await self.effect_factory().ainvoke()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(output)
+            return output
+        finally:
+            self.owner._leave_async(self.key, future)
+
+    def iter(self) -> Iterator[Out]:
+        yield from self.effect_factory().iter()
+
+    async def aiter(self) -> AsyncIterator[Out]:
+        async for item in self.effect_factory().aiter(): #type: ignore
+            yield item
@@ -1,2 +1,3 @@
+from .extractor_stats import ExtractorStats, ExtractorStatsInfo
 from .html_to_text import HtmlToText
 from .jinja import JinjaConverter
\ No newline at end of file
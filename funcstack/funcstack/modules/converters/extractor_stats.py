@@ -0,0 +1,80 @@
+from collections import defaultdict
+import json
+from pathlib import Path
+import threading
+from typing import NamedTuple, Sequence
+from urllib.parse import urlparse
+
+class ExtractorStatsInfo(NamedTuple):
+    documents: int
+    attempts: int
+    hosts: int
+
+    @property
+    def mean_attempts(self) -> float:
+        """
+        The average number of extractors tried per document.
+        """
+        return self.attempts / self.documents if self.documents else 0.0
+
+class ExtractorStats:
+    """
+    Learns, per host, which boilerpy3 extractors produce text for its documents.
+
+    `HtmlToText` asks for the order to try extractors in for a document's URL, and reports
+    back which ones failed and which one succeeded. Extractors that succeeded more often than
+    they failed for the host come first and those that failed more often come last. Documents without
+    a URL share one table. The tables can be saved to and loaded from a JSON file.
+    """
+
+    def __init__(self):
+        self.documents = 0
+        self.attempts = 0
+        self._scores: defaultdict[str, defaultdict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str | Path) -> 'ExtractorStats':
+        stats = cls()
+        with open(path, 'r', encoding='utf-8') as file:
+            for host, scores in json.load(file).items():
+                stats._scores[host].update(scores)
+        return stats
+
+    def save(self, path: str | Path) -> None:
+        with self._lock:
+            data = {host: dict(scores) for host, scores in self._scores.items()}
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=2, sort_keys=True)
+
+    def info(self) -> ExtractorStatsInfo:
+        with self._lock:
+            return ExtractorStatsInfo(documents=self.documents, attempts=self.attempts, hosts=len(self._scores))
+
+    def order(self, url: str | None, extractor_names: Sequence[str]) -> list[str]:
+        """
+        Sort the extractors by how reliable they've been for the URL's host, best first.
+        """
+        with self._lock:
+            scores = self._scores.get(_get_host(url))
+            if not scores:
+                return list(extractor_names)
+            # Sorting is stable, so extractors without a score keep their default order.
+            return sorted(extractor_names, key=lambda name: -scores.get(name, 0))
+
+    def record(self, url: str | None, tried: Sequence[str], succeeded: bool) -> None:
+        """
+        Record the extractors tried for a document, in order. If `succeeded`, the last one produced text.
+        """
+        with self._lock:
+            scores = self._scores[_get_host(url)]
+            failed = tried[:-1] if succeeded else tried
+            for name in failed:
+                scores[name] -= 1
+            if succeeded:
+                scores[tried[-1]] += 1
+            self.documents += 1
+            self.attempts += len(tried)
+
+def _get_host(url: str | None) -> str:
+    return urlparse(url).netloc.lower() if url else ''
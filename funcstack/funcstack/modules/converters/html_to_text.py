@@ -1,19 +1,41 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+import copy
 import logging
-from typing import Any, ClassVar, Literal
+import math
+import threading
+from typing import Any, AsyncIterator, ClassVar, Literal, Sequence
 
 from boilerpy3 import extractors
+from boilerpy3.document import TextDocument
 from boilerpy3.extractors import Extractor
 
 from funcstack.containers import Effect, Effects
 from funcstack.typing import ArtifactSource, ByteStream, TextArtifact
 from funcstack.mixins import PydanticMixin
 from funcstack.modules import Module
+from funcstack.modules.converters.extractor_stats import ExtractorStats
 from funcstack.utils.dicts import normalize_metadata
 from funcstack.utils.func import zip2
 
 logger = logging.getLogger(__name__)
 
+SHARDS_PER_PROCESS = 4
+
 class HtmlToText(PydanticMixin, Module[list[ArtifactSource], list[TextArtifact]]):
+    """
+    Extracts the text of HTML documents with boilerpy3.
+
+    Extraction is CPU-bound, so it runs off the event loop: in a worker thread by default, or
+    sharded across a pool of `num_processes` processes. Invoking the converter returns the
+    artifacts in the order of the sources, while iterating it yields each artifact, wrapped
+    in a single-item list, as soon as its document has been extracted.
+
+    With `try_others`, each document is parsed once and the parsed blocks are shared by all the
+    extractors tried on it. The extractors are tried in the order `extractor_stats` has learned
+    works best for the host of the document's `metadata['url']`.
+    """
+
     known_extractors: ClassVar[list[str]] = [
         'DefaultExtractor',
         'ArticleExtractor',
@@ -35,48 +57,194 @@ class HtmlToText(PydanticMixin, Module[list[ArtifactSource], list[TextArtifact]]
             'KeepEverythingExtractor',
             'NumWordsRulesExtractor',
         ] = 'DefaultExtractor',
-        try_others: bool = True
+        try_others: bool = True,
+        num_processes: int | None = None,
+        extractor_stats: ExtractorStats | None = None
     ):
+        """
+        :param num_processes: the number of processes to extract with, or None to extract in a worker thread
+        :param extractor_stats: the per-host extractor success table to order extractors by, \
+        which can be shared between converters and persisted
+        """
         super().__init__()
         self.extractor_type = extractor_type
         self.try_others = try_others
+        self.num_processes = num_processes
+        self.extractor_stats = extractor_stats or ExtractorStats()
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
 
     def forward(
         self,
         sources: list[ArtifactSource],
         metadata: dict[str, Any] | list[dict[str, Any]] | None = None
     ) -> Effect[list[TextArtifact]]:
-        def _invoke() -> list[TextArtifact]:
-            results: list[TextArtifact] = []
-            metadata_list = normalize_metadata(metadata, len(sources))
-
-            extractors_list = (
-                list(dict.fromkeys([self.extractor_type, *self.known_extractors]))
-                if self.try_others
-                else [self.extractor_type]
+        async def _ainvoke() -> list[TextArtifact]:
+            return (await self._aconvert_all([sources], metadata))[0]
+
+        async def _aiter() -> AsyncIterator[list[TextArtifact]]:
+            async for artifact in self._aconvert_as_completed(sources, metadata):
+                yield [artifact]
+
+        return Effects.AsyncStreaming(_ainvoke, _aiter)
+
+    def forward_batch(
+        self,
+        inputs: Sequence[list[ArtifactSource]],
+        max_concurrency: int | None = None,
+        metadata: dict[str, Any] | list[dict[str, Any]] | None = None
+    ) -> Effect[list[list[TextArtifact]]]:
+        async def _ainvoke() -> list[list[TextArtifact]]:
+            # The documents of all the inputs are sharded together.
+            return await self._aconvert_all(inputs, metadata)
+
+        return Effects.Async(_ainvoke)
+
+    def close(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    async def _aconvert_all(
+        self,
+        inputs: Sequence[list[ArtifactSource]],
+        metadata: dict[str, Any] | list[dict[str, Any]] | None
+    ) -> list[list[TextArtifact]]:
+        documents = [self._read_all(sources, metadata) for sources in inputs]
+        tasks = [self._get_task(bytestream) for docs in documents for _, bytestream in docs]
+        if not tasks:
+            return [[] for _ in inputs]
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        shard_size = (
+            max(1, math.ceil(len(tasks) / ((self.num_processes or 1) * SHARDS_PER_PROCESS)))
+            if executor is not None
+            else len(tasks)
+        )
+        shards = await asyncio.gather(*(
+            loop.run_in_executor(executor, _extract_texts, tasks[start:start + shard_size], self.try_others)
+            for start in range(0, len(tasks), shard_size)
+        ))
+
+        outcomes = iter(zip(tasks, [outcome for shard in shards for outcome in shard]))
+        results: list[list[TextArtifact]] = []
+        for docs in documents:
+            artifacts: list[TextArtifact] = []
+            for source, bytestream in docs:
+                (_, extractor_names), (text, attempts) = next(outcomes)
+                artifact = self._to_artifact(source, bytestream, text, extractor_names[:attempts])
+                if artifact is not None:
+                    artifacts.append(artifact)
+            results.append(artifacts)
+        return results
+
+    async def _aconvert_as_completed(
+        self,
+        sources: list[ArtifactSource],
+        metadata: dict[str, Any] | list[dict[str, Any]] | None
+    ) -> AsyncIterator[TextArtifact]:
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+
+        async def _convert(source: ArtifactSource, bytestream: ByteStream) -> TextArtifact | None:
+            task = self._get_task(bytestream)
+            [(text, attempts)] = await loop.run_in_executor(executor, _extract_texts, [task], self.try_others)
+            return self._to_artifact(source, bytestream, text, task[1][:attempts])
+
+        tasks = [
+            asyncio.ensure_future(_convert(source, bytestream))
+            for source, bytestream in self._read_all(sources, metadata)
+        ]
+        try:
+            for next_completed in asyncio.as_completed(tasks):
+                artifact = await next_completed
+                if artifact is not None:
+                    yield artifact
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _read_all(
+        self,
+        sources: list[ArtifactSource],
+        metadata: dict[str, Any] | list[dict[str, Any]] | None
+    ) -> list[tuple[ArtifactSource, ByteStream]]:
+        documents: list[tuple[ArtifactSource, ByteStream]] = []
+        for source, md in zip2(sources, normalize_metadata(metadata, len(sources))):
+            try:
+                documents.append((source, ByteStream.from_source(source, md)))
+            except Exception as e:
+                logger.warning(f'Could not read {source}. Skipping it. Error: {e}.')
+        return documents
+
+    def _to_artifact(
+        self,
+        source: ArtifactSource,
+        bytestream: ByteStream,
+        text: str | None,
+        tried: list[str]
+    ) -> TextArtifact | None:
+        if self.try_others:
+            self.extractor_stats.record(bytestream.metadata.get('url'), tried, succeeded=bool(text))
+        if not text:
+            logger.warning(f'Failed to extract text from {source} using extractors {tried}. Skipping it.')
+            return None
+        return TextArtifact(text, metadata=bytestream.metadata)
+
+    def _get_task(self, bytestream: ByteStream) -> tuple[str, list[str]]:
+        if not self.try_others:
+            return bytestream.to_utf8(), [self.extractor_type]
+        extractor_names = list(dict.fromkeys([self.extractor_type, *self.known_extractors]))
+        return bytestream.to_utf8(), self.extractor_stats.order(bytestream.metadata.get('url'), extractor_names)
+
+    def _get_executor(self) -> Executor | None:
+        if not self.num_processes:
+            return None
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.num_processes)
+            return self._executor
+
+def _extract_texts(tasks: list[tuple[str, list[str]]], try_others: bool) -> list[tuple[str | None, int]]:
+    # Runs in worker threads and processes, so it must stay a picklable module-level function.
+    return [_extract_text(html, extractor_names, try_others) for html, extractor_names in tasks]
+
+def _extract_text(html: str, extractor_names: list[str], try_others: bool) -> tuple[str | None, int]:
+    """
+    Get the text extracted by the first extractor that finds some, and the number of extractors tried.
+    """
+    # All the extractors parse HTML the same way and only differ in how they filter
+    # the parsed blocks, so parse once and give each extractor its own copy of the blocks.
+    parsed = _get_extractor(extractor_names[0]).parse_doc(html)
+    for attempts, extractor_name in enumerate(extractor_names, start=1):
+        try:
+            document = (
+                TextDocument([block.clone() for block in parsed.text_blocks], parsed.title)
+                if len(extractor_names) > 1
+                else parsed
             )
+            _get_extractor(extractor_name).filter.process(document)
+            text = document.content
+            if text:
+                return text, attempts
+        except Exception as e:
+            if try_others:
+                logger.warning(f'Failed to extract using {extractor_name}. Trying next extractor. Error: {e}.')
+    return None, len(extractor_names)
+
+_local = threading.local()
 
-            for source, md in zip2(sources, metadata_list):
-                try:
-                    bytestream = ByteStream.from_source(source, md)
-                except Exception as e:
-                    logger.warning(f'Could not read {source}. Skipping it. Error: {e}.')
-                    continue
-                for extractor_name in extractors_list:
-                    extractor_cls = getattr(extractors, extractor_name)
-                    extractor: Extractor = extractor_cls(raise_on_failure=False)
-                    try:
-                        text = extractor.get_content(bytestream.to_utf8())
-                        if text:
-                            break
-                    except Exception as e:
-                        if self.try_others:
-                            logger.warning(f'Failed to extract using {extractor_name} from {source}. Trying next extractor. Error: {e}.')
-                if not text:
-                    logger.warning(f'Failed to extract text using extractors {extractors_list}. Skipping it.')
-                    continue
-                results.append(TextArtifact(text, metadata=bytestream.metadata))
-
-            return results
-
-        return Effects.Sync(_invoke)
\ No newline at end of file
+def _get_extractor(extractor_name: str) -> Extractor:
+    # Some filters keep the state of the document they process, like the title candidates of
+    # DocumentTitleMatchClassifier, and the instances of an extractor class share their filter
+    # chain, so every thread gets its own copy of the chain.
+    cache: dict[str, Extractor] = _local.__dict__.setdefault('extractors', {})
+    extractor = cache.get(extractor_name)
+    if extractor is None:
+        extractor = getattr(extractors, extractor_name)(raise_on_failure=False)
+        extractor.filter = copy.deepcopy(extractor.filter)
+        cache[extractor_name] = extractor
+    return extractor
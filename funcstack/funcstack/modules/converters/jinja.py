@@ -1,16 +1,18 @@
-from typing import Any, Type, cast, override
+from typing import Any, Iterator, Sequence, Type, cast, override
 
-from jinja2 import Template, meta
 from pydantic import Field
 
 from funcstack.containers import Effect, Effects
 from funcstack.mixins import PydanticMixin
 from funcstack.modules import Module
 from funcstack.typing._vars import Out
+from funcstack.utils.templates import DEFAULT_CHUNK_SIZE, get_template, render_many, render_stream
 
 class JinjaConverter(PydanticMixin, Module[Any, Out]):
     template_str: str
     output_type: Type[Out] = Field(default=Any)
+    chunk_size: int = Field(default=DEFAULT_CHUNK_SIZE)
+    streaming: bool = Field(default=False)
 
     @property
     @override
@@ -20,15 +22,41 @@ class JinjaConverter(PydanticMixin, Module[Any, Out]):
     def __init__(
         self,
         template: str,
-        output_type: Type[Out] = Any
+        output_type: Type[Out] = Any,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        streaming: bool = False
     ):
-        super().__init__(template_str=template, output_type=output_type)
-        self.template = Template(template)
-        ast = self.template.environment.parse(template)
-        template_variables = meta.find_undeclared_variables(ast)
+        """
+        :param chunk_size: the minimum size of the chunks of the output yielded when iterating a streaming converter
+        :param streaming: whether iterating the converter yields the output in chunks as it's rendered, \
+        instead of the whole output once
+        """
+        super().__init__(template_str=template, output_type=output_type, chunk_size=chunk_size, streaming=streaming)
+        self.template, template_variables = get_template(template)
         self.context_variables = {v: (Any, None) for v in template_variables}
 
     def forward(self, context: Any, **kwargs) -> Effect[Out]:
         def _invoke() -> Out:
             return cast(Out, self.template.render(context))
-        return Effects.Sync(_invoke)
\ No newline at end of file
+
+        if not self.streaming:
+            return Effects.Sync(_invoke)
+
+        def _stream() -> Iterator[Out]:
+            for chunk in render_stream(self.template, context, self.chunk_size):
+                yield cast(Out, chunk)
+
+        return Effects.Streaming(_invoke, _stream)
+
+    def forward_batch(
+        self,
+        inputs: Sequence[Any],
+        max_concurrency: int | None = None,
+        **kwargs
+    ) -> Effect[list[Out]]:
+        def _invoke() -> list[Out]:
+            return self.render_many(inputs)
+        return Effects.Sync(_invoke)
+
+    def render_many(self, contexts: Sequence[Any]) -> list[Out]:
+        return cast(list[Out], render_many(self.template, contexts))
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import Any, Type, cast, override
+from typing import TYPE_CHECKING, Any, Sequence, Type, cast, override
 
 from pydantic import BaseModel
 
@@ -7,6 +7,9 @@ from funcstack.mixins import PydanticMixin
 from funcstack.modules import Module
 from funcstack.typing._vars import In, Out
 
+if TYPE_CHECKING:
+    from funcstack.modules.caching.backends import CacheBackend
+
 class DecoratorBase(PydanticMixin, Module[In, Out]):
     bound: Module[In, Out]
     kwargs: dict[str, Any]
@@ -47,9 +50,25 @@ class DecoratorBase(PydanticMixin, Module[In, Out]):
             **fields
         )
 
+    @override
+    def is_non_blocking(self) -> bool:
+        return self.bound.is_non_blocking()
+
     def forward(self, data: In, **kwargs) -> Effect[Out]:
         return self.bound.forward(data, **{**self.kwargs, **kwargs})
 
+    def forward_batch(
+        self,
+        inputs: Sequence[In],
+        max_concurrency: int | None = None,
+        **kwargs
+    ) -> Effect[list[Out]]:
+        return self.bound.forward_batch(
+            inputs,
+            max_concurrency=max_concurrency,
+            **{**self.kwargs, **kwargs}
+        )
+
     @override
     def get_name(
         self,
@@ -102,6 +121,28 @@ class Decorator(DecoratorBase[In, Out]):
             kwargs=self.kwargs
         )
 
+    @override
+    def with_cache(
+        self,
+        backend: 'CacheBackend | None' = None,
+        namespace: str | None = None
+    ) -> Module[In, Out]:
+        return self.__class__(
+            bound=self.bound.with_cache(backend=backend, namespace=namespace),
+            custom_input_type=self.custom_input_type,
+            custom_output_type=self.custom_output_type,
+            kwargs=self.kwargs
+        )
+
+    @override
+    def with_single_flight(self, namespace: str | None = None) -> Module[In, Out]:
+        return self.__class__(
+            bound=self.bound.with_single_flight(namespace=namespace),
+            custom_input_type=self.custom_input_type,
+            custom_output_type=self.custom_output_type,
+            kwargs=self.kwargs
+        )
+
     @override
     def with_fallbacks(self, *args, **kwargs) -> Module[In, Out]:
         return self.__class__(
@@ -2,6 +2,7 @@ from typing import Iterator, Sequence, Type, override
 
 from funcstack.containers import Effect, Effects
 from funcstack.modules import DecoratorBase, Module
+from funcstack.modules.parallel import ainvoke_offloaded
 from funcstack.typing._vars import In, Out
 
 class Fallbacks(DecoratorBase[In, Out]):
@@ -25,6 +26,11 @@ class Fallbacks(DecoratorBase[In, Out]):
             exceptions_to_handle = exceptions_to_handle or (Exception,)
         )
 
+    @override
+    def is_non_blocking(self) -> bool:
+        # Blocking modules are offloaded to a thread pool.
+        return True
+
     @override
     def forward(self, data: In, **kwargs) -> Effect[Out]:
         async def _ainvoke() -> Out:
@@ -33,7 +39,8 @@ class Fallbacks(DecoratorBase[In, Out]):
 
             for mod in self._modules:
                 try:
-                    output = await mod.ainvoke(
+                    output = await ainvoke_offloaded(
+                        mod,
                         data,
                         first_error=first_error,
                         last_error=last_error,
@@ -51,4 +58,14 @@ class Fallbacks(DecoratorBase[In, Out]):
                 raise ValueError('No error stored at end of fallbacks.')
             raise first_error
 
-        return Effects.Async(_ainvoke)
\ No newline at end of file
+        return Effects.Async(_ainvoke)
+
+    @override
+    def forward_batch(
+        self,
+        inputs: Sequence[In],
+        max_concurrency: int | None = None,
+        **kwargs
+    ) -> Effect[list[Out]]:
+        # Fallbacks apply to each input separately, so don't hand the batch to the bound module.
+        return Module.forward_batch(self, inputs, max_concurrency=max_concurrency, **kwargs)
\ No newline at end of file
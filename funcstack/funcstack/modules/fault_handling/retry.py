@@ -1,9 +1,10 @@
-from typing import Any, override
+from typing import Any, Sequence, override
 
 from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_none
 
 from funcstack.containers import Effect, Effects
 from funcstack.modules import DecoratorBase, Module
+from funcstack.modules.parallel import ainvoke_offloaded
 from funcstack.typing import AfterRetryFailure, RetryStrategy, StopStrategy, WaitStrategy
 from funcstack.typing._vars import In, Out
 
@@ -39,13 +40,28 @@ class Retry(DecoratorBase[In, Out]):
             after=after
         )
 
+    @override
+    def is_non_blocking(self) -> bool:
+        # Blocking modules are offloaded to a thread pool.
+        return True
+
     @override
     def forward(self, data: In, **kwargs) -> Effect[Out]:
         async def _ainvoke() -> Out:
             async for attempt in AsyncRetrying(**self._retry_kwargs):
                 with attempt:
-                    result = await super().ainvoke(data, retry_state=attempt.retry_state, **kwargs)
+                    result = await ainvoke_offloaded(self.bound, data, **{**self.kwargs, **kwargs})
                 if attempt.retry_state.outcome and not attempt.retry_state.outcome.failed:
                     attempt.retry_state.set_result(result)
             return result
-        return Effects.Async(_ainvoke)
\ No newline at end of file
+        return Effects.Async(_ainvoke)
+
+    @override
+    def forward_batch(
+        self,
+        inputs: Sequence[In],
+        max_concurrency: int | None = None,
+        **kwargs
+    ) -> Effect[list[Out]]:
+        # Retries apply to each input separately, so don't hand the batch to the bound module.
+        return Module.forward_batch(self, inputs, max_concurrency=max_concurrency, **kwargs)
\ No newline at end of file
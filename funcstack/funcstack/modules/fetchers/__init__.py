@@ -1 +1,3 @@
-from .link_content import LinkContentFetcher
\ No newline at end of file
+from .http_cache import HttpCache, HttpCacheInfo
+from .link_content import LinkContentFetcher
+from .politeness import HostRateLimiter, HostRateLimiterInfo
\ No newline at end of file
@@ -0,0 +1,231 @@
+from email.utils import parsedate_to_datetime
+import hashlib
+import logging
+import mmap
+import os
+from pathlib import Path
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Mapping, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 1024 * 1024 * 1024
+MMAP_THRESHOLD = 1024 * 1024
+
+class HttpCacheEntry(NamedTuple):
+    url: str
+    path: str
+    size: int
+    content_type: str
+    etag: str | None
+    last_modified: str | None
+    expires_at: float
+
+class HttpCacheInfo(NamedTuple):
+    hits: int
+    revalidations: int
+    misses: int
+    entries: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The share of lookups served from the cache, with or without revalidation.
+        """
+        lookups = self.hits + self.revalidations + self.misses
+        return (self.hits + self.revalidations) / lookups if lookups else 0.0
+
+class HttpCache:
+    """
+    An on-disk HTTP response cache for `LinkContentFetcher`.
+
+    Bodies are stored as files in `directory` and indexed in a SQLite database. Responses are
+    considered fresh for their `Cache-Control: max-age` or until their `Expires` date, and are
+    revalidated with `If-None-Match`/`If-Modified-Since` afterwards, so unchanged content costs
+    a 304 instead of a download. The least recently used bodies are evicted past `max_size` bytes.
+    """
+
+    def __init__(self, directory: str | Path, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self._bodies = self.directory / 'bodies'
+        self._bodies.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self.directory / 'index.db',
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            'url TEXT PRIMARY KEY, path TEXT NOT NULL, size INTEGER NOT NULL, content_type TEXT NOT NULL, '
+            'etag TEXT, last_modified TEXT, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+        )
+        self._connection.execute('CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)')
+
+    def info(self) -> HttpCacheInfo:
+        with self._lock:
+            entries, size = self._connection.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        return HttpCacheInfo(
+            hits=self.hits,
+            revalidations=self.revalidations,
+            misses=self.misses,
+            entries=entries,
+            size=size
+        )
+
+    def lookup(self, url: str) -> HttpCacheEntry | None:
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT url, path, size, content_type, etag, last_modified, expires_at FROM entries WHERE url = ?',
+                (url,)
+            ).fetchone()
+        return HttpCacheEntry(*row) if row is not None else None
+
+    def is_fresh(self, entry: HttpCacheEntry) -> bool:
+        return entry.expires_at > time.time()
+
+    def conditional_headers(self, entry: HttpCacheEntry | None) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def load(
+        self,
+        entry: HttpCacheEntry,
+        revalidated_headers: Mapping[str, str] | None = None
+    ) -> tuple[dict[str, str], bytes | mmap.mmap] | None:
+        """
+        Get the headers and body of a cached response, or None if its body is gone.
+
+        Pass the headers of a 304 response as `revalidated_headers` to extend the entry's freshness.
+        """
+        try:
+            body = _read_file(Path(entry.path), entry.size)
+        except OSError as e:
+            logger.debug(f'Cached body of {entry.url} could not be read. Error: {e}.')
+            self._delete(entry.url)
+            return None
+        now = time.time()
+        with self._lock:
+            if revalidated_headers is not None:
+                self.revalidations += 1
+                self._connection.execute(
+                    'UPDATE entries SET expires_at = ?, etag = COALESCE(?, etag), accessed_at = ? WHERE url = ?',
+                    (_expires_at(revalidated_headers, now), revalidated_headers.get('ETag'), now, entry.url)
+                )
+            else:
+                self.hits += 1
+                self._connection.execute('UPDATE entries SET accessed_at = ? WHERE url = ?', (now, entry.url))
+        return {'Content-Type': entry.content_type}, body
+
+    def store(self, url: str, headers: Mapping[str, str], body: bytes | mmap.mmap) -> None:
+        """
+        Record a full response, unless it's not cacheable or larger than the whole cache.
+        """
+        with self._lock:
+            self.misses += 1
+        cache_control = _parse_cache_control(headers)
+        if 'no-store' in cache_control or len(body) > self.max_size:
+            return
+        now = time.time()
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        expires_at = _expires_at(headers, now)
+        if etag is None and last_modified is None and expires_at <= now:
+            # Nothing to revalidate with and not fresh either, so it could never be reused.
+            return
+
+        path = self._bodies / hashlib.sha256(url.encode('utf-8')).hexdigest()
+        fd, tmp_path = tempfile.mkstemp(dir=self._bodies, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(memoryview(body))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f'Could not cache the body of {url}. Error: {e}.')
+            Path(tmp_path).unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO entries '
+                '(url, path, size, content_type, etag, last_modified, expires_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, str(path), len(body), headers.get('Content-Type', ''), etag, last_modified, expires_at, now)
+            )
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            paths = [row[0] for row in self._connection.execute('SELECT path FROM entries')]
+            self._connection.execute('DELETE FROM entries')
+            self.hits = self.revalidations = self.misses = 0
+        for path in paths:
+            Path(path).unlink(missing_ok=True)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _delete(self, url: str) -> None:
+        with self._lock:
+            self._connection.execute('DELETE FROM entries WHERE url = ?', (url,))
+
+    def _evict(self) -> None:
+        total = self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_size:
+            return
+        evicted: list[tuple[str, str]] = []
+        for url, path, size in self._connection.execute(
+            'SELECT url, path, size FROM entries ORDER BY accessed_at'
+        ).fetchall():
+            if total <= self.max_size:
+                break
+            evicted.append((url, path))
+            total -= size
+        self._connection.executemany('DELETE FROM entries WHERE url = ?', [(url,) for url, _ in evicted])
+        for _, path in evicted:
+            Path(path).unlink(missing_ok=True)
+
+def _read_file(path: Path, size: int) -> bytes | mmap.mmap:
+    with open(path, 'rb') as file:
+        if size < MMAP_THRESHOLD:
+            return file.read()
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+def _parse_cache_control(headers: Mapping[str, str]) -> dict[str, str | None]:
+    directives: dict[str, str | None] = {}
+    for directive in headers.get('Cache-Control', '').split(','):
+        name, _, value = directive.strip().partition('=')
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+def _expires_at(headers: Mapping[str, str], now: float) -> float:
+    cache_control = _parse_cache_control(headers)
+    if 'no-cache' in cache_control:
+        return now
+    max_age = cache_control.get('max-age')
+    if max_age is not None and max_age.isdigit():
+        return now + int(max_age)
+    expires = headers.get('Expires')
+    if expires:
+        try:
+            return parsedate_to_datetime(expires).timestamp()
+        except (TypeError, ValueError):
+            return now
+    return now
@@ -1,16 +1,31 @@
+import asyncio
+import codecs
 from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
 import logging
-from typing import Callable
+import mmap
+import tempfile
+import threading
+from typing import IO, Any, AsyncIterator, Callable, Mapping, Self, Sequence, cast
+import weakref
 
 import requests
-from tenacity import RetryCallState, retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+from requests.adapters import HTTPAdapter
+from tenacity import AsyncRetrying, RetryCallState, retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from funcstack.containers import Effect, Effects
+from funcstack.lazy_imports import LazyImport
 from funcstack.mixins import PydanticMixin
 from funcstack.modules import Module
+from funcstack.modules.fetchers.http_cache import HttpCache, HttpCacheEntry, HttpCacheInfo
+from funcstack.modules.fetchers.politeness import HostRateLimiter, PolitenessScheduler, get_retry_after
 from funcstack.typing import ByteStream
 from funcstack.version import __version__
 
+with LazyImport("Run 'pip install httpx'") as httpx_import:
+    import httpx
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_USER_AGENT = f'funcstack/LinkContentFetcher/{__version__}'
@@ -20,96 +35,237 @@ REQUEST_HEADERS = {
     'Accept-Language': 'en-US,en;q=0.9,it;q=0.8,es;q=0.7',
     'referer': 'https://www.google.com/',
 }
+DEFAULT_POOL_SIZE = 10
+DEFAULT_SPOOL_THRESHOLD = 8 * 1024 * 1024
+DEFAULT_CHUNK_SIZE = 64 * 1024
 
 class LinkContentFetcher(PydanticMixin, Module[list[str], list[ByteStream]]):
+    """
+    Fetches the content of a list of URLs into `ByteStream`s.
+
+    Connections are pooled and kept alive across calls, either in a shared `requests.Session`
+    used from a thread pool, or in a shared `httpx.AsyncClient` when `async_client` is set.
+    Invoking the fetcher returns the streams in the order of the URLs, while iterating it
+    yields each stream, wrapped in a single-item list, as soon as it has been fetched.
+
+    Fetches are started round-robin across hosts and can be rate limited per host with a
+    `HostRateLimiter`. Retries honor the `Retry-After` header of 429 and 503 responses,
+    holding off the whole host rather than just the failed URL.
+    """
+
     headers: dict[str, str]
     user_agents: list[str]
     max_workers: int | None
+    max_connections_per_host: int | None
+    async_client: bool
     retry_attempts: int
     wait_multiplier: int
     wait_min: int
     wait_max: int
     timeout: int
     raise_on_failure: bool
+    max_bytes: int | None
+    spool_threshold: int
+    chunk_size: int
+    http_cache: HttpCache | None
+    rate_limiter: HostRateLimiter | None
 
     def __init__(
         self,
         headers: dict[str, str] | None = None,
         user_agents: list[str] | None = None,
         max_workers: int | None = None,
+        max_connections_per_host: int | None = None,
+        async_client: bool = False,
         retry_attempts: int = 2,
         wait_multiplier: int = 1,
         wait_min: int = 2,
         wait_max: int = 10,
         timeout: int = 3,
-        raise_on_failure: bool = True
+        raise_on_failure: bool = True,
+        max_bytes: int | None = None,
+        spool_threshold: int = DEFAULT_SPOOL_THRESHOLD,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        http_cache: HttpCache | None = None,
+        rate_limiter: HostRateLimiter | None = None
     ):
+        """
+        :param max_workers: the maximum number of URLs fetched at the same time
+        :param max_connections_per_host: the maximum number of URLs fetched from the same host at the same time
+        :param async_client: whether to fetch with a shared `httpx.AsyncClient` instead of a thread pool
+        :param max_bytes: the maximum size of a response body, larger ones fail to download
+        :param spool_threshold: the size past which a body is spooled to a memory-mapped temporary file
+        :param chunk_size: the size of the chunks bodies are streamed in
+        :param http_cache: an on-disk cache honoring ETag, Last-Modified and Cache-Control headers
+        :param rate_limiter: per-host request rate limits, which can be shared between fetchers
+        """
+        if async_client:
+            httpx_import.check()
         super().__init__(
             headers = headers or REQUEST_HEADERS,
             user_agents = user_agents or [DEFAULT_USER_AGENT],
             max_workers=max_workers,
+            max_connections_per_host=max_connections_per_host,
+            async_client=async_client,
             retry_attempts=retry_attempts,
             wait_multiplier=wait_multiplier,
             wait_min=wait_min,
             wait_max=wait_max,
             timeout=timeout,
-            raise_on_failure=raise_on_failure
+            raise_on_failure=raise_on_failure,
+            max_bytes=max_bytes,
+            spool_threshold=spool_threshold,
+            chunk_size=chunk_size,
+            http_cache=http_cache,
+            rate_limiter=rate_limiter
         )
         self.current_user_agent_idx = 0
-        self.handlers: dict[str, Callable[[requests.Response], ByteStream]] = {
+        self.handlers: dict[str, Callable[[bytes | mmap.mmap, Mapping[str, str]], ByteStream]] = {
             'text/html': _text_content_handler,
             'text/plain': _text_content_handler,
             'application/pdf': _binary_content_handler,
             'application/octet-stream': _binary_content_handler
         }
 
+        pool_size = max_workers or DEFAULT_POOL_SIZE
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+        self._async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, 'httpx.AsyncClient'] = (
+            weakref.WeakKeyDictionary()
+        )
+
         @retry(
             reraise=True,
             retry=retry_if_exception_type((requests.HTTPError, requests.RequestException)),
             stop=stop_after_attempt(self.retry_attempts),
-            wait=wait_exponential(multiplier=self.wait_multiplier, min=self.wait_min, max=self.wait_max),
+            wait=lambda retry_state: self._get_retry_wait(retry_state.args[0], retry_state),
             after=self._switch_user_agent
         )
-        def get_response(self, url: str) -> requests.Response:
-            headers = self.headers.copy()
-            headers['User-Agent'] = self.user_agents[self.current_user_agent_idx]
-            response = requests.get(url, headers=headers, timeout=self.timeout)
-            response.raise_for_status()
-            return response
-        self._get_response = get_response
+        def download(url: str) -> tuple[Mapping[str, str], bytes | mmap.mmap]:
+            entry, cached = self._lookup_cache(url)
+            if cached is not None:
+                return cached
+            headers = self._get_headers(entry)
+            with self._session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+                if entry is not None and response.status_code == 304:
+                    cached = self._revalidate_cache(entry, response.headers)
+                    # The cached body may have been evicted in the meantime.
+                    return cached if cached is not None else download(url)
+                response.raise_for_status()
+                self._check_content_type(url, response.headers)
+                body = _BodyBuffer(url, response.headers, self.max_bytes, self.spool_threshold)
+                with body:
+                    for chunk in response.iter_content(self.chunk_size):
+                        body.write(chunk)
+                    content = body.getvalue()
+                self._store_cache(url, response.headers, content)
+                return response.headers, content
+        self._download = download
 
     def with_retry(self, **kwargs) -> Module[list[str], list[ByteStream]]:
         logger.warning('LinkContentFetcher already implements retry behavior. Call to with_retry(...) is ignored.')
         return self
 
+    def is_non_blocking(self) -> bool:
+        # Blocking requests run in the fetcher's own thread pool.
+        return True
+
     def forward(self, urls: list[str], **kwargs) -> Effect[list[ByteStream]]:
-        def _invoke() -> list[ByteStream]:
-            streams: list[ByteStream] = []
+        async def _ainvoke() -> list[ByteStream]:
+            return await self._afetch_all(urls, self._create_scheduler())
+
+        async def _aiter() -> AsyncIterator[list[ByteStream]]:
+            async for stream in self._afetch_as_completed(urls, self._create_scheduler()):
+                yield [stream]
 
-            if not urls:
-                return streams
+        return Effects.AsyncStreaming(_ainvoke, _aiter)
 
-            if len(urls) == 1:
-                streams.append(self._fetch(urls[0]))
-            else:
-                with ThreadPoolExecutor(self.max_workers) as executor:
-                    results = executor.map(self._fetch_with_exception_suppression, urls)
-                    for result in results:
-                        if not result.is_empty():
-                            streams.append(result)
+    def forward_batch(
+        self,
+        inputs: Sequence[list[str]],
+        max_concurrency: int | None = None,
+        **kwargs
+    ) -> Effect[list[list[ByteStream]]]:
+        async def _ainvoke() -> list[list[ByteStream]]:
+            # Fetch the URLs of all the inputs under the same limits,
+            # keeping the error handling forward applies to each input.
+            scheduler = self._create_scheduler(max_concurrency)
+            return list(await asyncio.gather(*(self._afetch_all(urls, scheduler) for urls in inputs)))
 
-            return streams
+        return Effects.Async(_ainvoke)
 
-        return Effects.Sync(_invoke)
+    def cache_info(self) -> HttpCacheInfo | None:
+        return self.http_cache.info() if self.http_cache is not None else None
+
+    def close(self) -> None:
+        self._session.close()
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    async def aclose(self) -> None:
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+        self.close()
+
+    async def _afetch_all(self, urls: list[str], scheduler: PolitenessScheduler) -> list[ByteStream]:
+        if not urls:
+            return []
+        if len(urls) == 1:
+            return [await scheduler.run(urls[0], partial(self._afetch, urls[0]))]
+        tasks = self._schedule(urls, scheduler)
+        streams = await asyncio.gather(*(tasks[i] for i in range(len(urls))))
+        return [stream for stream in streams if not stream.is_empty()]
+
+    async def _afetch_as_completed(
+        self,
+        urls: list[str],
+        scheduler: PolitenessScheduler
+    ) -> AsyncIterator[ByteStream]:
+        if not urls:
+            return
+        if len(urls) == 1:
+            yield await scheduler.run(urls[0], partial(self._afetch, urls[0]))
+            return
+        tasks = list(self._schedule(urls, scheduler).values())
+        try:
+            for next_completed in asyncio.as_completed(tasks):
+                stream = await next_completed
+                if not stream.is_empty():
+                    yield stream
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _schedule(self, urls: list[str], scheduler: PolitenessScheduler) -> dict[int, asyncio.Future[ByteStream]]:
+        # Tasks queue up for the overall concurrency limit in the order they start,
+        # so start them round-robin by host.
+        return {
+            i: asyncio.ensure_future(
+                scheduler.run(urls[i], partial(self._afetch_with_exception_suppression, urls[i]))
+            )
+            for i in scheduler.interleave(urls)
+        }
+
+    async def _afetch(self, url: str) -> ByteStream:
+        if not self.async_client:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), copy_context().run, self._fetch, url)
 
-    def _fetch(self, url: str) -> ByteStream:
         content_type = 'text/html'
         stream = ByteStream(b'', content_type, metadata={})
 
         try:
-            response = self._get_response(url)
-            content_type = _get_content_type(response)
-            stream = self.handlers[content_type](response)
+            headers, body = await self._adownload(url)
+            content_type = _get_content_type(headers)
+            stream = self.handlers[content_type](body, headers)
             stream.metadata.update({'url': url, 'content_type': content_type})
         except Exception as e:
             if self.raise_on_failure:
@@ -120,10 +276,10 @@ class LinkContentFetcher(PydanticMixin, Module[list[str], list[ByteStream]]):
 
         return stream
 
-    def _fetch_with_exception_suppression(self, url: str) -> ByteStream:
+    async def _afetch_with_exception_suppression(self, url: str) -> ByteStream:
         if self.raise_on_failure:
             try:
-                return self._fetch(url)
+                return await self._afetch(url)
             except Exception as e:
                 logger.warning(f'Error fetching {url}: {e}')
                 content_type = 'Unknown'
@@ -133,17 +289,208 @@ class LinkContentFetcher(PydanticMixin, Module[list[str], list[ByteStream]]):
                     metadata={'url': url, 'content_type': content_type}
                 )
         else:
-            return self._fetch(url)
+            return await self._afetch(url)
+
+    async def _adownload(self, url: str) -> tuple[Mapping[str, str], bytes | mmap.mmap]:
+        client = self._get_async_client()
+        async for attempt in AsyncRetrying(
+            reraise=True,
+            retry=retry_if_exception_type(httpx.HTTPError),
+            stop=stop_after_attempt(self.retry_attempts),
+            wait=partial(self._get_retry_wait, url),
+            after=self._switch_user_agent
+        ):
+            with attempt:
+                entry, cached = self._lookup_cache(url)
+                if cached is not None:
+                    return cached
+                headers = self._get_headers(entry)
+                async with client.stream('GET', url, headers=headers, timeout=self.timeout) as response:
+                    if entry is not None and response.status_code == 304:
+                        cached = self._revalidate_cache(entry, response.headers)
+                        # The cached body may have been evicted in the meantime.
+                        return cached if cached is not None else await self._adownload(url)
+                    response.raise_for_status()
+                    self._check_content_type(url, response.headers)
+                    body = _BodyBuffer(url, response.headers, self.max_bytes, self.spool_threshold)
+                    with body:
+                        async for chunk in response.aiter_bytes(self.chunk_size):
+                            body.write(chunk)
+                        content = body.getvalue()
+                self._store_cache(url, response.headers, content)
+        return response.headers, content
+
+    def _fetch(self, url: str) -> ByteStream:
+        content_type = 'text/html'
+        stream = ByteStream(b'', content_type, metadata={})
+
+        try:
+            headers, body = self._download(url)
+            content_type = _get_content_type(headers)
+            stream = self.handlers[content_type](body, headers)
+            stream.metadata.update({'url': url, 'content_type': content_type})
+        except Exception as e:
+            if self.raise_on_failure:
+                raise e
+            logger.debug(f"Couldn't retrieve content from {url}. Error: {e}.")
+        finally:
+            self.current_user_agent_idx = 0
+
+        return stream
+
+    def _check_content_type(self, url: str, headers: Mapping[str, str]) -> None:
+        # Fail before downloading a body no handler can process.
+        content_type = _get_content_type(headers)
+        if content_type not in self.handlers:
+            raise ValueError(f'No handler for content type {content_type!r} of {url}.')
+
+    def _get_headers(self, cache_entry: HttpCacheEntry | None = None) -> dict[str, str]:
+        headers = self.headers.copy()
+        headers['User-Agent'] = self.user_agents[self.current_user_agent_idx]
+        if self.http_cache is not None:
+            headers.update(self.http_cache.conditional_headers(cache_entry))
+        return headers
+
+    def _lookup_cache(
+        self,
+        url: str
+    ) -> tuple[HttpCacheEntry | None, tuple[Mapping[str, str], bytes | mmap.mmap] | None]:
+        if self.http_cache is None:
+            return None, None
+        entry = self.http_cache.lookup(url)
+        if entry is None or not self.http_cache.is_fresh(entry):
+            return entry, None
+        cached = self.http_cache.load(entry)
+        return (entry, cached) if cached is not None else (None, None)
+
+    def _revalidate_cache(
+        self,
+        entry: HttpCacheEntry,
+        headers: Mapping[str, str]
+    ) -> tuple[Mapping[str, str], bytes | mmap.mmap] | None:
+        return cast(HttpCache, self.http_cache).load(entry, revalidated_headers=headers)
+
+    def _store_cache(self, url: str, headers: Mapping[str, str], body: bytes | mmap.mmap) -> None:
+        if self.http_cache is not None:
+            self.http_cache.store(url, headers, body)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='LinkContentFetcher')
+            return self._executor
+
+    def _get_async_client(self) -> 'httpx.AsyncClient':
+        # httpx clients are bound to the loop they were first used on.
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            pool_size = self.max_workers or DEFAULT_POOL_SIZE
+            client = httpx.AsyncClient(
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+            )
+            self._async_clients[loop] = client
+        return client
+
+    def _create_scheduler(self, max_concurrency: int | None = None) -> PolitenessScheduler:
+        return PolitenessScheduler(max_concurrency or self.max_workers, self.max_connections_per_host, self.rate_limiter)
+
+    def _get_retry_wait(self, url: str, retry_state: RetryCallState) -> float:
+        wait = wait_exponential(multiplier=self.wait_multiplier, min=self.wait_min, max=self.wait_max)(retry_state)
+        exception = retry_state.outcome.exception() if retry_state.outcome is not None else None
+        response = getattr(exception, 'response', None)
+        if response is not None and response.status_code in (429, 503):
+            retry_after = get_retry_after(response.headers)
+            if retry_after is not None:
+                wait = max(wait, retry_after)
+                if self.rate_limiter is not None:
+                    self.rate_limiter.defer(url, retry_after)
+        if self.rate_limiter is not None:
+            # The retry is another request to the host, so it takes a token like any other.
+            wait = max(wait, self.rate_limiter.reserve(url))
+        return wait
 
     def _switch_user_agent(self, retry_state: RetryCallState) -> None:
         self.current_user_agent_idx = (self.current_user_agent_idx + 1) % len(self.user_agents)
         logger.debug(f'Switched User Agent to {self.user_agents[self.current_user_agent_idx]}')
 
-def _text_content_handler(response: requests.Response) -> ByteStream:
-    return ByteStream.from_text(response.text, _get_content_type(response))
+class _BodyBuffer:
+    """
+    Accumulates a streamed response body, enforcing `max_bytes` and spilling the body
+    to a temporary file, returned memory-mapped, once it grows past `spool_threshold`.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        headers: Mapping[str, str],
+        max_bytes: int | None,
+        spool_threshold: int
+    ):
+        self.url = url
+        self.max_bytes = max_bytes
+        self.spool_threshold = spool_threshold
+        self.size = 0
+        self._buffer = bytearray()
+        self._spool: IO[bytes] | None = None
+        content_length = headers.get('Content-Length')
+        if max_bytes is not None and content_length and content_length.isdigit() and int(content_length) > max_bytes:
+            raise ValueError(f'Content of {url} is {content_length} bytes, more than max_bytes={max_bytes}.')
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        if self._spool is not None:
+            self._spool.close()
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            raise ValueError(f'Content of {self.url} is more than max_bytes={self.max_bytes} bytes.')
+        if self._spool is None and self.size > self.spool_threshold:
+            self._spool = tempfile.TemporaryFile(prefix='funcstack-')
+            self._spool.write(self._buffer)
+            self._buffer = bytearray()
+        if self._spool is not None:
+            self._spool.write(chunk)
+        else:
+            self._buffer += chunk
+
+    def getvalue(self) -> bytes | mmap.mmap:
+        if self._spool is None:
+            return bytes(self._buffer)
+        self._spool.flush()
+        # The mapping stays valid after the (already unlinked) file is closed.
+        return mmap.mmap(self._spool.fileno(), 0, access=mmap.ACCESS_READ)
+
+def _text_content_handler(body: bytes | mmap.mmap, headers: Mapping[str, str]) -> ByteStream:
+    charset = _get_charset(headers)
+    metadata: dict[str, Any] = {}
+    if charset is not None:
+        try:
+            is_utf8 = codecs.lookup(charset).name in ('utf-8', 'ascii')
+        except LookupError:
+            is_utf8 = True
+        if is_utf8:
+            metadata['charset'] = charset
+        else:
+            # Keep the content UTF-8 encoded, like the rest of funcstack expects.
+            body = bytes(body).decode(charset, errors='replace').encode('utf-8')
+            metadata['charset'] = 'utf-8'
+            metadata['original_charset'] = charset
+    return ByteStream(body, _get_content_type(headers), metadata=metadata)
+
+def _binary_content_handler(body: bytes | mmap.mmap, headers: Mapping[str, str]) -> ByteStream:
+    return ByteStream(body, _get_content_type(headers))
 
-def _binary_content_handler(response: requests.Response) -> ByteStream:
-    return ByteStream(response.content, _get_content_type(response))
+def _get_content_type(headers: Mapping[str, str]) -> str:
+    return headers.get('Content-Type', '').split(';')[0]
 
-def _get_content_type(response: requests.Response) -> str:
-    return response.headers.get('Content-Type', '').split(';')[0]
\ No newline at end of file
+def _get_charset(headers: Mapping[str, str]) -> str | None:
+    for param in headers.get('Content-Type', '').split(';')[1:]:
+        key, _, value = param.strip().partition('=')
+        if key.lower() == 'charset' and value:
+            return value.strip('"\'')
+    return None
@@ -0,0 +1,164 @@
+import asyncio
+from collections import defaultdict
+from email.utils import parsedate_to_datetime
+from itertools import chain, zip_longest
+import threading
+import time
+from typing import Any, Callable, Coroutine, Mapping, NamedTuple
+from urllib.parse import urlparse
+
+MAX_RETRY_AFTER = 120
+
+class _Bucket:
+    def __init__(self, rate: float, burst: int, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = now
+        self.not_before = now
+
+class HostRateLimiterInfo(NamedTuple):
+    requests: int
+    delayed: int
+    deferrals: int
+    hosts: int
+
+class HostRateLimiter:
+    """
+    A token bucket per host, limiting how many requests per second are sent to each host.
+
+    Buckets refill at `requests_per_second` (or the host's entry in `host_rates`) up to `burst`
+    tokens. Taking a token never blocks: `reserve` returns how long to wait before sending the
+    request, so concurrent callers queue up behind each other instead of all waking at once.
+    A host can be paused with `defer`, e.g. for the duration of a `Retry-After` header.
+    The limiter is thread-safe and can be shared between fetchers and event loops.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float,
+        burst: int = 1,
+        host_rates: Mapping[str, float] | None = None
+    ):
+        if requests_per_second <= 0:
+            raise ValueError(f'requests_per_second must be positive, got {requests_per_second}.')
+        self.requests_per_second = requests_per_second
+        self.burst = max(burst, 1)
+        self.host_rates = {host.lower(): rate for host, rate in (host_rates or {}).items()}
+        self.requests = 0
+        self.delayed = 0
+        self.deferrals = 0
+        self._buckets: dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def info(self) -> HostRateLimiterInfo:
+        with self._lock:
+            return HostRateLimiterInfo(
+                requests=self.requests,
+                delayed=self.delayed,
+                deferrals=self.deferrals,
+                hosts=len(self._buckets)
+            )
+
+    def reserve(self, url: str) -> float:
+        """
+        Take a token from the bucket of the URL's host and get the number of seconds to wait before using it.
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._get_bucket(get_host(url), now)
+            bucket.tokens = min(bucket.burst, bucket.tokens + (now - bucket.updated_at) * bucket.rate)
+            bucket.updated_at = now
+            bucket.tokens -= 1
+            delay = max(-bucket.tokens / bucket.rate, bucket.not_before - now, 0.0)
+            self.requests += 1
+            if delay > 0:
+                self.delayed += 1
+            return delay
+
+    def defer(self, url: str, seconds: float) -> None:
+        """
+        Hold off all requests to the URL's host for the given number of seconds.
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._get_bucket(get_host(url), now)
+            bucket.not_before = max(bucket.not_before, now + seconds)
+            self.deferrals += 1
+
+    def _get_bucket(self, host: str, now: float) -> _Bucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate = self.host_rates.get(host, self.requests_per_second)
+            bucket = self._buckets[host] = _Bucket(rate, self.burst, now)
+        return bucket
+
+class PolitenessScheduler:
+    """
+    Schedules the fetches of one call across hosts.
+
+    A fetch first waits for a connection to its host (at most `max_per_host` at a time),
+    then for its host's rate limit, and only then for one of the `max_concurrency` overall slots,
+    so a host that's being throttled never holds slots other hosts could use.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int | None,
+        max_per_host: int | None,
+        rate_limiter: HostRateLimiter | None = None
+    ):
+        self.rate_limiter = rate_limiter
+        self.semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self.host_semaphores: defaultdict[str, asyncio.Semaphore] | None = (
+            defaultdict(lambda: asyncio.Semaphore(max_per_host))
+            if max_per_host
+            else None
+        )
+
+    @staticmethod
+    def interleave(urls: list[str]) -> list[int]:
+        """
+        Get the indices of the URLs ordered round-robin by host, so that starting the fetches
+        in this order spreads the first requests over all hosts instead of the first host listed.
+        """
+        by_host: dict[str, list[int]] = defaultdict(list)
+        for i, url in enumerate(urls):
+            by_host[get_host(url)].append(i)
+        return [i for i in chain.from_iterable(zip_longest(*by_host.values())) if i is not None]
+
+    async def run[T](self, url: str, fetch: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        if self.host_semaphores is not None:
+            async with self.host_semaphores[get_host(url)]:
+                return await self._run(url, fetch)
+        return await self._run(url, fetch)
+
+    async def _run[T](self, url: str, fetch: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        if self.rate_limiter is not None:
+            delay = self.rate_limiter.reserve(url)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        if self.semaphore is None:
+            return await fetch()
+        async with self.semaphore:
+            return await fetch()
+
+def get_host(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+def get_retry_after(headers: Mapping[str, str]) -> float | None:
+    """
+    Parse a `Retry-After` header, given either in seconds or as an HTTP date, capped at `MAX_RETRY_AFTER` seconds.
+    """
+    value = headers.get('Retry-After')
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        seconds = float(value)
+    else:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
@@ -1,17 +1,50 @@
 import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextvars import copy_context
+from functools import partial
 from typing import Any, Mapping, Type, override
 
 from pydantic import BaseModel
 
 from funcstack.containers import Effect, Effects
 from funcstack.mixins import PydanticMixin
-from funcstack.modules import Module, coerce_to_module
+from funcstack.modules import Module, Modules, coerce_to_module
 from funcstack.modules.base import ModuleLike, ModuleMapping
-from funcstack.typing._vars import In
+from funcstack.typing._vars import In, Out
 from funcstack.utils.formatting import indent_lines_after_first
+from funcstack.utils.serialization import create_model
+
+async def ainvoke_offloaded(
+    mod: Module[In, Out],
+    data: In,
+    executor: Executor | None = None,
+    **kwargs
+) -> Out:
+    """
+    Invoke a module from a coroutine without blocking the event loop on synchronous work.
+
+    Unless the module is non-blocking (see `Module.is_non_blocking`), its effect is invoked in
+    `executor`, or the loop's default thread pool if it is None. That includes composed modules,
+    like a `Sequential` or a `Retry` of synchronous steps, whose effects await blocking code.
+    With a `ProcessPoolExecutor`, `Modules.Sync` functions are shipped to the pool directly,
+    so they must be picklable; other blocking effects fall back to the default thread pool.
+    """
+    loop = asyncio.get_running_loop()
+    if isinstance(executor, ProcessPoolExecutor):
+        if isinstance(mod, Modules.Sync):
+            return await loop.run_in_executor(executor, partial(mod.func, data, **kwargs))
+        executor = None
+    effect = mod.forward(data, **kwargs)
+    if mod.is_non_blocking() or isinstance(effect, Effects.Value):
+        return await effect.ainvoke()
+    return await loop.run_in_executor(executor, copy_context().run, effect.invoke)
 
 class Parallel(PydanticMixin, Module[In, dict[str, Any]]):
     steps: Mapping[str, Module[In, Any]]
+    max_concurrency: int | None = None
+    executor: Executor | None = None
+    offload_sync: bool = True
+    fail_fast: bool = True
 
     @property
     @override
@@ -26,6 +59,38 @@ class Parallel(PydanticMixin, Module[In, dict[str, Any]]):
             steps={k: coerce_to_module(m) for k, m in steps.items()}
         )
 
+    def with_options(
+        self,
+        max_concurrency: int | None = None,
+        executor: Executor | None = None,
+        offload_sync: bool = True,
+        fail_fast: bool = True
+    ) -> 'Parallel[In]':
+        """
+        Get a copy of this module running its steps with the given options.
+
+        The options aren't arguments of the constructor, which takes the steps as keyword arguments,
+        so a step can have any name.
+
+        :param max_concurrency: the maximum number of steps running at the same time, or None for no limit
+        :param executor: the executor synchronous steps are offloaded to, the loop's default thread pool if None
+        :param offload_sync: whether to run synchronous steps in `executor` instead of on the event loop
+        :param fail_fast: whether to cancel the remaining steps as soon as one of them raises
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f'max_concurrency must be at least 1. Got {max_concurrency}.')
+        return self.model_copy(update={
+            'max_concurrency': max_concurrency,
+            'executor': executor,
+            'offload_sync': offload_sync,
+            'fail_fast': fail_fast
+        })
+
+    @override
+    def is_non_blocking(self) -> bool:
+        # Blocking steps are offloaded to the executor.
+        return self.offload_sync or all(mod.is_non_blocking() for mod in self.steps.values())
+
     def __repr__(self) -> str:
         map_for_repr = ',\n '.join(
             f"{name}: {indent_lines_after_first(repr(mod), f'  {name}: ')}"
@@ -35,22 +100,43 @@ class Parallel(PydanticMixin, Module[In, dict[str, Any]]):
 
     def forward(self, data: In, **kwargs) -> Effect[dict[str, Any]]:
         async def _ainvoke() -> dict[str, Any]:
+            steps = dict(self.steps)
+            semaphore = (
+                asyncio.Semaphore(self.max_concurrency)
+                if self.max_concurrency is not None
+                else None
+            )
+
+            async def _run(mod: Module[In, Any]) -> Any:
+                if semaphore is None:
+                    return await self._ainvoke_step(mod, data, **kwargs)
+                async with semaphore:
+                    return await self._ainvoke_step(mod, data, **kwargs)
+
+            tasks = [asyncio.ensure_future(_run(mod)) for mod in steps.values()]
             try:
-                steps = dict(self.steps)
-                generators = await asyncio.gather(
-                    *(
-                        mod.ainvoke(data, **kwargs)
-                        for mod in steps.values()
-                    )
+                await asyncio.wait(
+                    tasks,
+                    return_when=asyncio.FIRST_EXCEPTION if self.fail_fast else asyncio.ALL_COMPLETED
                 )
-                return {
-                    k: v
-                    for k, v in zip(steps, generators)
-                }
-            except:
-                raise
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+            for task in tasks:
+                if not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+            return {
+                k: task.result()
+                for k, task in zip(steps, tasks)
+            }
         return Effects.Async(_ainvoke)
 
+    async def _ainvoke_step(self, mod: Module[In, Any], data: In, **kwargs) -> Any:
+        if self.offload_sync:
+            return await ainvoke_offloaded(mod, data, executor=self.executor, **kwargs)
+        return await mod.ainvoke(data, **kwargs)
+
     @override
     def get_name(
         self,
@@ -1 +1,2 @@
-from .lost_in_the_middle import LostInTheMiddleRanker
\ No newline at end of file
+from .lost_in_the_middle import LostInTheMiddleRanker
+from .similarity import SimilarityRanker, stack_embeddings
\ No newline at end of file
@@ -1,12 +1,58 @@
-from funcstack.typing import Artifact
+import math
 
-from funcstack.containers import Effect
+import numpy as np
+
+from funcstack.typing import Artifact, Utf8Artifact
+
+from funcstack.containers import Effect, Effects
 from funcstack.modules import Module
+from funcstack.utils.arrays import top_k_indices
 
 class LostInTheMiddleRanker(Module[list[Artifact], list[Artifact]]):
+    """
+    Reorders artifacts so the most relevant ones are at the beginning and the end of the list,
+    and the least relevant ones in the middle, where language models pay them the least attention.
+
+    Only the `top_k` artifacts with the highest `score` are kept. They're selected in linear time
+    with `numpy.argpartition`, so only they are sorted, which matters for large retrieval sets.
+    Artifacts without a score rank last.
+    """
+
     def forward(
         self,
         data: list[Artifact],
-        top_k: int = 10
+        top_k: int = 10,
+        word_count_threshold: int | None = None
     ) -> Effect[list[Artifact]]:
-        pass
\ No newline at end of file
+        """
+        :param top_k: the maximum number of artifacts to return
+        :param word_count_threshold: the maximum number of words of the returned artifacts, \
+        artifacts are added by decreasing score until the one that reaches it
+        """
+        def _invoke() -> list[Artifact]:
+            ranked = [data[i] for i in _top_k_indices(data, top_k)]
+            if word_count_threshold is not None:
+                ranked = _truncate_to_word_count(ranked, word_count_threshold)
+            # Alternate the ranked artifacts between the front and the back of the list.
+            return ranked[0::2] + ranked[1::2][::-1]
+
+        return Effects.Sync(_invoke)
+
+def _top_k_indices(data: list[Artifact], top_k: int) -> np.ndarray:
+    if top_k <= 0 or not data:
+        return np.empty(0, dtype=np.intp)
+    scores = np.fromiter(
+        (-math.inf if artifact.score is None else artifact.score for artifact in data),
+        dtype=np.float64,
+        count=len(data)
+    )
+    return top_k_indices(scores, top_k)
+
+def _truncate_to_word_count(ranked: list[Artifact], word_count_threshold: int) -> list[Artifact]:
+    word_count = 0
+    for i, artifact in enumerate(ranked):
+        if isinstance(artifact, Utf8Artifact):
+            word_count += len(str(artifact).split())
+        if word_count >= word_count_threshold:
+            return ranked[:i + 1]
+    return ranked
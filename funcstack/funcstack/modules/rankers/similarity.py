@@ -0,0 +1,98 @@
+from typing import Literal
+
+import numpy as np
+
+from funcstack.typing import Artifact, Embedding
+
+from funcstack.containers import Effect, Effects
+from funcstack.mixins import PydanticMixin
+from funcstack.modules import Module
+from funcstack.utils.arrays import top_k_indices
+
+class SimilarityRanker(PydanticMixin, Module[list[Artifact], list[Artifact]]):
+    """
+    Ranks artifacts by the similarity of their `embedding` to a query embedding.
+
+    The embeddings are stacked into one matrix and scored against the query with a single
+    matrix-vector product, and the `top_k` best are selected with `numpy.argpartition`.
+    Only the returned artifacts are touched afterwards: they're copies with their `score` set
+    to the similarity. Artifacts without an embedding are left out.
+
+    To rank the same artifacts against many queries, stack their embeddings once with
+    `stack_embeddings` and pass the matrix as `embeddings`, skipping the only per-artifact loop.
+    """
+
+    similarity: Literal['cosine', 'dot_product']
+
+    def __init__(self, similarity: Literal['cosine', 'dot_product'] = 'cosine'):
+        super().__init__(similarity=similarity)
+
+    def forward(
+        self,
+        data: list[Artifact],
+        query: Embedding,
+        top_k: int | None = 10,
+        embeddings: np.ndarray | None = None
+    ) -> Effect[list[Artifact]]:
+        """
+        :param query: the embedding to compare the artifacts' embeddings to
+        :param top_k: the maximum number of artifacts to return, or None to return all of them
+        :param embeddings: the stacked embeddings of the artifacts, as returned by `stack_embeddings`
+        """
+        def _invoke() -> list[Artifact]:
+            if embeddings is not None:
+                if len(embeddings) != len(data):
+                    raise ValueError(f'Got {len(embeddings)} embeddings for {len(data)} artifacts.')
+                matrix, indices = embeddings, None
+            else:
+                matrix, indices = _stack(data)
+            if len(matrix) == 0:
+                return []
+            scores = self.score(matrix, query)
+            ranked = top_k_indices(scores, top_k)
+            positions = ranked if indices is None else indices[ranked]
+            return [
+                data[position].model_copy(update={'score': float(scores[i])})
+                for position, i in zip(positions.tolist(), ranked.tolist())
+            ]
+
+        return Effects.Sync(_invoke)
+
+    def score(self, embeddings: np.ndarray, query: Embedding) -> np.ndarray:
+        """
+        Get the similarity of each row of `embeddings` to `query`.
+        """
+        # Integer and half precision embeddings would truncate the query or overflow the norms,
+        # so compute in at least single precision. Float32 and float64 matrices aren't copied.
+        dtype = np.result_type(embeddings.dtype, np.float32)
+        embeddings = embeddings.astype(dtype, copy=False)
+        query = np.asarray(query, dtype=dtype).ravel()
+        scores = embeddings @ query
+        if self.similarity == 'dot_product':
+            return scores
+        # einsum computes the row norms without materializing the squared matrix.
+        norms = np.sqrt(np.einsum('ij,ij->i', embeddings, embeddings)) * np.linalg.norm(query)
+        # Zero vectors are not similar to anything.
+        return np.divide(scores, norms, out=np.zeros_like(scores), where=norms != 0)
+
+def stack_embeddings(data: list[Artifact], dtype: np.dtype | type | None = None) -> np.ndarray:
+    """
+    Stack the embeddings of artifacts into one contiguous matrix, one row per artifact.
+    """
+    matrix, indices = _stack(data)
+    if indices is not None:
+        raise ValueError('All the artifacts must have an embedding to be stacked.')
+    return matrix if dtype is None else matrix.astype(dtype, copy=False)
+
+def _stack(data: list[Artifact]) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Stack the embeddings of the artifacts that have one, along with their positions in `data`
+    if some are missing.
+    """
+    vectors = [artifact.embedding for artifact in data]
+    if all(vector is not None for vector in vectors):
+        return (np.stack(vectors) if vectors else np.empty((0, 0))), None
+    indices = np.fromiter((i for i, vector in enumerate(vectors) if vector is not None), dtype=np.intp)
+    if len(indices) == 0:
+        return np.empty((0, 0)), indices
+    return np.stack([vectors[i] for i in indices.tolist()]), indices
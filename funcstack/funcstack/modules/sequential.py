@@ -1,8 +1,8 @@
-from typing import Any, Type, cast, override
+from typing import Any, Callable, Sequence, Type, cast, override
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
-from funcstack.containers import Effect
+from funcstack.containers import Effect, Effects
 from funcstack.mixins import PydanticMixin
 from funcstack.modules import Module, coerce_to_module
 from funcstack.modules.base import ModuleLike, ModuleMapping
@@ -30,6 +30,8 @@ class Sequential(PydanticMixin, Module[In, Out]):
     middle: list[Module] = Field(default_factory=list)
     last: Module[Any, Out]
 
+    _plan: tuple[tuple[Module, ...], list[Callable[..., Effect[Any]]]] | None = PrivateAttr(default=None)
+
     @property
     @override
     def InputType(self) -> Type[In]:
@@ -42,7 +44,7 @@ class Sequential(PydanticMixin, Module[In, Out]):
 
     @property
     def steps(self) -> list[Module]:
-        return [self.first] + self.middle + [self.last]
+        return [self.first, *self.middle, self.last]
 
     def __init__(
         self,
@@ -112,15 +114,41 @@ class Sequential(PydanticMixin, Module[In, Out]):
             name=self.name
         )
 
+    @override
+    def is_non_blocking(self) -> bool:
+        return all(step.is_non_blocking() for step in self.steps)
+
     def forward(self, data: In, **kwargs) -> Effect[Out]:
-        try:
-            effect = self.steps[0].forward(data, **kwargs)
-            for step in self.steps[1:]:
-                effect = effect.flat_map(lambda out: step.forward(out, **kwargs))
-        except:
-            raise
-        else:
-            return cast(Effect[Out], effect)
+        return cast(
+            Effect[Out],
+            Effects.Chain(self.first.forward(data, **kwargs), self._get_forwards(), **kwargs)
+        )
+
+    def forward_batch(
+        self,
+        inputs: Sequence[In],
+        max_concurrency: int | None = None,
+        **kwargs
+    ) -> Effect[list[Out]]:
+        # Batch step by step, so every step can use its own batch implementation.
+        return cast(
+            Effect[list[Out]],
+            Effects.Chain(
+                self.first.forward_batch(inputs, max_concurrency=max_concurrency, **kwargs),
+                [step.forward_batch for step in self.steps[1:]],
+                max_concurrency=max_concurrency,
+                **kwargs
+            )
+        )
+
+    def _get_forwards(self) -> list[Callable[..., Effect[Any]]]:
+        # The forward methods of the steps are cached, but checked against the fields on every call,
+        # since copies, validation and assignments of the fields don't go through __init__.
+        steps = (self.first, *self.middle, self.last)
+        plan = self._plan
+        if plan is None or len(plan[0]) != len(steps) or any(a is not b for a, b in zip(plan[0], steps)):
+            plan = self._plan = (steps, [step.forward for step in steps[1:]])
+        return plan[1]
 
     def input_schema(self) -> Type[BaseModel]:
         return _seq_input_schema(self.steps)
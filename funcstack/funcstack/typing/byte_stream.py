@@ -1,16 +1,23 @@
-from typing import Self, override
+import mmap
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Self, override
+
+from pydantic import field_serializer
 
 from funcstack.typing import Artifact
 
+if TYPE_CHECKING:
+    from docarray.proto import DocProto
+
 class ByteStream(Artifact):
-    bytes_: bytes
+    bytes_: bytes | mmap.mmap
 
-    def __init__(self, bytes_: bytes, mime_type: str | None = None, **kwargs):
-        super().__init__(**kwargs, bytes_=bytes_, _mime_type=mime_type)
+    def __init__(self, bytes_: bytes | mmap.mmap, mime_type: str | None = None, **kwargs):
+        super().__init__(**kwargs, bytes_=bytes_, mime_type=mime_type)
 
     @classmethod
     def from_text(cls, text: str, mime_type: str | None = 'llm/plain', **kwargs) -> Self:
-        return cls(bytes(text, 'utf-8'), _mime_type=mime_type, **kwargs)
+        return cls(bytes(text, 'utf-8'), mime_type=mime_type, **kwargs)
 
     @classmethod
     def from_bytes(
@@ -20,6 +27,53 @@ class ByteStream(Artifact):
     ) -> Self:
         return ByteStream(data)
 
+    @classmethod
+    def from_file(cls, path: str | Path, mime_type: str | None = None, **kwargs) -> Self:
+        """
+        Create a stream backed by a read-only memory map of a file, without reading it into memory.
+        """
+        with open(path, 'rb') as file:
+            if file.seek(0, 2) == 0:
+                # Empty files can't be memory-mapped.
+                return cls(b'', mime_type=mime_type, **kwargs)
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ), mime_type=mime_type, **kwargs)
+
+    def __getstate__(self) -> dict[Any, Any]:
+        state = super().__getstate__()
+        if self.is_mapped:
+            # Memory maps can't be pickled, so pickle their content instead.
+            state['__dict__'] = {**state['__dict__'], 'bytes_': self.to_bytes()}
+        return state
+
+    @field_serializer('bytes_')
+    def _serialize_bytes(self, bytes_: bytes | mmap.mmap) -> bytes:
+        return bytes_[:] if isinstance(bytes_, mmap.mmap) else bytes_
+
+    @override
+    def to_protobuf(self) -> 'DocProto':
+        if self.is_mapped:
+            return self.model_copy(update={'bytes_': self.to_bytes()}).to_protobuf()
+        return super().to_protobuf()
+
+    @property
+    def is_mapped(self) -> bool:
+        return isinstance(self.bytes_, mmap.mmap)
+
+    def to_buffer(self) -> memoryview:
+        """
+        Get a zero-copy view of the content.
+        """
+        return memoryview(self.bytes_)
+
     @override
     def to_bytes(self, **kwargs) -> bytes:
-        return self.bytes_
\ No newline at end of file
+        if isinstance(self.bytes_, mmap.mmap):
+            return self.bytes_[:]
+        return self.bytes_
+
+    def to_utf8(self) -> str:
+        return str(self.to_buffer(), 'utf-8', errors='replace')
+
+    @override
+    def is_empty(self) -> bool:
+        return len(self.bytes_) == 0
@@ -0,0 +1,18 @@
+import numpy as np
+
+def top_k_indices(scores: np.ndarray, top_k: int | None = None) -> np.ndarray:
+    """
+    Get the indices of the `top_k` highest scores, from highest to lowest, or of all the scores if `top_k` is None.
+
+    The candidates are selected with `numpy.argpartition` in linear time, so only the `top_k` selected
+    scores are sorted. Ties keep the order of their indices.
+    """
+    if top_k is None or top_k >= len(scores):
+        candidates = np.arange(len(scores))
+    elif top_k <= 0:
+        return np.empty(0, dtype=np.intp)
+    else:
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        # argpartition leaves the selected indices in no particular order.
+        candidates.sort()
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
@@ -1,20 +1,205 @@
 import asyncio
-from concurrent.futures import Future, ThreadPoolExecutor
+import atexit
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
 from contextvars import copy_context
-from typing import Any, Coroutine, cast
+import threading
+from typing import Any, AsyncIterator, Coroutine, Iterator, cast
 
-def run_sync[T](
-    coroutine: Coroutine[Any, Any, T],
-    max_workers: int | None = None
-) -> T:
+class LoopRunner:
+    """
+    A long-lived event loop running in a daemon thread.
+
+    Synchronous callers submit coroutines to it instead of creating and tearing down
+    a new event loop (and possibly a new thread) on every call.
+    """
+
+    def __init__(self, name: str = 'funcstack-loop'):
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            self.start()
+        return cast(asyncio.AbstractEventLoop, self._loop)
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.is_running:
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._thread = threading.Thread(target=_run, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+            self._loop = loop
+
+    def stop(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit[T](self, coroutine: Coroutine[Any, Any, T]) -> Future[T]:
+        """
+        Schedule a coroutine on the runner's loop, preserving the caller's context variables.
+        """
+        loop = self.loop
+        context = copy_context()
+        future: Future[T] = Future()
+
+        def _schedule() -> None:
+            if future.cancelled():
+                coroutine.close()
+                return
+            task = loop.create_task(coroutine, context=context)
+            task.add_done_callback(lambda t: _copy_task_state(t, future))
+            future.add_done_callback(lambda f: f.cancelled() and loop.call_soon_threadsafe(task.cancel))
+
+        loop.call_soon_threadsafe(_schedule)
+        return future
+
+    def run[T](self, coroutine: Coroutine[Any, Any, T]) -> T:
+        future = self.submit(coroutine)
+        try:
+            return future.result()
+        except BaseException:
+            future.cancel()
+            raise
+
+def _copy_task_state[T](task: asyncio.Task[T], future: Future[T]) -> None:
+    if future.done():
+        return
+    try:
+        if task.cancelled():
+            future.cancel()
+        elif task.exception() is not None:
+            future.set_exception(cast(BaseException, task.exception()))
+        else:
+            future.set_result(task.result())
+    except InvalidStateError:
+        # The caller cancelled the future while the task was finishing.
+        pass
+
+_loop_runner: LoopRunner | None = None
+_loop_runner_lock = threading.Lock()
+
+def get_loop_runner() -> LoopRunner:
+    """
+    Get the process-wide loop runner used to run coroutines from synchronous code.
+    """
+    global _loop_runner
+    with _loop_runner_lock:
+        if _loop_runner is None:
+            _loop_runner = LoopRunner()
+            atexit.register(_loop_runner.stop)
+        return _loop_runner
+
+def set_loop_runner(runner: LoopRunner | None) -> None:
+    """
+    Replace the process-wide loop runner. Passing None resets it to a lazily created default.
+    """
+    global _loop_runner
+    with _loop_runner_lock:
+        _loop_runner = runner
+
+def run_sync[T](coroutine: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    The coroutine runs on the process-wide loop runner, so there is no per-call thread pool
+    to size and `run_sync` no longer takes a `max_workers` argument. Code that needs bounded
+    concurrency should limit it inside the coroutine, e.g. with a semaphore.
+    """
+    runner = get_loop_runner()
+    if not runner.in_loop_thread():
+        return runner.run(coroutine)
+    # Blocking the runner's own loop on a coroutine it has to run would deadlock,
+    # so nested calls from inside the loop get a private loop in a worker thread.
     context = copy_context()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future: Future = executor.submit(context.run, asyncio.run, coroutine) # type: ignore[call-args]
+        return cast(T, future.result())
+
+def iter_sync[T](
+    aiterator: AsyncIterator[T],
+    buffer_size: int = 64
+) -> Iterator[T]:
+    """
+    Iterate an async iterator from synchronous code.
+
+    Items are pulled on the loop runner by a producer task into a queue holding at most
+    `buffer_size` items, and handed to the caller as they arrive. When the caller stops
+    iterating early, the producer is cancelled and the async iterator closed before returning.
+    """
+    runner = get_loop_runner()
+    owns_runner = runner.in_loop_thread()
+    if owns_runner:
+        # Same deadlock concern as in run_sync: iterate on a private loop instead.
+        runner = LoopRunner(name='funcstack-iter-sync')
+        runner.start()
+
+    queue: asyncio.Queue[tuple[T | None, BaseException | None, bool]] = asyncio.Queue(maxsize=buffer_size)
+
+    async def _produce() -> None:
+        try:
+            async for item in aiterator:
+                await queue.put((item, None, False))
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            await queue.put((None, e, True))
+        else:
+            await queue.put((None, None, True))
+        finally:
+            aclose = getattr(aiterator, 'aclose', None)
+            if aclose is not None:
+                await aclose()
+
+    async def _start() -> asyncio.Task[None]:
+        return asyncio.ensure_future(_produce())
+
+    async def _take() -> list[tuple[T | None, BaseException | None, bool]]:
+        # Drain whatever is already buffered so each round trip to the loop
+        # can hand over more than one item.
+        items = [await queue.get()]
+        while not queue.empty():
+            items.append(queue.get_nowait())
+        return items
+
+    async def _stop(task: asyncio.Task[None]) -> None:
+        task.cancel()
+        await asyncio.wait([task])
+
+    producer = runner.run(_start())
     try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = None
-    if loop and loop.is_running():
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future: Future = executor.submit(context.run, asyncio.run, coroutine) # type: ignore[call-args]
-            return cast(T, future.result())
-    else:
-        return context.run(asyncio.run, coroutine)
\ No newline at end of file
+        while True:
+            for item, error, done in runner.run(_take()):
+                if error is not None:
+                    raise error
+                if done:
+                    return
+                yield cast(T, item)
+    finally:
+        runner.run(_stop(producer))
+        if owns_runner:
+            runner.stop()
@@ -0,0 +1,149 @@
+from collections import OrderedDict
+import hashlib
+from pathlib import Path
+import threading
+from typing import Any, Iterable, Iterator, Mapping, NamedTuple
+
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, Template, meta
+
+DEFAULT_CACHE_SIZE = 512
+DEFAULT_CHUNK_SIZE = 4096
+
+class CompiledTemplate(NamedTuple):
+    template: Template
+    variables: frozenset[str]
+
+class TemplateCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+class _TemplateCache:
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE, bytecode_cache: BytecodeCache | None = None):
+        self.max_size = max_size
+        self.environment = Environment(bytecode_cache=bytecode_cache)
+        self.hits = 0
+        self.misses = 0
+        self._templates: OrderedDict[str, CompiledTemplate] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, source: str) -> CompiledTemplate:
+        key = hashlib.sha256(source.encode('utf-8')).hexdigest()
+        with self._lock:
+            compiled = self._templates.get(key)
+            if compiled is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        compiled = self._compile(key, source)
+        with self._lock:
+            self._templates[key] = compiled
+            self._templates.move_to_end(key)
+            while len(self._templates) > self.max_size:
+                self._templates.popitem(last=False)
+        return compiled
+
+    def info(self) -> TemplateCacheInfo:
+        with self._lock:
+            return TemplateCacheInfo(
+                hits=self.hits,
+                misses=self.misses,
+                size=len(self._templates),
+                max_size=self.max_size
+            )
+
+    def _compile(self, key: str, source: str) -> CompiledTemplate:
+        # Parse once, both to find the variables and to compile, unless the
+        # bytecode cache already has the compiled code of this source.
+        environment = self.environment
+        ast = environment.parse(source)
+        variables = frozenset(meta.find_undeclared_variables(ast))
+        bytecode_cache = environment.bytecode_cache
+        if bytecode_cache is None:
+            return CompiledTemplate(environment.from_string(ast), variables)
+        bucket = bytecode_cache.get_bucket(environment, key, None, source)
+        if bucket.code is None:
+            bucket.code = environment.compile(ast)
+            bytecode_cache.set_bucket(bucket)
+        template = environment.template_class.from_code(environment, bucket.code, environment.make_globals(None))
+        return CompiledTemplate(template, variables)
+
+_template_cache = _TemplateCache()
+
+def get_template(source: str) -> CompiledTemplate:
+    """
+    Get a compiled Jinja template and its undeclared variables.
+
+    Templates are compiled in a shared environment and kept in a bounded LRU cache keyed by their
+    source, so modules built from the same template string only compile it once.
+    """
+    return _template_cache.get(source)
+
+def configure_template_cache(
+    max_size: int = DEFAULT_CACHE_SIZE,
+    bytecode_cache_dir: str | Path | None = None
+) -> None:
+    """
+    Replace the shared template cache, dropping the templates compiled so far.
+
+    :param max_size: the maximum number of compiled templates kept in memory
+    :param bytecode_cache_dir: a directory to store the compiled code of templates in, \
+    so later processes can skip compiling them
+    """
+    global _template_cache
+    bytecode_cache = None
+    if bytecode_cache_dir is not None:
+        Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(str(bytecode_cache_dir))
+    _template_cache = _TemplateCache(max_size, bytecode_cache)
+
+def template_cache_info() -> TemplateCacheInfo:
+    return _template_cache.info()
+
+def render_many(template: Template, contexts: Iterable[Mapping[str, Any]]) -> list[str]:
+    """
+    Render a template with each of the contexts.
+
+    Equivalent to calling `template.render` on each context, without its per-call overhead.
+    """
+    environment = template.environment
+    if environment.is_async:
+        return [template.render(context) for context in contexts]
+    concat = environment.concat
+    render_func = template.root_render_func
+    new_context = template.new_context
+    try:
+        # new_context copies the variables into a fresh dict already.
+        return [concat(render_func(new_context(context))) for context in contexts]
+    except Exception:
+        environment.handle_exception()
+
+def render_stream(
+    template: Template,
+    context: Mapping[str, Any],
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[str]:
+    """
+    Render a template incrementally, yielding the output in chunks of at least `chunk_size`
+    characters (except for the last one) instead of materializing the whole string.
+
+    Jinja generates many small fragments, so they're buffered up to `chunk_size` to keep
+    the per-item overhead of downstream consumers low. Pass 0 to get the raw fragments.
+    """
+    buffer: list[str] = []
+    size = 0
+    yielded = False
+    for fragment in template.generate(context):
+        buffer.append(fragment)
+        size += len(fragment)
+        if size >= chunk_size:
+            yield ''.join(buffer)
+            buffer.clear()
+            size = 0
+            yielded = True
+    if buffer or not yielded:
+        # Like any other effect, yield at least one output, even when the template renders nothing.
+        yield ''.join(buffer)
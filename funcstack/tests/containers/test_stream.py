@@ -0,0 +1,45 @@
+from itertools import count
+import threading
+
+import pytest
+
+from funcstack.containers import Stream, Streams
+
+def _endless(closed: threading.Event) -> Stream[int]:
+    def _items():
+        try:
+            yield from count()
+        finally:
+            closed.set()
+    return Streams.Iterator(_items, chunk_size=1)
+
+def test_merge_closes_sources_when_stopped_early():
+    closed = [threading.Event(), threading.Event()]
+    chunks = Streams.Merge([_endless(event) for event in closed], capacity=1).chunks()
+    assert next(chunks)
+    chunks.close()
+    assert all(event.is_set() for event in closed)
+
+def test_buffer_closes_source_when_stopped_early():
+    closed = threading.Event()
+    chunks = Streams.Buffer(_endless(closed), capacity=1).chunks()
+    assert next(chunks)
+    chunks.close()
+    assert closed.is_set()
+
+def test_merge_closes_sources_on_error():
+    closed = threading.Event()
+
+    def _failing():
+        yield 1
+        raise ValueError('boom')
+
+    chunks = Streams.Merge([_endless(closed), Streams.Iterator(_failing)], capacity=1).chunks()
+    with pytest.raises(ValueError, match='boom'):
+        list(chunks)
+    assert closed.is_set()
+
+def test_merge_yields_every_item():
+    streams = [Streams.from_iterable(range(i * 100, (i + 1) * 100), chunk_size=7) for i in range(3)]
+    items = [item for chunk in Streams.Merge(streams).chunks() for item in chunk]
+    assert sorted(items) == list(range(300))
@@ -0,0 +1,45 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from funcstack.modules.converters import HtmlToText
+from funcstack.modules.converters.html_to_text import _get_extractor
+from funcstack.typing import TextArtifact
+
+DOCUMENTS = 40
+
+def _page(i: int) -> str:
+    paragraphs = ''.join(
+        f'<p>Paragraph {j} of article {i} has enough words in it to be kept as content by the extractor.</p>'
+        for j in range(5)
+    )
+    return (
+        f'<html><head><title>Headline number {i} | Example News</title></head><body>'
+        f'<div class="nav"><a href="/">Home</a> <a href="/news">News</a></div>'
+        f'<h1>Headline number {i}</h1>{paragraphs}'
+        '<div class="footer">Copyright Example News</div></body></html>'
+    )
+
+def _sources() -> list[TextArtifact]:
+    return [TextArtifact(_page(i), mime_type='text/html') for i in range(DOCUMENTS)]
+
+def test_extractors_are_not_shared_between_threads():
+    barrier = threading.Barrier(2)
+    def _get(_: int):
+        # Keep both workers busy so each call runs in its own thread.
+        barrier.wait()
+        return _get_extractor('ArticleExtractor')
+
+    with ThreadPoolExecutor(2) as executor:
+        first, second = executor.map(_get, range(2))
+    assert first is not second
+    assert first.filter is not second.filter
+    assert first.filter is not type(first)._filter_chain
+    assert _get_extractor('ArticleExtractor') is _get_extractor('ArticleExtractor')
+
+def test_concurrent_extraction_matches_sequential():
+    converter = HtmlToText('ArticleExtractor', try_others=False)
+    expected = [str(artifact) for source in _sources() for artifact in converter.invoke([source])]
+    assert all(f'Headline number {i}' in text for i, text in enumerate(expected))
+
+    concurrent = [str(artifact) for [artifact] in converter.iter(_sources())]
+    assert sorted(concurrent) == sorted(expected)
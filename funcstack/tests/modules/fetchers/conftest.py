@@ -0,0 +1,94 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+from typing import Iterator, NamedTuple
+
+import pytest
+
+ETAG = '"v1"'
+
+class Request(NamedTuple):
+    path: str
+    headers: dict[str, str]
+    client_port: int
+
+class Server:
+    """
+    A local HTTP/1.1 server recording the requests it receives.
+    """
+    PAGE = b'<html><body><p>Hello from the test server.</p></body></html>'
+    LARGE = b'0123456789abcdef' * 4096
+
+    def __init__(self, httpd: ThreadingHTTPServer):
+        self.httpd = httpd
+        self.requests: list[Request] = []
+        self.failures: dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def url(self, path: str) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}{path}'
+
+    def requests_to(self, path: str) -> list[Request]:
+        with self.lock:
+            return [request for request in self.requests if request.path == path]
+
+    def fail(self, path: str, times: int) -> None:
+        """
+        Answer the next `times` requests to `path` with a 503.
+        """
+        with self.lock:
+            self.failures[path] = times
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: ThreadingHTTPServer
+
+    def do_GET(self) -> None:
+        state: Server = self.server.state # type: ignore[attr-defined]
+        with state.lock:
+            state.requests.append(Request(self.path, dict(self.headers), self.client_address[1]))
+            failures = state.failures.get(self.path, 0)
+            if failures:
+                state.failures[self.path] = failures - 1
+        if failures:
+            self._respond(503, b'', {'Retry-After': '0'})
+        elif self.path == '/page':
+            self._respond(200, Server.PAGE, {'Content-Type': 'text/html; charset=utf-8'})
+        elif self.path == '/cached':
+            if self.headers.get('If-None-Match') == ETAG:
+                self._respond(304, b'', {'ETag': ETAG, 'Cache-Control': 'max-age=0'})
+            else:
+                self._respond(200, Server.PAGE, {'Content-Type': 'text/html', 'ETag': ETAG, 'Cache-Control': 'max-age=0'})
+        elif self.path == '/large':
+            self._respond(200, Server.LARGE, {'Content-Type': 'application/octet-stream'})
+        elif self.path == '/redirect':
+            self._respond(302, b'', {'Location': '/page'})
+        else:
+            self._respond(404, b'', {})
+
+    def _respond(self, status: int, body: bytes, headers: dict[str, str]) -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+@pytest.fixture
+def server() -> Iterator[Server]:
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.daemon_threads = True
+    state = httpd.state = Server(httpd) # type: ignore[attr-defined]
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield state
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        thread.join()
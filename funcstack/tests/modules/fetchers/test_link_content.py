@@ -0,0 +1,108 @@
+import asyncio
+from pathlib import Path
+import pickle
+import time
+
+import pytest
+
+from funcstack.containers import Chunks, JsonlWriter
+from funcstack.modules.fetchers import HostRateLimiter, HttpCache, LinkContentFetcher
+
+def _fetcher(**kwargs) -> LinkContentFetcher:
+    # Don't wait between retries.
+    return LinkContentFetcher(wait_min=0, wait_max=0, **kwargs)
+
+@pytest.fixture(params=[False, True], ids=['requests', 'httpx'])
+def async_client(request: pytest.FixtureRequest) -> bool:
+    return request.param
+
+def test_fetch(server, async_client: bool):
+    fetcher = _fetcher(async_client=async_client)
+    [stream] = fetcher.invoke([server.url('/page')])
+    assert stream.to_bytes() == server.PAGE
+    assert stream.metadata['url'] == server.url('/page')
+    assert stream.metadata['content_type'] == 'text/html'
+    assert stream.metadata['charset'] == 'utf-8'
+
+def test_fetch_reuses_connections(server):
+    fetcher = _fetcher(max_workers=1)
+    for _ in range(3):
+        fetcher.invoke([server.url('/page')])
+    assert len({request.client_port for request in server.requests_to('/page')}) == 1
+    fetcher.close()
+
+def test_fetch_follows_redirects(server, async_client: bool):
+    [stream] = _fetcher(async_client=async_client).invoke([server.url('/redirect')])
+    assert stream.to_bytes() == server.PAGE
+    assert len(server.requests_to('/page')) == 1
+
+def test_fetch_retries(server, async_client: bool):
+    server.fail('/page', times=1)
+    [stream] = _fetcher(async_client=async_client).invoke([server.url('/page')])
+    assert stream.to_bytes() == server.PAGE
+    assert len(server.requests_to('/page')) == 2
+
+def test_fetch_gives_up_after_retry_attempts(server, async_client: bool):
+    server.fail('/page', times=5)
+    with pytest.raises(Exception, match='503'):
+        _fetcher(async_client=async_client, retry_attempts=2).invoke([server.url('/page')])
+    assert len(server.requests_to('/page')) == 2
+
+    [stream] = _fetcher(async_client=async_client, retry_attempts=2, raise_on_failure=False).invoke([server.url('/page')])
+    assert stream.to_bytes() == b''
+    assert len(server.requests_to('/page')) == 4
+
+def test_fetch_revalidates_cached_responses(server, async_client: bool, tmp_path: Path):
+    cache = HttpCache(tmp_path / 'http')
+    fetcher = _fetcher(async_client=async_client, http_cache=cache)
+    for _ in range(2):
+        [stream] = fetcher.invoke([server.url('/cached')])
+        assert stream.to_bytes() == server.PAGE
+
+    first, second = server.requests_to('/cached')
+    assert 'If-None-Match' not in first.headers
+    assert second.headers['If-None-Match'] == '"v1"'
+    info = cache.info()
+    assert (info.misses, info.revalidations, info.entries) == (1, 1, 1)
+
+def test_fetch_spools_large_bodies(server, async_client: bool, tmp_path: Path):
+    fetcher = _fetcher(async_client=async_client, spool_threshold=1024, chunk_size=4096)
+    [stream] = fetcher.invoke([server.url('/large')])
+    assert stream.is_mapped
+    assert stream.to_bytes() == server.LARGE
+
+    # Mapped streams can still be cached and written.
+    assert pickle.loads(pickle.dumps(stream)).bytes_ == server.LARGE
+    info = JsonlWriter(tmp_path / 'streams.jsonl').run(iter([Chunks.of(stream)]))
+    assert info.artifacts == 1
+
+def test_fetch_enforces_max_bytes(server, async_client: bool):
+    fetcher = _fetcher(async_client=async_client, max_bytes=1024, retry_attempts=1)
+    with pytest.raises(ValueError, match='max_bytes'):
+        fetcher.invoke([server.url('/large')])
+
+def test_fetch_rate_limits_hosts(server, async_client: bool):
+    limiter = HostRateLimiter(requests_per_second=10)
+    fetcher = _fetcher(async_client=async_client, rate_limiter=limiter)
+    start = time.perf_counter()
+    streams = fetcher.invoke([server.url('/page')] * 4)
+    assert len(streams) == 4
+    # The first request takes the only token, the other three wait 0.1s each for the next one.
+    assert time.perf_counter() - start >= 0.3
+    assert limiter.info().requests == 4
+
+def test_fetch_limits_connections_per_host(server):
+    fetcher = _fetcher(max_connections_per_host=1)
+    streams = fetcher.invoke([server.url('/page')] * 3)
+    assert [stream.to_bytes() for stream in streams] == [server.PAGE] * 3
+    # A single connection at a time is reused for every request.
+    assert len({request.client_port for request in server.requests_to('/page')}) == 1
+
+def test_aiter_yields_streams(server, async_client: bool):
+    async def _collect() -> list[bytes]:
+        fetcher = _fetcher(async_client=async_client)
+        try:
+            return [stream.to_bytes() async for [stream] in fetcher.aiter([server.url('/page'), server.url('/large')])]
+        finally:
+            await fetcher.aclose()
+    assert sorted(asyncio.run(_collect())) == sorted([server.PAGE, server.LARGE])
@@ -0,0 +1,77 @@
+import asyncio
+import time
+from typing import Callable
+
+import pytest
+
+from funcstack.modules import Module, Modules
+
+DELAY = 0.2
+INPUTS = [0, 1, 2, 3]
+
+def _sleep(x: int, **kwargs) -> int:
+    time.sleep(DELAY)
+    return x + 1
+
+async def _asleep(x: int, **kwargs) -> int:
+    await asyncio.sleep(DELAY)
+    return x + 1
+
+def _double(x: int, **kwargs) -> int:
+    return x * 2
+
+async def _ainc(x: int, **kwargs) -> int:
+    return x + 1
+
+INCREMENTED = [x + 1 for x in INPUTS]
+
+MODULES: dict[str, tuple[Callable[[], Module[int, int]], list[int]]] = {
+    'sync': (lambda: Modules.Sync(_sleep), INCREMENTED),
+    'async': (lambda: Modules.Async(_asleep), INCREMENTED),
+    'map': (lambda: Modules.Sync(_sleep).map(_double), [x * 2 for x in INCREMENTED]),
+    'sequential': (
+        lambda: Modules.Sync(_sleep) | Modules.Sync(_double) | Modules.Async(_ainc),
+        [x * 2 + 1 for x in INCREMENTED]
+    ),
+    'cache': (lambda: Modules.Sync(_sleep).with_cache(), INCREMENTED),
+    'retry': (lambda: Modules.Sync(_sleep).with_retry(), INCREMENTED),
+    'single_flight': (lambda: Modules.Sync(_sleep).with_single_flight(), INCREMENTED),
+    'cached_retry': (lambda: Modules.Sync(_sleep).with_retry().with_cache(), INCREMENTED)
+}
+
+def _assert_concurrent(start: float) -> None:
+    assert time.perf_counter() - start < DELAY * len(INPUTS) / 2
+
+@pytest.mark.parametrize('make, expected', MODULES.values(), ids=MODULES.keys())
+def test_batch_runs_inputs_concurrently(make: Callable[[], Module[int, int]], expected: list[int]):
+    start = time.perf_counter()
+    assert make().batch(INPUTS) == expected
+    _assert_concurrent(start)
+
+@pytest.mark.parametrize('make, expected', MODULES.values(), ids=MODULES.keys())
+def test_abatch_runs_inputs_concurrently(make: Callable[[], Module[int, int]], expected: list[int]):
+    start = time.perf_counter()
+    assert asyncio.run(make().abatch(INPUTS)) == expected
+    _assert_concurrent(start)
+
+@pytest.mark.parametrize('make, expected', MODULES.values(), ids=MODULES.keys())
+def test_batch_as_completed_runs_inputs_concurrently(make: Callable[[], Module[int, int]], expected: list[int]):
+    start = time.perf_counter()
+    outputs = dict(make().batch_as_completed(INPUTS))
+    assert [outputs[i] for i in range(len(INPUTS))] == expected
+    _assert_concurrent(start)
+
+def test_batch_max_concurrency():
+    start = time.perf_counter()
+    assert Modules.Sync(_sleep).batch(INPUTS, max_concurrency=2) == [1, 2, 3, 4]
+    assert time.perf_counter() - start >= DELAY * 2
+
+@pytest.mark.parametrize('max_concurrency', [0, -1])
+def test_batch_rejects_max_concurrency_below_one(max_concurrency: int):
+    module = Modules.Sync(_double)
+    with pytest.raises(ValueError):
+        module.batch(INPUTS, max_concurrency=max_concurrency)
+    with pytest.raises(ValueError):
+        asyncio.run(module.abatch(INPUTS, max_concurrency=max_concurrency))
+    with pytest.raises(ValueError):
+        list(module.batch_as_completed(INPUTS, max_concurrency=max_concurrency))
@@ -0,0 +1,19 @@
+from funcstack.modules import Cache, Modules, SingleFlight
+from funcstack.modules.caching import InMemoryCache
+
+def _double(x: int, **kwargs) -> int:
+    return x * 2
+
+def test_with_cache_positional_on_decorator():
+    backend = InMemoryCache()
+    module = Modules.Sync(_double).bind(factor=2).with_cache(backend, 'double')
+    assert module.invoke(2) == 4
+    assert isinstance(module.bound, Cache)
+    assert module.bound.backend is backend and module.bound.namespace == 'double'
+    assert backend.info().size == 1
+
+def test_with_single_flight_positional_on_decorator():
+    module = Modules.Sync(_double).bind(factor=2).with_single_flight('double')
+    assert module.invoke(2) == 4
+    assert isinstance(module.bound, SingleFlight)
+    assert module.bound.namespace == 'double'
@@ -0,0 +1,54 @@
+import asyncio
+import time
+from typing import Callable
+
+import pytest
+
+from funcstack.modules import Module, Modules, Parallel, Sequential
+
+DELAY = 0.2
+STEPS = 4
+
+def _sleep(x: int, **kwargs) -> int:
+    time.sleep(DELAY)
+    return x + 1
+
+async def _asleep(x: int, **kwargs) -> int:
+    await asyncio.sleep(DELAY)
+    return x + 1
+
+COMPOSED: dict[str, Callable[[], Module[int, int]]] = {
+    'sync': lambda: Modules.Sync(_sleep),
+    'sequential': lambda: Sequential(Modules.Sync(_sleep), Modules.Sync(lambda x, **kwargs: x)),
+    'retry': lambda: Modules.Sync(_sleep).with_retry(),
+    'cache': lambda: Modules.Sync(_sleep).with_cache(),
+    'bind': lambda: Modules.Sync(_sleep).bind(),
+    'fallbacks': lambda: Modules.Sync(_sleep).with_fallbacks([Modules.Sync(_sleep)]),
+    'async': lambda: Modules.Async(_asleep)
+}
+
+def _parallel(make: Callable[[], Module[int, int]]) -> Parallel[int]:
+    return Parallel(**{f'step_{i}': make() for i in range(STEPS)})
+
+@pytest.mark.parametrize('make', COMPOSED.values(), ids=COMPOSED.keys())
+def test_parallel_runs_composed_steps_concurrently(make: Callable[[], Module[int, int]]):
+    start = time.perf_counter()
+    outputs = _parallel(make).invoke(0)
+    elapsed = time.perf_counter() - start
+    assert outputs == {f'step_{i}': 1 for i in range(STEPS)}
+    assert elapsed < DELAY * STEPS / 2
+
+def test_parallel_inline_runs_sync_steps_serially():
+    start = time.perf_counter()
+    _parallel(COMPOSED['sync']).with_options(offload_sync=False).invoke(0)
+    assert time.perf_counter() - start >= DELAY * STEPS
+
+def test_is_non_blocking():
+    assert Modules.Async(_asleep).is_non_blocking()
+    assert Modules.Async(_asleep).with_retry().is_non_blocking()
+    assert not Modules.Sync(_sleep).is_non_blocking()
+    assert not Sequential(Modules.Async(_asleep), Modules.Sync(_sleep)).is_non_blocking()
+    assert Modules.Sync(_sleep).with_retry().is_non_blocking()
+    assert not Modules.Sync(_sleep).with_cache().is_non_blocking()
+    assert _parallel(COMPOSED['sync']).is_non_blocking()
+    assert not _parallel(COMPOSED['sync']).with_options(offload_sync=False).is_non_blocking()
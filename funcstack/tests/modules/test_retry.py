@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+
+from funcstack.modules import coerce_to_module
+
+def _flaky(failures: int):
+    calls = []
+    def _double(x: int) -> int:
+        calls.append(x)
+        if len(calls) <= failures:
+            raise ValueError('flaky')
+        return x * 2
+    return _double, calls
+
+def test_retry_plain_function():
+    func, calls = _flaky(failures=2)
+    assert coerce_to_module(func).with_retry().invoke(3) == 6
+    assert calls == [3, 3, 3]
+
+def test_aretry_plain_function():
+    func, calls = _flaky(failures=1)
+    assert asyncio.run(coerce_to_module(func).with_retry().ainvoke(3)) == 6
+    assert calls == [3, 3]
+
+def test_retry_reraises_after_last_attempt():
+    func, calls = _flaky(failures=5)
+    with pytest.raises(ValueError, match='flaky'):
+        coerce_to_module(func).with_retry().invoke(3)
+    assert len(calls) == 3
+
+def test_retry_forwards_bound_kwargs():
+    def _scale(x: int, factor: int) -> int:
+        return x * factor
+    assert coerce_to_module(_scale).bind(factor=4).with_retry().invoke(2) == 8
@@ -0,0 +1,50 @@
+import pytest
+
+from funcstack.modules import Modules, Sequential
+
+def _inc(x: int, **kwargs) -> int:
+    return x + 1
+
+def _double(x: int, **kwargs) -> int:
+    return x * 2
+
+def _negate(x: int, **kwargs) -> int:
+    return -x
+
+@pytest.fixture
+def sequential() -> Sequential[int, int]:
+    return Sequential(Modules.Sync(_inc), Modules.Sync(_double), Modules.Sync(_inc))
+
+def test_sequential(sequential: Sequential[int, int]):
+    assert sequential.invoke(1) == 5
+    assert list(sequential.iter(1)) == [5]
+    assert sequential.batch([1, 2]) == [5, 7]
+    assert len(sequential.steps) == 3
+
+def test_flattens_nested_sequential(sequential: Sequential[int, int]):
+    nested = Sequential(sequential, Modules.Sync(_negate))
+    assert [step.func for step in nested.steps] == [_inc, _double, _inc, _negate]
+    assert nested.invoke(1) == -5
+
+def test_model_copy_uses_updated_steps(sequential: Sequential[int, int]):
+    sequential.invoke(1)
+    copy = sequential.model_copy(update={'last': Modules.Sync(_negate)})
+    assert copy.invoke(1) == -4
+    assert copy.batch([1]) == [-4]
+    assert sequential.invoke(1) == 5
+
+def test_field_assignment_uses_updated_steps(sequential: Sequential[int, int]):
+    sequential.invoke(1)
+    sequential.middle = [Modules.Sync(_negate)]
+    assert sequential.invoke(1) == -1
+    sequential.middle.append(Modules.Sync(_double))
+    assert sequential.invoke(1) == -3
+
+def test_model_construct_uses_fields():
+    sequential = Sequential.model_construct(first=Modules.Sync(_inc), middle=[], last=Modules.Sync(_double))
+    assert sequential.invoke(1) == 4
+    assert sequential.steps[0].func is _inc
+
+def test_model_validate_uses_fields():
+    sequential = Sequential.model_validate({'first': Modules.Sync(_inc), 'last': Modules.Sync(_negate)})
+    assert sequential.invoke(1) == -2
@@ -0,0 +1,43 @@
+import json
+from pathlib import Path
+import pickle
+
+import pytest
+
+from funcstack.containers import Chunks, JsonlWriter, ProtobufWriter, read_protobuf
+from funcstack.modules.caching import SqliteCache
+from funcstack.typing import ByteStream
+
+CONTENT = b'mapped content'
+
+@pytest.fixture
+def mapped(tmp_path: Path) -> ByteStream:
+    path = tmp_path / 'body.txt'
+    path.write_bytes(CONTENT)
+    stream = ByteStream.from_file(path, mime_type='text/plain', metadata={'url': 'http://example.com'})
+    assert stream.is_mapped
+    return stream
+
+def test_pickle_mapped(mapped: ByteStream):
+    restored = pickle.loads(pickle.dumps(mapped))
+    assert restored.bytes_ == CONTENT
+    assert restored.id == mapped.id and restored.metadata == mapped.metadata
+    assert mapped.is_mapped
+
+def test_sqlite_cache_mapped(mapped: ByteStream, tmp_path: Path):
+    cache = SqliteCache(tmp_path / 'cache.db')
+    cache.set('key', mapped)
+    assert cache.get('key').bytes_ == CONTENT
+
+def test_jsonl_writer_mapped(mapped: ByteStream, tmp_path: Path):
+    path = tmp_path / 'artifacts.jsonl'
+    info = JsonlWriter(path).run(iter([Chunks.of(mapped)]))
+    assert info.artifacts == 1
+    assert json.loads(path.read_text())['bytes_'] == CONTENT.decode()
+
+def test_protobuf_writer_mapped(mapped: ByteStream, tmp_path: Path):
+    path = tmp_path / 'artifacts.pb'
+    info = ProtobufWriter(path).run(iter([Chunks.of(mapped)]))
+    assert info.artifacts == 1
+    [restored] = read_protobuf(path, ByteStream)
+    assert restored.bytes_ == CONTENT and restored.id == mapped.id
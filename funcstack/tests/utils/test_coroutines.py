@@ -0,0 +1,24 @@
+import asyncio
+import inspect
+import threading
+
+from funcstack.containers import Effects
+from funcstack.utils.coroutines import get_loop_runner, run_sync
+
+async def _thread_name() -> str:
+    await asyncio.sleep(0)
+    return threading.current_thread().name
+
+def test_run_sync_uses_loop_runner():
+    assert run_sync(_thread_name()) == get_loop_runner().name
+
+def test_run_sync_nested_in_loop_runner():
+    async def _nested() -> str:
+        # Blocking the runner's loop on itself would deadlock, so this runs on a private loop.
+        return run_sync(_thread_name())
+    assert run_sync(_nested()) != get_loop_runner().name
+
+def test_run_sync_has_no_max_workers():
+    assert 'max_workers' not in inspect.signature(run_sync).parameters
+    assert 'max_workers' not in inspect.signature(Effects.Async).parameters
+    assert Effects.Async(_thread_name).invoke() == get_loop_runner().name
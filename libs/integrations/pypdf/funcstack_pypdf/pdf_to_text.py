@@ -1,57 +1,248 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
 import io
 import logging
-from typing import Any, Self
+import mmap
+import os
+from pathlib import Path
+import tempfile
+import threading
+from typing import Any, AsyncIterator, Self
 
-from pypdf import PdfReader
+from pypdf import PageObject, PdfReader
 
 from funcstack.containers import Effect, Effects
 from funcstack.mixins import PydanticMixin
-from funcstack import Module
-from funcstack import ArtifactSource, ByteStream, TextArtifact
+from funcstack.modules import Module
+from funcstack.typing import ArtifactSource, ByteStream, TextArtifact
 from funcstack.utils.dicts import normalize_metadata
 from funcstack.utils.func import zip2
 from funcstack_pypdf import PyPDFConverter
 
 logger = logging.getLogger(__name__)
 
-class _DefaultConverter(PydanticMixin, PyPDFConverter):
+DEFAULT_PAGES_PER_TASK = 16
+
+class _DefaultConverter(PydanticMixin):
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> Self:
         return cls(**data)
-    
+
     def to_dict(self) -> dict[str, Any]:
         return self.model_dump()
-    
+
     def convert(self, reader: PdfReader) -> TextArtifact:
-        return TextArtifact('\f'.join([page.extract_text() for page in reader.pages]))
+        return TextArtifact('\f'.join([self.convert_page(page) for page in reader.pages]))
+
+    def convert_page(self, page: PageObject) -> str:
+        return page.extract_text()
 
 class PyPDFToText(PydanticMixin, Module[list[ArtifactSource], list[TextArtifact]]):
+    """
+    Extracts the text of PDF documents with pypdf.
+
+    Local files are memory-mapped instead of being read into memory. Documents are split into
+    tasks of `pages_per_task` pages if the converter can convert a single page with `convert_page`,
+    like the default one does. The tasks run in a worker thread or, with `num_processes`, across a
+    process pool. Invoking the converter returns one artifact per document, its pages separated by
+    form feeds, while iterating it yields one artifact per page, in order, with its `page_number`
+    in the metadata.
+    """
+
     converter: PyPDFConverter
-    
-    def __init__(self, converter: PyPDFConverter | None = None):
-        super().__init__(converter = converter or _DefaultConverter())
-    
-    def evaluate(
+    num_processes: int | None
+    pages_per_task: int
+
+    def __init__(
+        self,
+        converter: PyPDFConverter | None = None,
+        num_processes: int | None = None,
+        pages_per_task: int = DEFAULT_PAGES_PER_TASK
+    ):
+        """
+        :param num_processes: the number of processes to extract pages with, or None to extract in a worker thread
+        :param pages_per_task: the number of pages extracted by each task
+        """
+        super().__init__(
+            converter = converter or _DefaultConverter(),
+            num_processes=num_processes,
+            pages_per_task=pages_per_task
+        )
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    def forward(
         self,
         sources: list[ArtifactSource],
         metadata: dict[str, Any] | list[dict[str, Any]] | None = None
     ) -> Effect[list[TextArtifact]]:
-        def _invoke() -> list[TextArtifact]:
-            results: list[TextArtifact] = []
+        async def _ainvoke() -> list[TextArtifact]:
             meta_list = normalize_metadata(metadata, len(sources))
+            results = await asyncio.gather(*(
+                self._aconvert_source(source, md)
+                for source, md in zip2(sources, meta_list)
+            ))
+            return [result for result in results if result is not None]
 
+        async def _aiter() -> AsyncIterator[list[TextArtifact]]:
+            meta_list = normalize_metadata(metadata, len(sources))
             for source, md in zip2(sources, meta_list):
-                try:
-                    bytestream = ByteStream.from_source(source, md)
-                except Exception as e:
-                    logger.warning(f'Could not read {source}. Skipping it. Error: {e}.')
+                document = self._open(source, md)
+                if document is None:
                     continue
                 try:
-                    pdf_reader = PdfReader(io.BytesIO(bytes(bytestream)))
-                    results.append(self.converter.convert(pdf_reader))
+                    if not hasattr(self.converter, 'convert_page'):
+                        yield [await self._aconvert(document)]
+                        continue
+                    page_number = 1
+                    async for texts in self._aconvert_pages(document):
+                        for text in texts:
+                            yield [TextArtifact(text, metadata={**document.metadata, 'page_number': page_number})]
+                            page_number += 1
                 except Exception as e:
                     logger.warning(f'Could not read {source} and convert it to TextArtifact. Skipping it. Error: {e}.')
+                finally:
+                    document.close()
+
+        return Effects.AsyncStreaming(_ainvoke, _aiter)
+
+    def close(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    async def _aconvert_source(self, source: ArtifactSource, metadata: dict[str, Any]) -> TextArtifact | None:
+        document = self._open(source, metadata)
+        if document is None:
+            return None
+        try:
+            return await self._aconvert(document)
+        except Exception as e:
+            logger.warning(f'Could not read {source} and convert it to TextArtifact. Skipping it. Error: {e}.')
+            return None
+        finally:
+            document.close()
+
+    async def _aconvert(self, document: '_PdfDocument') -> TextArtifact:
+        if not hasattr(self.converter, 'convert_page'):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.converter.convert, document.reader)
+        pages = [text async for texts in self._aconvert_pages(document) for text in texts]
+        return TextArtifact('\f'.join(pages), metadata=document.metadata)
+
+    async def _aconvert_pages(self, document: '_PdfDocument') -> AsyncIterator[list[str]]:
+        """
+        Yield the text of the document's pages, one task's worth at a time, in order.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        page_count = len(document.reader.pages)
+        ranges = [
+            (start, min(start + self.pages_per_task, page_count))
+            for start in range(0, page_count, self.pages_per_task)
+        ]
+
+        if executor is None:
+            # Readers can't be shared between threads, so a document's tasks run one after the other.
+            for start, stop in ranges:
+                yield await loop.run_in_executor(None, _convert_pages, self.converter, document.reader, start, stop)
+            return
+
+        # Only keep a couple of tasks per process in flight, so the text of a large
+        # document doesn't pile up faster than it's consumed.
+        path = document.get_path()
+        max_in_flight = 2 * (self.num_processes or 1)
+        futures: deque[asyncio.Future[list[str]]] = deque()
+        try:
+            for start, stop in ranges:
+                futures.append(
+                    loop.run_in_executor(executor, _convert_file_pages, self.converter, path, start, stop)
+                )
+                if len(futures) >= max_in_flight:
+                    yield await futures.popleft()
+            while futures:
+                yield await futures.popleft()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _open(self, source: ArtifactSource, metadata: dict[str, Any]) -> '_PdfDocument | None':
+        path = _get_local_path(source)
+        try:
+            bytestream = (
+                ByteStream.from_file(path, metadata=metadata)
+                if path is not None
+                else ByteStream.from_source(source, metadata)
+            )
+        except Exception as e:
+            logger.warning(f'Could not read {source}. Skipping it. Error: {e}.')
+            return None
+        try:
+            return _PdfDocument(bytestream, path, metadata)
+        except Exception as e:
+            logger.warning(f'Could not read {source} and convert it to TextArtifact. Skipping it. Error: {e}.')
+            return None
+
+    def _get_executor(self) -> Executor | None:
+        if not self.num_processes:
+            return None
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.num_processes)
+            return self._executor
+
+class _PdfDocument:
+    """
+    A PDF opened for conversion. Worker processes open it again from its path, so documents
+    that aren't local files are spooled to a temporary file the first time a path is needed.
+    """
+
+    def __init__(self, bytestream: ByteStream, path: str | None, metadata: dict[str, Any]):
+        self.bytestream = bytestream
+        self.path = path
+        self.metadata = {**bytestream.metadata, **metadata}
+        self.reader = PdfReader(
+            bytestream.bytes_ if isinstance(bytestream.bytes_, mmap.mmap) else io.BytesIO(bytestream.bytes_)
+        )
+        self._temp_path: str | None = None
+
+    def get_path(self) -> str:
+        if self.path is not None:
+            return self.path
+        if self._temp_path is None:
+            fd, self._temp_path = tempfile.mkstemp(suffix='.pdf')
+            with os.fdopen(fd, 'wb') as file:
+                file.write(self.bytestream.to_buffer())
+        return self._temp_path
+
+    def close(self) -> None:
+        if self._temp_path is not None:
+            Path(self._temp_path).unlink(missing_ok=True)
+            self._temp_path = None
+        if self.path is not None and isinstance(self.bytestream.bytes_, mmap.mmap):
+            # Only close the maps opened here, not those of the artifacts passed in.
+            self.bytestream.bytes_.close()
+
+def _get_local_path(source: ArtifactSource) -> str | None:
+    if isinstance(source, Path):
+        return str(source)
+    if isinstance(source, str) and os.path.isfile(source):
+        return source
+    return None
+
+def _convert_pages(converter: Any, reader: PdfReader, start: int, stop: int) -> list[str]:
+    return [converter.convert_page(reader.pages[i]) for i in range(start, stop)]
 
-            return results
+def _convert_file_pages(converter: Any, path: str, start: int, stop: int) -> list[str]:
+    # Runs in worker processes, which keep the last few files they've read open between tasks.
+    stat = os.stat(path)
+    return _convert_pages(converter, _open_reader(path, stat.st_size, stat.st_mtime_ns), start, stop)
 
-        return Effects.Sync(_invoke)
\ No newline at end of file
+@lru_cache(maxsize=4)
+def _open_reader(path: str, size: int, mtime_ns: int) -> PdfReader:
+    # The size and modification time are part of the cache key so rewritten files are read again.
+    with open(path, 'rb') as file:
+        return PdfReader(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
@@ -1,9 +1,10 @@
-from typing import Any, Protocol, Self
+from typing import Any, Protocol, Self, runtime_checkable
 
 from pypdf import PdfReader
 
-from funcstack import TextArtifact
+from funcstack.typing import TextArtifact
 
+@runtime_checkable
 class PyPDFConverter(Protocol):
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> Self:
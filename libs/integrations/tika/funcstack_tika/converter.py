@@ -1,46 +1,227 @@
-import io
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 import logging
-from typing import Any
+import threading
+from typing import Any, AsyncIterator, Sequence
+import weakref
 
-from tika import parser
+import requests
+from requests.adapters import HTTPAdapter
 
 from funcstack.containers import Effect, Effects
+from funcstack.lazy_imports import LazyImport
 from funcstack.mixins import PydanticMixin
-from funcstack import Module
-from funcstack import ArtifactSource, ByteStream, TextArtifact
+from funcstack.modules import Module
+from funcstack.typing import ArtifactSource, ByteStream, TextArtifact
 from funcstack.utils.dicts import normalize_metadata
 from funcstack.utils.func import zip2
 
+with LazyImport("Run 'pip install httpx'") as httpx_import:
+    import httpx
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_IN_FLIGHT = 8
+
 class TikaTextConverter(PydanticMixin, Module[list[ArtifactSource], list[TextArtifact]]):
+    """
+    Extracts the text of documents with a Tika server.
+
+    Documents are sent to the server's `/tika` endpoint concurrently, at most `max_in_flight`
+    at a time, over connections kept alive in a shared `requests.Session`, or in a shared
+    `httpx.AsyncClient` when `async_client` is set. Invoking the converter returns the artifacts
+    in the order of the sources, while iterating it yields each artifact, wrapped in a single-item
+    list, as soon as the server has answered for it.
+    """
+
     tika_url: str
-    
-    def __init__(self, tika_url: str = 'http://localhost:9998/tika'):
-        super().__init__(tika_url=tika_url)
+    max_in_flight: int
+    async_client: bool
+    timeout: float
+
+    def __init__(
+        self,
+        tika_url: str = 'http://localhost:9998/tika',
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        async_client: bool = False,
+        timeout: float = 60
+    ):
+        """
+        :param max_in_flight: the maximum number of documents sent to the server at the same time
+        :param async_client: whether to send documents with a shared `httpx.AsyncClient` instead of a thread pool
+        :param timeout: the number of seconds to wait for the server to answer
+        """
+        if async_client:
+            httpx_import.check()
+        super().__init__(
+            tika_url=tika_url,
+            max_in_flight=max_in_flight,
+            async_client=async_client,
+            timeout=timeout
+        )
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+        self._async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, 'httpx.AsyncClient'] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def is_non_blocking(self) -> bool:
+        # Blocking requests run in the converter's own thread pool.
+        return True
 
-    def evaluate(
-        self, 
-        sources: list[ArtifactSource], 
+    def forward(
+        self,
+        sources: list[ArtifactSource],
         metadata: dict[str, Any] | list[dict[str, Any]] | None = None
     ) -> Effect[list[TextArtifact]]:
-        def _invoke() -> list[TextArtifact]:
-            results: list[TextArtifact] = []
-            meta_list = normalize_metadata(metadata, len(sources))
-            
-            for source, md in zip2(sources, meta_list):
-                try:
-                    bytestream = ByteStream.from_source(source, md)
-                except Exception as e:
-                    logger.warning(f'Could not read {source}. Skipping it. Error: {e}.')
-                    continue
-                try:
-                    text = parser.from_buffer(io.BytesIO(bytes(bytestream)), serverEndpoint=self.tika_url)['content']
-                except:
-                    logger.warning(f'Failed to extract text from {source}. Skipping it. Error: {e}.')
-                    continue
-                results.append(TextArtifact(text))
-
-            return results
-        
-        return Effects.Sync(_invoke)
\ No newline at end of file
+        async def _ainvoke() -> list[TextArtifact]:
+            return (await self._aconvert_all([sources], metadata, self._create_semaphore()))[0]
+
+        async def _aiter() -> AsyncIterator[list[TextArtifact]]:
+            async for artifact in self._aconvert_as_completed(sources, metadata):
+                yield [artifact]
+
+        return Effects.AsyncStreaming(_ainvoke, _aiter)
+
+    def forward_batch(
+        self,
+        inputs: Sequence[list[ArtifactSource]],
+        max_concurrency: int | None = None,
+        metadata: dict[str, Any] | list[dict[str, Any]] | None = None
+    ) -> Effect[list[list[TextArtifact]]]:
+        async def _ainvoke() -> list[list[TextArtifact]]:
+            # The documents of all the inputs share the in-flight limit.
+            return await self._aconvert_all(inputs, metadata, self._create_semaphore(max_concurrency))
+
+        return Effects.Async(_ainvoke)
+
+    def close(self) -> None:
+        self._session.close()
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    async def aclose(self) -> None:
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+        self.close()
+
+    async def _aconvert_all(
+        self,
+        inputs: Sequence[list[ArtifactSource]],
+        metadata: dict[str, Any] | list[dict[str, Any]] | None,
+        semaphore: asyncio.Semaphore
+    ) -> list[list[TextArtifact]]:
+        results = await asyncio.gather(*(
+            asyncio.gather(*(
+                self._aconvert(source, bytestream, semaphore)
+                for source, bytestream in self._read_all(sources, metadata)
+            ))
+            for sources in inputs
+        ))
+        return [[artifact for artifact in artifacts if artifact is not None] for artifacts in results]
+
+    async def _aconvert_as_completed(
+        self,
+        sources: list[ArtifactSource],
+        metadata: dict[str, Any] | list[dict[str, Any]] | None
+    ) -> AsyncIterator[TextArtifact]:
+        semaphore = self._create_semaphore()
+        tasks = [
+            asyncio.ensure_future(self._aconvert(source, bytestream, semaphore))
+            for source, bytestream in self._read_all(sources, metadata)
+        ]
+        try:
+            for next_completed in asyncio.as_completed(tasks):
+                artifact = await next_completed
+                if artifact is not None:
+                    yield artifact
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _aconvert(
+        self,
+        source: ArtifactSource,
+        bytestream: ByteStream,
+        semaphore: asyncio.Semaphore
+    ) -> TextArtifact | None:
+        try:
+            async with semaphore:
+                if self.async_client:
+                    text = await self._aparse(bytestream)
+                else:
+                    loop = asyncio.get_running_loop()
+                    text = await loop.run_in_executor(self._get_executor(), copy_context().run, self._parse, bytestream)
+        except Exception as e:
+            logger.warning(f'Failed to extract text from {source}. Skipping it. Error: {e}.')
+            return None
+        return TextArtifact(text, metadata=bytestream.metadata)
+
+    def _parse(self, bytestream: ByteStream) -> str:
+        response = self._session.put(
+            self.tika_url,
+            data=bytestream.to_bytes(),
+            headers=self._get_headers(bytestream),
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        response.encoding = 'utf-8'
+        return response.text
+
+    async def _aparse(self, bytestream: ByteStream) -> str:
+        response = await self._get_async_client().put(
+            self.tika_url,
+            content=bytestream.to_bytes(),
+            headers=self._get_headers(bytestream),
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.content.decode('utf-8')
+
+    def _read_all(
+        self,
+        sources: list[ArtifactSource],
+        metadata: dict[str, Any] | list[dict[str, Any]] | None
+    ) -> list[tuple[ArtifactSource, ByteStream]]:
+        documents: list[tuple[ArtifactSource, ByteStream]] = []
+        for source, md in zip2(sources, normalize_metadata(metadata, len(sources))):
+            try:
+                documents.append((source, ByteStream.from_source(source, md)))
+            except Exception as e:
+                logger.warning(f'Could not read {source}. Skipping it. Error: {e}.')
+        return documents
+
+    def _get_headers(self, bytestream: ByteStream) -> dict[str, str]:
+        headers = {'Accept': 'text/plain; charset=UTF-8'}
+        if bytestream.mime_type:
+            headers['Content-Type'] = bytestream.mime_type
+        return headers
+
+    def _create_semaphore(self, max_concurrency: int | None = None) -> asyncio.Semaphore:
+        return asyncio.Semaphore(min(max_concurrency or self.max_in_flight, self.max_in_flight))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_in_flight, thread_name_prefix='TikaTextConverter')
+            return self._executor
+
+    def _get_async_client(self) -> 'httpx.AsyncClient':
+        # httpx clients are bound to the loop they were first used on.
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_in_flight, max_keepalive_connections=self.max_in_flight)
+            )
+            self._async_clients[loop] = client
+        return client
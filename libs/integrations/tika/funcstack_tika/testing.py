@@ -0,0 +1,97 @@
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+from typing import Self
+
+class FakeTikaServer:
+    """
+    A lightweight stand-in for a Tika server, to test and benchmark `TikaTextConverter` without a JVM.
+
+    It answers `PUT /tika` with the request body decoded as UTF-8 and stripped of markup,
+    after sleeping for `latency` seconds to simulate parsing. Connections are kept alive,
+    and the number of requests and distinct connections it served are counted.
+
+    ```
+    with FakeTikaServer(latency=0.01) as server:
+        converter = TikaTextConverter(tika_url=server.url)
+    ```
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0):
+        self.latency = latency
+        self.requests = 0
+        self.connections: set[tuple[str, int]] = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/tika'
+
+    def start(self) -> Self:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name='FakeTikaServer', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def _record(self, client_address: tuple[str, int]) -> None:
+        with self._lock:
+            self.requests += 1
+            self.connections.add(client_address)
+
+def _make_handler(server: FakeTikaServer) -> type[BaseHTTPRequestHandler]:
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_PUT(self) -> None:
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            if self.path.rstrip('/') != '/tika':
+                self._respond(404, b'')
+                return
+            server._record(self.client_address)
+            if server.latency:
+                time.sleep(server.latency)
+            self._respond(200, _extract_text(body.decode('utf-8', errors='replace')).encode('utf-8'))
+
+        def _respond(self, status: int, body: bytes) -> None:
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/plain; charset=UTF-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    return _Handler
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.parts: list[str] = []
+
+    def handle_data(self, data: str) -> None:
+        self.parts.append(data)
+
+def _extract_text(content: str) -> str:
+    extractor = _TextExtractor()
+    extractor.feed(content)
+    extractor.close()
+    return ''.join(extractor.parts)